@@ -76,18 +76,27 @@ def GetClass(elem):
 	""" Get python class from filename.
 	"""
 
-	clsmembers = getClassMember(elem)
+	module = BlockFactory.GetModule(elem)
 
-	if isinstance(clsmembers, dict):
-		moduleName = path_to_module(elem)
+	### exception in module
+	if not inspect.ismodule(module):
+		return module
 
-		for cls in clsmembers.values():
-			#print 'sdf', str(cls.__module__), moduleName, str(cls.__module__) in str(moduleName)
+	### class already found in the same module
+	cached = BlockFactory.class_cache.get(elem)
+	if cached is not None and cached[0] is module:
+		return cached[1]
 
-			if str(cls.__module__) in str(moduleName):
-				return cls
-	else:
-		return clsmembers
+	## classes composing the imported module
+	clsmembers = dict(inspect.getmembers(module, inspect.isclass))
+	moduleName = path_to_module(elem)
+
+	for cls in clsmembers.values():
+		#print 'sdf', str(cls.__module__), moduleName, str(cls.__module__) in str(moduleName)
+
+		if str(cls.__module__) in str(moduleName):
+			BlockFactory.class_cache[elem] = (module, cls)
+			return cls
 
 def GetArgs(cls = None):
 	""" Get behavioral attribute from python file through constructor class.
@@ -693,9 +702,90 @@ class BlockFactory:
 	""" DEVSimPy Block Factory
 	"""
 
+	### imported modules {filename: (signature, module)} and found classes {filename: (module, class)}
+	module_cache = {}
+	class_cache = {}
+
+	### CRC of the python files of the archives {path: ((mtime, size), crc)} (None for the python files)
+	crc_cache = {}
+
+	@staticmethod
+	def GetSignature(filename):
+		""" Give the signature (path, mtime, size and CRC of the python files for archives) used to know if the module of a python file path must be imported again.
+			Return None if the module can't be cached (python file on the web).
+			The file is only opened (to read the CRC of an archive) when its mtime or its size has changed.
+		"""
+
+		dir_name = os.path.dirname(filename)
+
+		### python file of an archive (...../toto.amd/Atomic_Model.py)
+		if os.path.isfile(dir_name):
+			path = dir_name
+		elif filename.startswith(('http','https')) or not os.path.exists(filename):
+			return None
+		else:
+			path = filename
+
+		st = os.stat(path)
+		stat = (st.st_mtime, st.st_size)
+
+		if path not in BlockFactory.crc_cache or BlockFactory.crc_cache[path][0] != stat:
+			if zipfile.is_zipfile(path):
+				zf = zipfile.ZipFile(path, 'r')
+				crc = tuple([info.CRC for info in zf.infolist() if info.filename.endswith('.py')])
+				zf.close()
+			else:
+				crc = None
+			BlockFactory.crc_cache[path] = (stat, crc)
+
+		crc = BlockFactory.crc_cache[path][1]
+
+		return (path,) + stat if crc is None else (path,) + stat + (crc,)
+
+	@staticmethod
+	def ClearCache(filename = None):
+		""" Invalidate the cached modules and classes of the python file (or archive) path filename (all of them if filename is None).
+		"""
+
+		if filename is None:
+			BlockFactory.module_cache.clear()
+			BlockFactory.class_cache.clear()
+			BlockFactory.crc_cache.clear()
+		else:
+			BlockFactory.crc_cache.pop(filename, None)
+			for fn in BlockFactory.module_cache.keys():
+				if fn == filename or BlockFactory.module_cache[fn][0][0] == filename:
+					del BlockFactory.module_cache[fn]
+					if fn in BlockFactory.class_cache:
+						del BlockFactory.class_cache[fn]
+
 	@staticmethod
 	def GetModule(filename):
 		""" Give module object from python file path. Warning, the name of python_file must be the same of the classe name.
+			The module is imported again only if the file has changed since the last call (see GetSignature).
+		"""
+
+		signature = BlockFactory.GetSignature(filename)
+
+		if signature is not None and filename in BlockFactory.module_cache:
+			old_signature, module = BlockFactory.module_cache[filename]
+			if old_signature == signature:
+				return module
+
+		module = BlockFactory.LoadModule(filename)
+
+		### the module object can be reused by the import, so its classes must be found again
+		if filename in BlockFactory.class_cache:
+			del BlockFactory.class_cache[filename]
+
+		if signature is not None and inspect.ismodule(module):
+			BlockFactory.module_cache[filename] = (signature, module)
+
+		return module
+
+	@staticmethod
+	def LoadModule(filename):
+		""" Import module object from python file path.
 		"""
 
 		dir_name = os.path.dirname(filename)
@@ -54,6 +54,9 @@ import cPickle
 import zipfile
 import types
 import array
+import time
+
+from multiprocessing.pool import ThreadPool
 
 from tempfile import gettempdir
 from traceback import format_exception
@@ -106,6 +109,8 @@ sys.modules['Savable'] = sys.modules['Mixins.Savable']
 from Decorators import BuzyCursorNotification, StatusBarNotification, ProgressNotification, Pre_Undo, Post_Undo, cond_decorator
 from Utilities import HEXToRGB, RGBToHEX, relpath, GetActiveWindow, playSound, sendEvent, getInstance, FixedList
 from Patterns.Observer import Subject, Observer
+from UndoHistory import DeltaList, GetRecorder
+from SpatialIndex import GridIndex, growBox, unionBox, REPAINT_MARGIN
 
 if __builtin__.__dict__['GUI_FLAG']:
 	from DetachedFrame import DetachedFrame
@@ -259,6 +264,12 @@ class Diagram(Savable, Structurable):
 	""" Diagram class.
 	"""
 
+	### number of threads used to make the DEVS instances (see makeDEVSInstance)
+	INSTANTIATION_WORKERS = 0
+
+	### duration of the phases of the last makeDEVSInstance
+	instantiation_timing = {}
+
 	def __init__(self):
 		""" Constructor.
 
@@ -277,6 +288,9 @@ class Diagram(Savable, Structurable):
 		# constants dico
 		self.constants_dico = {}
 
+		# simulation settings which differ from the defaults (see SimulationSettings)
+		self.simulation_settings = {}
+
 		# devs Master model
 		self.devsModel = None
 
@@ -313,7 +327,7 @@ class Diagram(Savable, Structurable):
 		"""
 
 		if name == 'dump_attributes':
-			return ['shapes', 'priority_list', 'constants_dico']
+			return ['shapes', 'priority_list', 'constants_dico', 'simulation_settings']
 		else:
 			raise AttributeError, name
 
@@ -354,9 +368,119 @@ class Diagram(Savable, Structurable):
 		return D
 
 	@staticmethod
-	def makeDEVSInstance(diagram = None):
-		""" Return the DEVS instance of diagram. iterations order is very important !
-				1. we make the codeblock devs instance
+	def makeDEVSInstance(diagram = None, nb_workers = None):
+		""" Return the DEVS instance of diagram. The instantiation is made in phases:
+				1. we collect the blocks of all the hierarchy (in the order of the instantiation)
+				2. we resolve the class of each python file only once
+				3. we make the devs instances in bulk (with a pool of nb_workers threads if nb_workers > 1, see INSTANTIATION_WORKERS)
+				4. we make the structure (see makeDEVSStructure)
+			The duration of each phase is stored in Diagram.instantiation_timing.
+		"""
+
+		if nb_workers is None:
+			nb_workers = Diagram.INSTANTIATION_WORKERS
+
+		timing = {}
+
+		### the master is made before the blocks (as in makeDEVSStructure) in order to keep the order of the DEVS identifiers
+		if not diagram.getDEVSModel():
+			diagram.setDEVSModel(DomainInterface.MasterModel.Master())
+
+		### 1. blocks in the order of the instantiation
+		t = time.time()
+		block_list = Diagram.GetInstantiationList(diagram)
+		timing['collect'] = time.time()-t
+
+		### 2. class object from python file (one per python file)
+		t = time.time()
+		classes = {}
+		for m in block_list:
+			if m.python_path not in classes:
+				cls = Components.GetClass(m.python_path)
+
+				### Class is wrong ?
+				if isinstance(cls, (ImportError, tuple)) or cls is None:
+					print _('Error making DEVS instances for:\n%s\n%s'%(str(cls), m.python_path))
+					return False
+
+				classes[m.python_path] = cls
+		timing['resolve'] = time.time()-t
+
+		### 3. DEVS model recovery
+		t = time.time()
+		if nb_workers > 1 and len(block_list) > 1:
+			devs_list = Diagram.MakeInstancesInPool([(classes[m.python_path], m.args) for m in block_list], nb_workers)
+		else:
+			devs_list = [getInstance(classes[m.python_path], m.args) for m in block_list]
+		timing['construct'] = time.time()-t
+
+		instances = {}
+		for m, devs in zip(block_list, devs_list):
+			### Is safe instantiation ?
+			if isinstance(devs, tuple):
+				return devs
+			else:
+				devs.name = m.label
+				instances[id(m)] = devs
+
+		### 4. structure
+		t = time.time()
+		master = Diagram.makeDEVSStructure(diagram, instances)
+		timing['build'] = time.time()-t
+
+		timing['blocks'] = len(block_list)
+		timing['classes'] = len(classes)
+		Diagram.instantiation_timing = timing
+
+		return master
+
+	@staticmethod
+	def GetInstantiationList(diagram):
+		""" Return the blocks of diagram and of its sub-diagrams in the order of the instantiation.
+		"""
+		L = []
+		for m in filter(lambda c: isinstance(c, Block), diagram.GetShapeList()):
+			L.append(m)
+			if isinstance(m, ContainerBlock):
+				L.extend(Diagram.GetInstantiationList(m))
+		return L
+
+	@staticmethod
+	def MakeInstancesInPool(items, nb_workers):
+		""" Return the instances of the list of (class, args) items made by a pool of nb_workers threads.
+			Useful for the constructors that wait for I/O (generators reading files for instance).
+		"""
+
+		### identifier counters of the DEVS kernel (PyDEVS) and their value before the instantiation
+		counters = []
+		for cls in set(map(lambda a: a[0], items)):
+			for attr in ('AtomicIDCounter', 'CoupledIDCounter'):
+				owner = [k for k in inspect.getmro(cls) if attr in k.__dict__]
+				if owner and (owner[0], attr) not in map(lambda a: a[:2], counters):
+					counters.append((owner[0], attr, getattr(owner[0], attr)))
+
+		pool = ThreadPool(nb_workers)
+		try:
+			devs_list = pool.map(lambda a: getInstance(*a), items)
+		finally:
+			pool.close()
+			pool.join()
+
+		### the identifiers given by the constructors depend on the thread scheduling, they are given again in the instantiation order
+		for owner, attr, value in counters:
+			prefix = 'A' if attr == 'AtomicIDCounter' else 'C'
+			for devs in devs_list:
+				if isinstance(devs, owner) and str(getattr(devs, 'myID', '')).startswith(prefix):
+					value += 1
+					devs.myID = "%s%d"%(prefix, value)
+			setattr(owner, attr, value)
+
+		return devs_list
+
+	@staticmethod
+	def makeDEVSStructure(diagram, instances):
+		""" Return the DEVS instance of diagram from the DEVS instances {id(block): devs} of the blocks. iterations order is very important !
+				1. we set the codeblock devs instance
 				2. we make the devs port instance for all devsimpy port
 				3. we make Containerblock instance
 				4. we make the connection
@@ -386,25 +510,10 @@ class Diagram(Savable, Structurable):
 		shape_list = diagram.GetShapeList()
 		block_list = filter(lambda c: isinstance(c, Block), shape_list)
 
-		### for all codeBlock shape, we make the devs instance
+		### for all codeBlock shape, we set the devs instance
 		for m in block_list:
 
-			### class object from python file
-			cls = Components.GetClass(m.python_path)
-
-			### Class is wrong ?
-			if isinstance(cls, (ImportError, tuple)) or cls is None:
-				print _('Error making DEVS instances for:\n%s\n%s'%(str(cls), m.python_path))
-				return False
-			else:
-				### DEVS model recovery
-				devs = getInstance(cls, m.args)
-
-				### Is safe instantiation ?
-				if isinstance(devs, tuple):
-					return devs
-				else:
-					devs.name = m.label
+			devs = instances[id(m)]
 
 			if isinstance(m, CodeBlock):
 				### les ports des modeles couples sont pris en charge plus bas dans les iPorts et oPorts
@@ -429,7 +538,7 @@ class Diagram(Savable, Structurable):
 
 			#### recursion
 			if isinstance(m, ContainerBlock):
-				Diagram.makeDEVSInstance(m)
+				Diagram.makeDEVSStructure(m, instances)
 
 		# for all iPort shape, we make the devs instance
 		for m in filter(lambda s: isinstance(s, iPort), shape_list):
@@ -1389,6 +1498,9 @@ if __builtin__.__dict__['GUI_FLAG']:
 			self.SetScrollbars(50, 50, 50, 50)
 			ShapeCanvas.ID += 1
 
+			### spatial index of the shapes (None if the shapes have changed since the last drawing)
+			self.spatial_index = None
+
 			# Ruber Band Attributs
 			self.overlay = wx.Overlay()
 			self.permRect = None
@@ -1399,8 +1511,13 @@ if __builtin__.__dict__['GUI_FLAG']:
 
 			self.scroller = wx.lib.dragscroller.DragScroller(self)
 
-			self.stockUndo = FixedList(NB_HISTORY_UNDO)
-			self.stockRedo = FixedList(NB_HISTORY_UNDO)
+			### undo/redo histories of deltas (see UndoHistory)
+			self.stockUndo = DeltaList(NB_HISTORY_UNDO)
+			self.stockRedo = DeltaList(NB_HISTORY_UNDO)
+
+			### first record of the diagram
+			if self.diagram is not None:
+				GetRecorder(self.diagram)
 
 			### subject init
 			self.canvas = self
@@ -1614,18 +1731,42 @@ if __builtin__.__dict__['GUI_FLAG']:
 			"""
 			return self.GetSize()[1]
 
-		def DoDrawing(self, dc):
-			"""
+		def DoDrawing(self, dc, box = None):
+			""" Draw the shapes (only those which intersect the logical box (x0, y0, x1, y1) if given) and return them.
 			"""
 
 			dc.SetUserScale(self.scalex, self.scaley)
 
-			for item in self.diagram.shapes + self.nodes:
+			shapes = self.diagram.shapes if box is None else self.GetSpatialIndex().Query(box)
+
+			for item in shapes + self.nodes:
 				try:
 					item.draw(dc)
 				except Exception, info:
 					sys.stderr.write(_("Draw error: %s \n")%info)
 
+			return shapes
+
+		def Refresh(self, *args, **kwargs):
+			""" Refresh all the canvas (the shapes may have changed: the spatial index is rebuilt after the drawing).
+			"""
+			self.spatial_index = None
+			wx.ScrolledWindow.Refresh(self, *args, **kwargs)
+
+		def RefreshBox(self, box):
+			""" Refresh only the region of the logical box (x0, y0, x1, y1).
+			"""
+			x0, y0, x1, y1 = growBox(box, REPAINT_MARGIN)
+			x, y = self.CalcScrolledPosition(int(x0*self.scalex), int(y0*self.scaley))
+			self.RefreshRect(wx.Rect(x, y, int((x1-x0)*self.scalex)+2, int((y1-y0)*self.scaley)+2))
+
+		def GetSpatialIndex(self):
+			""" Return the spatial index of the shapes of the diagram.
+			"""
+			if self.spatial_index is None or not self.spatial_index.IsValid(self.diagram.shapes):
+				self.spatial_index = GridIndex(self.diagram.shapes)
+			return self.spatial_index
+
 		def OnEraseBackground(self, evt):
 			"""
 				Handles the wx.EVT_ERASE_BACKGROUND event
@@ -1668,7 +1809,20 @@ if __builtin__.__dict__['GUI_FLAG']:
 			### http://markmail.org/thread/hytqkxhpdopwbbro#query:+page:1+mid:635dvk6ntxsky4my+state:results
 			self.PrepareDC(dc)
 
-			self.DoDrawing(dc)
+			### if the shapes have not changed since the last drawing, only the shapes of the damaged region are drawn
+			if self.spatial_index is not None and self.spatial_index.IsValid(self.diagram.shapes):
+				r = self.GetUpdateRegion().GetBox()
+				x0, y0 = self.CalcUnscrolledPosition(r.x, r.y)
+				x1, y1 = self.CalcUnscrolledPosition(r.x+r.width, r.y+r.height)
+				box = (x0/self.scalex, y0/self.scaley, x1/self.scalex, y1/self.scaley)
+
+				### connections are updated on the position of their ports when they are drawn
+				for s in self.DoDrawing(dc, growBox(box, REPAINT_MARGIN)):
+					if isinstance(s, ConnectionShape):
+						self.spatial_index.Update(s)
+			else:
+				self.DoDrawing(dc)
+				self.spatial_index = GridIndex(self.diagram.shapes)
 
 		@Post_Undo
 		def OnLock(self, event):
@@ -2125,6 +2279,7 @@ if __builtin__.__dict__['GUI_FLAG']:
 			"""
 			"""
 			self.diagram = d
+			GetRecorder(d)
 
 			self.DiagramModified()
 			self.deselect()
@@ -2158,24 +2313,19 @@ if __builtin__.__dict__['GUI_FLAG']:
 					wx.MessageBox(_("An error is occured during plugins importation.\nCheck plugins module."))
 
 		def Undo(self):
-			"""
+			""" Record the changes of the diagram since the last record in the undo history.
 			"""
 
 			mainW = self.GetTopLevelParent()
 
-			### dump solution
-			### if parent is not none, the dumps dont work because parent is copy of a class
+			### delta solution: only the changed attributes of the diagram and its shapes are stored
 			try:
-				t = cPickle.loads(self.stockUndo[-1])
-
-				### we add new undo of diagram has been modified or one of the shape in diagram sotried in stockUndo has been modified.
-				if any(objA.__dict__ != objB.__dict__ for objA in self.diagram.GetShapeList() for objB in t.GetShapeList()):
-					self.stockUndo.append(cPickle.dumps(obj=self.diagram, protocol=0))
-			except IndexError:
-				### this is the first call of Undo and StockUndo is emplty
-				self.stockUndo.append(cPickle.dumps(obj=self.diagram, protocol=0))
-			except TypeError, info:
-				sys.stdout.write(_("Error trying to undo (TypeError): %s \n"%info))
+				delta = GetRecorder(self.diagram).Record()
+
+				if delta is not None:
+					self.stockUndo.append(delta)
+					### a new change invalidates the redo history
+					del self.stockRedo[:]
 			except Exception, info:
 				sys.stdout.write(_("Error trying to undo: %s \n"%info))
 			finally:
@@ -2191,6 +2341,41 @@ if __builtin__.__dict__['GUI_FLAG']:
 					self.diagram.modify = True
 					self.DiagramModified()
 
+		def DoUndo(self):
+			""" Revert the last change of the undo history.
+			"""
+
+			### the pending changes are the last change
+			delta = GetRecorder(self.diagram).Record()
+			if delta is not None:
+				self.stockUndo.append(delta)
+
+			if self.stockUndo:
+				delta = self.stockUndo.pop()
+				delta.Undo()
+				self.stockRedo.append(delta)
+				self.RefreshDelta(delta)
+
+		def DoRedo(self):
+			""" Apply again the last reverted change of the redo history.
+			"""
+
+			if self.stockRedo:
+				delta = self.stockRedo.pop()
+				delta.Redo()
+				self.stockUndo.append(delta)
+				self.RefreshDelta(delta)
+
+		def RefreshDelta(self, delta):
+			""" Refresh the canvas of the diagram of the delta (the canvas of a coupled model can share the history of its parent).
+			"""
+
+			for canvas in set([self, getattr(delta.diagram, 'parent', None)]):
+				if isinstance(canvas, ShapeCanvas):
+					canvas.DiagramModified()
+					canvas.deselect()
+					canvas.Refresh()
+
 		def OnLeftDown(self,event):
 			""" Left Down mouse bouton has been invoked in the canvas instance.
 			"""
@@ -2353,8 +2538,10 @@ if __builtin__.__dict__['GUI_FLAG']:
 
 					self.SetCursor(wx.StockCursor(wx.CURSOR_ARROW))
 
-					## gestion des shapes qui sont dans le rectangle permRect
-					for s in self.diagram.GetShapeList():
+					## gestion des shapes qui sont dans le rectangle permRect (candidates are given by the spatial index)
+					r = self.permRect
+					box = (r.x/self.scalex, r.y/self.scaley, (r.x+r.width)/self.scalex, (r.y+r.height)/self.scaley)
+					for s in self.GetSpatialIndex().Query(box):
 						x = s.x[0]*self.scalex
 						y = s.y[0]*self.scaley
 						w = (s.x[1]-s.x[0])*self.scalex
@@ -2449,6 +2636,16 @@ if __builtin__.__dict__['GUI_FLAG']:
 				x = point[0] - self.currentPoint[0]
 				y = point[1] - self.currentPoint[1]
 
+				### shapes moved (or resized) in the spatial index: only their region is repainted if they are all indexed
+				index = self.GetSpatialIndex()
+				moved = [s.item if isinstance(s, ResizeableNode) else s for s in self.getSelectedShapes()]
+				partial = moved != [] and all(map(index.Contains, moved))
+				if partial:
+					boxes = map(index.GetBox, moved)
+					### connections near the moved shapes follow them
+					for box in boxes[:]:
+						boxes.extend(index.GetBox(c) for c in index.Query(box) if isinstance(c, ConnectionShape))
+
 				for s in self.getSelectedShapes():
 					s.move(x,y)
 
@@ -2520,6 +2717,11 @@ if __builtin__.__dict__['GUI_FLAG']:
 						del odc
 					else:
 						self.Refresh()
+				elif partial:
+					for s in moved:
+						index.Update(s)
+					### refresh the old and the new regions of the moved shapes
+					self.RefreshBox(unionBox(boxes + map(index.GetBox, moved)))
 				else:
 					### refresh all canvas with Flicker effect corrected in OnPaint and OnEraseBackground
 					self.Refresh()
@@ -2543,7 +2745,8 @@ if __builtin__.__dict__['GUI_FLAG']:
 					self.f.Close()
 					self.f = None
 
-				for s in filter(lambda m: isinstance(m, Block), self.diagram.GetShapeList()):
+				### blocks under the mouse (from the spatial index)
+				for s in filter(lambda m: isinstance(m, Block), self.GetSpatialIndex().QueryPoint(xm/self.scalex, ym/self.scaley)):
 					x = s.x[0]*self.scalex
 					y = s.y[0]*self.scaley
 					w = (s.x[1]-s.x[0])*self.scalex
@@ -2570,6 +2773,7 @@ if __builtin__.__dict__['GUI_FLAG']:
 			""" Setter for diagram attribute.
 			"""
 			self.diagram = diagram
+			GetRecorder(diagram)
 
 		def GetDiagram(self):
 			""" Return Diagram instance.
@@ -2583,8 +2787,8 @@ if __builtin__.__dict__['GUI_FLAG']:
 			point = self.getEventCoordinates(event)
 			self.currentPoint = point
 
-			# Look to see if an item is selected
-			for item in self.nodes + self.diagram.shapes:
+			# Look to see if an item is selected (shapes near the point are given by the spatial index)
+			for item in self.nodes + self.GetSpatialIndex().QueryPoint(point[0], point[1]):
 				if item.HitTest(point[0], point[1]):
 					return item
 
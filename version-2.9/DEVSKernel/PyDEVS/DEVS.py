@@ -23,6 +23,7 @@
 ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ##
 
 import copy
+import cPickle
 import __builtin__
 import sys
 
@@ -38,6 +39,95 @@ def Error(message = '', esc = 1):
 
 __builtin__.__dict__['INFINITY'] = float('inf')
 
+## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ##
+##  MESSAGE COPY
+## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ##
+#
+# The messages read by {\tt peek} are copied according to the policy selected
+# with {\tt setMessageCopy} (as {\tt setMessageCopy} of PyPDEVS):
+#
+# * 'deepcopy' (default): deep copy of the message;
+# * 'copy': shallow copy of the message;
+# * 'custom': the {\tt copy} method of the message (deep copy if it has none);
+# * 'none': no copy, the message is shared by the sender and all the receivers
+#   and must be considered as immutable.
+#
+# With the 'none' policy and the check flag (debug mode), the delivered
+# messages are fingerprinted (pickled) and {\tt checkMessages} raises
+# {\tt MessageMutationError} if one of them has been modified since its
+# delivery. The check is done every CHECK_SIZE deliveries and at the end of
+# the simulation.
+
+### number of delivered messages between two checks
+CHECK_SIZE = 1024
+
+class MessageMutationError(Exception):
+	"""	A message delivered without copy has been modified.
+	"""
+	pass
+
+def deepcopyMessage(value, p = None):
+	return copy.deepcopy(value)
+
+def shallowcopyMessage(value, p = None):
+	return copy.copy(value)
+
+def customcopyMessage(value, p = None):
+	return value.copy() if hasattr(value, 'copy') else copy.deepcopy(value)
+
+def assignMessage(value, p = None):
+	return value
+
+### messages delivered without copy since the last check [(value, fingerprint, port)]
+delivered = []
+
+def fingerprint(value):
+	"""	Return the pickle of the message {\tt value} (None if it can't be pickled).
+	"""
+	try:
+		return cPickle.dumps(value, cPickle.HIGHEST_PROTOCOL)
+	except Exception:
+		return None
+
+def frozenMessage(value, p = None):
+	"""	Deliver the message without copy and remember its fingerprint.
+	"""
+	delivered.append((value, fingerprint(value), p))
+	if len(delivered) >= CHECK_SIZE:
+		checkMessages()
+	return value
+
+def checkMessages():
+	"""	Raise MessageMutationError if a message delivered without copy has been
+		modified since its delivery. The delivered messages are forgotten.
+	"""
+	L = delivered[:]
+	del delivered[:]
+	for value, fp, p in L:
+		if fp is not None and fingerprint(value) != fp:
+			raise MessageMutationError("Message %.80s delivered to %s.%s has been modified (use a copy policy other than 'none')" % (value, getattr(p, 'host', None), getattr(p, 'name', p)))
+
+MESSAGE_COPY_DICT = {	'deepcopy': deepcopyMessage,
+						'copy': shallowcopyMessage,
+						'custom': customcopyMessage,
+						'none': assignMessage}
+
+### copy function of the selected policy
+copyMessage = deepcopyMessage
+
+def setMessageCopy(policy = 'deepcopy', check = False):
+	"""	Select the copy {\tt policy} of the messages read by {\tt peek}
+		('deepcopy', 'copy', 'custom' or 'none'). If {\tt check} is true,
+		the messages delivered by the 'none' policy are checked (debug mode).
+	"""
+	global copyMessage
+
+	if policy not in MESSAGE_COPY_DICT:
+		raise ValueError("Unknown message copy policy '%s' (%s)" % (policy, ', '.join(sorted(MESSAGE_COPY_DICT))))
+
+	del delivered[:]
+	copyMessage = frozenMessage if policy == 'none' and check else MESSAGE_COPY_DICT[policy]
+
 ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ##
 ##  CLASS HIERARCHY
 ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ## ##
@@ -217,12 +307,12 @@ class AtomicDEVS(BaseDEVS):
 		"""Retrieves message from input port {\tt p}.
 		"""
 		value = self.myInput.get(p, None)
-		return copy.deepcopy(value) if value else value
+		return copyMessage(value, p) if value else value
 
 	def peek_all(self):
 		"""Retrieves messages from all input port {\tt p}.
 		"""
-		return [(p, copy.deepcopy(m)) for p,m in self.myInput.items()]
+		return [(p, copyMessage(m, p)) for p,m in self.myInput.items()]
 
 	###
 	def extTransition(self, *args, **kwargs):
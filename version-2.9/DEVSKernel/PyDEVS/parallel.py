@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# parallel.py --- Multi-process execution of the transitions of atomic-DEVS
+#                     --------------------------------
+# Version                                        last modified: 18/10/2026
+###############################################################################
+# NOTES:
+#
+# The flat list of atomic models is partitioned (round-robin on the model id)
+# across persistent worker processes. Each worker owns its models for all the
+# simulation: the main process only sends the ids of the models to activate
+# and the batch of inputs, and gets back the new times of next event and the
+# batch of outputs. Processes are created with fork (the models are inherited
+# by the workers), so this is only available on posix platforms; elsewhere
+# the partitions are executed serially in the main process.
+#
+# Messages exchanged on the ports must be picklable.
+###############################################################################
+
+import os
+import sys
+import cPickle
+import multiprocessing
+
+### attributes of the atomic models handled by the simulator (or linking them to the main process graph), which are not sent back by the workers
+KERNEL_ATTRIBUTES = frozenset(['parent', 'myID', 'IPorts', 'OPorts', 'myInput', 'myOutput', 'timeLast', 'timeNext', 'myTimeAdvance', 'elapsed', 'blockModel'])
+
+###############################################################################
+# TRANSITIONS
+###############################################################################
+
+def internal(m, t):
+	""" Output function and internal transition of the atomic model {\tt m} at time {\tt t}.
+		Return the outputs as a list of (port index, value).
+	"""
+
+	m.myOutput = {}
+	m.outputFnc()
+
+	m.elapsed = t - m.timeLast
+	m.intTransition()
+
+	m.timeLast = t
+	m.myTimeAdvance = m.timeAdvance()
+	m.timeNext = m.timeLast + m.myTimeAdvance
+	if m.myTimeAdvance != INFINITY: m.myTimeAdvance += t
+	m.elapsed = 0
+
+	return [(m.OPorts.index(p), v) for p, v in m.myOutput.items()]
+
+def external(m, t, inputs):
+	""" External transition of the atomic model {\tt m} at time {\tt t} for the list of (port index, value) {\tt inputs}.
+	"""
+
+	m.myInput = dict((m.IPorts[i], v) for i, v in inputs)
+
+	m.elapsed = t - m.timeLast
+	m.extTransition()
+
+	m.timeLast = t
+	m.myTimeAdvance = m.timeAdvance()
+	m.timeNext = m.timeLast + m.myTimeAdvance
+	if m.myTimeAdvance != INFINITY: m.myTimeAdvance += t
+	m.elapsed = 0
+
+def getState(m):
+	""" Return the picklable attributes of the atomic model {\tt m}, without the attributes of the simulator.
+	"""
+	D = {}
+	for k, v in m.__dict__.items():
+		if k in KERNEL_ATTRIBUTES:
+			continue
+		try:
+			cPickle.dumps(v, cPickle.HIGHEST_PROTOCOL)
+		except Exception:
+			pass
+		else:
+			D[k] = v
+	return D
+
+###############################################################################
+# PARTITION
+###############################################################################
+
+class Partition:
+	""" Set of atomic models executed by the same process.
+	"""
+
+	def __init__(self, models):
+		""" Constructor.
+
+			{\tt models} is a dict {id: atomic model}.
+		"""
+		self.models = models
+
+	def execute(self, cmd):
+		""" Execute a command and return its result.
+
+			('int', t, ids) -> ([(id, myTimeAdvance)], [(id, port index, value)])
+			('ext', t, [(id, inputs)]) -> [(id, myTimeAdvance)]
+			('state',) -> {id: picklable attributes}
+		"""
+
+		models = self.models
+
+		if cmd[0] == 'int':
+			t = cmd[1]
+			times = []
+			outputs = []
+			for i in cmd[2]:
+				m = models[i]
+				outputs.extend((i, p, v) for p, v in internal(m, t))
+				times.append((i, m.myTimeAdvance))
+			return times, outputs
+
+		elif cmd[0] == 'ext':
+			t = cmd[1]
+			times = []
+			for i, inputs in cmd[2]:
+				m = models[i]
+				external(m, t, inputs)
+				times.append((i, m.myTimeAdvance))
+			return times
+
+		elif cmd[0] == 'state':
+			return dict((i, getState(m)) for i, m in models.items())
+
+def worker(conn, partition):
+	""" Main loop of a worker process.
+	"""
+
+	while True:
+		cmd = conn.recv()
+		if cmd[0] == 'stop':
+			break
+		try:
+			conn.send((True, partition.execute(cmd)))
+		except Exception, info:
+			import traceback
+			conn.send((False, traceback.format_exc()))
+
+	conn.close()
+
+###############################################################################
+# POOL
+###############################################################################
+
+class ProcessPool:
+	""" Persistent pool of worker processes owning a partition of the atomic models.
+	"""
+
+	def __init__(self, models, nb_process = None):
+		""" Constructor.
+
+			{\tt models} is the flat list of atomic models (the id of a model is its index).
+		"""
+
+		if nb_process is None:
+			nb_process = multiprocessing.cpu_count()
+
+		nb_process = max(1, min(nb_process, len(models)))
+
+		### round-robin partition of the model ids
+		self.owner = [i % nb_process for i in range(len(models))]
+		partitions = [Partition(dict((i, m) for i, m in enumerate(models) if i % nb_process == k)) for k in range(nb_process)]
+
+		self.processes = []
+		self.conns = []
+		self.local = None
+
+		if os.name == 'posix' and nb_process > 1:
+			for p in partitions:
+				parent_conn, child_conn = multiprocessing.Pipe()
+				proc = multiprocessing.Process(target=worker, args=(child_conn, p))
+				proc.daemon = True
+				proc.start()
+				child_conn.close()
+				self.processes.append(proc)
+				self.conns.append(parent_conn)
+		else:
+			self.local = partitions
+
+	def GetSize(self):
+		return len(self.processes) or len(self.local)
+
+	def map(self, cmds):
+		""" Send the commands {k: cmd} to the partitions k concurrently and return the results {k: result}.
+		"""
+
+		if self.local is not None:
+			return dict((k, self.local[k].execute(cmd)) for k, cmd in cmds.items())
+
+		for k, cmd in cmds.items():
+			self.conns[k].send(cmd)
+
+		results = {}
+		for k in cmds:
+			success, r = self.conns[k].recv()
+			if not success:
+				raise Exception(r)
+			results[k] = r
+
+		return results
+
+	def close(self):
+		""" Stop the worker processes.
+		"""
+		for conn in self.conns:
+			try:
+				conn.send(('stop',))
+				conn.close()
+			except (IOError, EOFError):
+				pass
+
+		for proc in self.processes:
+			proc.join(1.0)
+			if proc.is_alive():
+				proc.terminate()
+
+		self.processes = []
+		self.conns = []
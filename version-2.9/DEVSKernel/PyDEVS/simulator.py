@@ -16,12 +16,16 @@ import sys
 from itertools import *
 import threading
 import array
+import heapq
 
 from DEVS import CoupledDEVS
 #from Patterns.Strategy import SimStrategy1
 
 import pluginmanager
 
+### listeners of the simulation events (None if no plug-in is enabled for the event), see bindEvents
+SIM_VERBOSE = SIM_BLINK = SIM_TEST = None
+
 ### avec ce flag, on gere a totalité des messages sur les ports une seul fois dans delta_ext.
 WITHOUT_DELTA_EXT_FOR_ALL_PORT = True
 ### avec ce flag on peut faire de l'execution en paralle de modèle qui s'active en meme emps mais pas avec des modèles couplé dans des modèle couplé
@@ -41,6 +45,12 @@ def Error(message = '', esc = 1):
 	stderr.write("ERROR: %s\n" % message)
 	if esc: exit(1)
 
+def bindEvents():
+	""" Resolve the plug-ins of the simulation events (once, at the start of a simulation).
+	"""
+	global SIM_VERBOSE, SIM_BLINK, SIM_TEST
+	SIM_VERBOSE, SIM_BLINK, SIM_TEST = map(pluginmanager.bind_event, ("SIM_VERBOSE", "SIM_BLINK", "SIM_TEST"))
+
 ###############################################################################
 # SIMULATOR CLASSES
 ###############################################################################
@@ -59,6 +69,7 @@ class Sender:
 			thread.start()
 
 		for thread in threads:
+			thread.join()
 			thread.finish()
 
 	def send(self, d, msg):
@@ -71,8 +82,8 @@ class Sender:
 			AS = AtomicSolver()
 			r = AS.receive(d, msg)
 
-			pluginmanager.trigger_event("SIM_BLINK", model=d, msg=msg)
-			pluginmanager.trigger_event("SIM_TEST", model=d, msg=msg)
+			if SIM_BLINK: SIM_BLINK(model=d, msg=msg)
+			if SIM_TEST: SIM_TEST(model=d, msg=msg)
 
 		return r
 
@@ -94,7 +105,8 @@ class ThreadingAtomicSolver(threading.Thread):
 		self.receive(self.d, self.msg)
 
 	def receive(self, d, msg):
-		self.value = AtomicSolver.receive(d, msg)
+		### d can be a coupled-DEVS (influenced through its input ports)
+		self.value = Sender().send(d, msg)
 
 	def peek(self): # return the current value
 		return self.value
@@ -148,7 +160,7 @@ class AtomicSolver:
 			aDEVS.elapsed = 0
 
 			# The SIM_VERBOSE event occurs
-			pluginmanager.trigger_event("SIM_VERBOSE", model=aDEVS, msg=0)
+			if SIM_VERBOSE: SIM_VERBOSE(model=aDEVS, msg=0)
 
 			# Return the DEVS' output to the parent coupled-DEVS (rather than
 			# sending $(y,\,t)$ message).
@@ -175,7 +187,7 @@ class AtomicSolver:
 			aDEVS.elapsed = 0
 
 			# The SIM_VERBOSE event occurs
-			pluginmanager.trigger_event("SIM_VERBOSE", model=aDEVS, msg=1)
+			if SIM_VERBOSE: SIM_VERBOSE(model=aDEVS, msg=1)
 
 		# $(i,\,t)$ message --- sets origin of time at {\tt t}:
 		elif msg[0] == 0:
@@ -345,6 +357,182 @@ class CoupledSolver(Sender):
 		else:
 			Error("Unrecognized message", 1)
 
+###############################################################################
+# EVENT LIST
+###############################################################################
+
+class HeapEventList:
+	"""Event list of a coupled-DEVS based on a binary heap with lazy invalidation.
+
+		Each child is identified by its rank in the {\tt componentSet} list. An
+		entry $(tn_d,\,rank,\,stamp)$ is pushed each time the child $d$ changes its
+		time of next event; older entries of $d$ are not removed but become
+		invalid (their stamp is no longer the current one) and are dropped when
+		they reach the top of the heap. The cost of one update is then
+		$O(\log N)$ instead of a scan of the whole {\tt componentSet}.
+	"""
+
+	### the heap is rebuilt when it holds more than COMPACT_FACTOR*N entries
+	COMPACT_FACTOR = 4
+
+	def __init__(self, componentSet):
+		""" Constructor.
+		"""
+		self._models = list(componentSet)
+		self._rank = dict((d, i) for i, d in enumerate(self._models))
+		self._time = [INFINITY]*len(self._models)
+		self._stamp = [0]*len(self._models)
+		self._heap = []
+
+	def update(self, d):
+		""" Reschedule the child {\tt d} according to its {\tt myTimeAdvance}.
+		"""
+		i = self._rank[d]
+		t = d.myTimeAdvance
+		if t != self._time[i]:
+			self._time[i] = t
+			self._stamp[i] += 1
+			if t != INFINITY:
+				heapq.heappush(self._heap, (t, i, self._stamp[i]))
+				if len(self._heap) > self.COMPACT_FACTOR*len(self._models)+16:
+					self.compact()
+
+	def compact(self):
+		""" Rebuild the heap with only the valid entries.
+		"""
+		self._heap = [(t, i, self._stamp[i]) for i, t in enumerate(self._time) if t != INFINITY]
+		heapq.heapify(self._heap)
+
+	def _clean(self):
+		""" Drop the invalid entries from the top of the heap.
+		"""
+		heap = self._heap
+		stamp = self._stamp
+		while heap and heap[0][2] != stamp[heap[0][1]]:
+			heapq.heappop(heap)
+
+	def getMinTime(self):
+		""" Return the smallest time of next event of the children.
+		"""
+		self._clean()
+		return self._heap[0][0] if self._heap else INFINITY
+
+	def getFirst(self):
+		""" Return the imminent child with the smallest rank (None if all children are passive).
+		"""
+		self._clean()
+		return self._models[self._heap[0][1]] if self._heap else None
+
+	def getImminents(self):
+		""" Return the list of imminent children ordered by rank (componentSet order).
+		"""
+		self._clean()
+		heap = self._heap
+		if not heap:
+			return []
+
+		tmin = heap[0][0]
+		stamp = self._stamp
+		popped = []
+		while heap and heap[0][0] == tmin:
+			e = heapq.heappop(heap)
+			if e[2] == stamp[e[1]]:
+				popped.append(e)
+
+		for e in popped:
+			heapq.heappush(heap, e)
+
+		return [self._models[e[1]] for e in popped]
+
+###############################################################################
+
+class EventQueueCoupledSolver(CoupledSolver):
+	"""Simulator (coordinator) for coupled-DEVS based on an event list.
+
+		Same messages as {\tt CoupledSolver}, but the time of next event and the
+		imminent children are obtained from the {\tt eventList} attribute of the
+		coupled-DEVS, which is only updated for the children that have received a
+		message. Each step costs $O(k\,\log N)$ where $k$ is the number of
+		imminent and influenced children.
+	"""
+
+	### event list class (must provide update, getMinTime and getImminents methods)
+	event_list_cls = HeapEventList
+
+	def send(self, d, msg):
+		""" Dispatch messages to the right method and reschedule {\tt d} in the event list of its parent.
+		"""
+		if isinstance(d, CoupledDEVS):
+			r = self.receive(d, msg)
+		else:
+			r = AtomicSolver.receive(d, msg)
+
+			if SIM_BLINK: SIM_BLINK(model=d, msg=msg)
+			if SIM_TEST: SIM_TEST(model=d, msg=msg)
+
+		parent = d.parent
+		if parent is not None and hasattr(parent, 'eventList'):
+			parent.eventList.update(d)
+
+		return r
+
+	def reschedule(self, cDEVS):
+		""" Update time of next event and imminent children of {\tt cDEVS} from its event list.
+		"""
+		cDEVS.myTimeAdvance = cDEVS.eventList.getMinTime()
+		cDEVS.immChildren = cDEVS.eventList.getImminents()
+
+	###
+	def receive(self, cDEVS, msg):
+
+		t = msg[2]
+
+		# $(*,\,t)$ message
+		if msg[0] == 1:
+			if t != cDEVS.myTimeAdvance:
+				Error("Bad synchronization...3", 1)
+
+			imm = cDEVS.immChildren
+			if not imm:
+				raise IndexError
+
+			### immChildren is sorted by rank, so the default select function is the first item
+			if cDEVS.select.im_func is CoupledDEVS.select.im_func:
+				dStar = imm[0]
+			else:
+				dStar = cDEVS.select(imm)
+
+			self.threading_send(self.send(dStar, msg), cDEVS, t)
+
+			self.reschedule(cDEVS)
+
+			return cDEVS.myOutput
+
+		# ${x,\,t)$ message
+		elif isinstance(msg[0], dict):
+			if not(cDEVS.timeLast <= t <= cDEVS.myTimeAdvance):
+				Error("Bad synchronization...4", 1)
+
+			cDEVS.myInput = msg[0]
+
+			self.threading_send(cDEVS.myInput, cDEVS, t)
+
+			self.reschedule(cDEVS)
+
+		# $(i,\,t)$ message --- (re)build the event list
+		elif msg[0] == 0:
+			cDEVS.timeLast = 0
+			cDEVS.eventList = self.event_list_cls(cDEVS.componentSet)
+
+			for d in cDEVS.componentSet:
+				self.send(d, msg)
+				cDEVS.timeLast = max(cDEVS.timeLast, d.timeLast)
+
+			self.reschedule(cDEVS)
+
+		else:
+			Error("Unrecognized message", 1)
+
 #def worker(d, msg, q):
 	#CS = CoupledSolver()
 	#r = CS.receive(d, msg)
@@ -145,7 +145,10 @@ class MPIRedirect(object):
         data = [call_id, method, args, kwargs]
         if wait:
             MPIRedirect.waiting[call_id] = event = threading.Event()
-        MPIRedirect.lst.append(COMM_WORLD.isend(data, dest=self.rank, tag=1))
+        # Use the COMM_WORLD of the middleware, which can be replaced by a local world (see localMPI)
+        request = middleware.COMM_WORLD.isend(data, dest=self.rank, tag=1)
+        if request is not None:
+            MPIRedirect.lst.append(request)
         if wait:
             event.wait()
             response = MPIRedirect.waiting[call_id]
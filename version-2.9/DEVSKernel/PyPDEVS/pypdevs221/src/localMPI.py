@@ -0,0 +1,303 @@
+# -*- coding: Latin-1 -*-
+"""
+Local replacement of MPI: the simulation kernels run as local processes communicating over pipes.
+
+The rank 0 (controller) is the current process and every other rank is a forked process hosting a Server,
+so the distributed (Time Warp) simulation runs unchanged on a single machine without mpi4py. Only the part
+of MPI.COMM_WORLD used by PyPDEVS is provided (point-to-point messages, bcast and barrier).
+
+Processes are created with fork (the modules of the model are inherited by the kernels), so this is only
+available on posix platforms. The model and the messages are pickled, as with MPI.
+"""
+
+import os
+import sys
+import threading
+import multiprocessing
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import middleware
+from server import Server
+from DEVS import AtomicDEVS
+from util import DEVSException
+
+# Attributes of the atomic models handled by the simulation kernel, which are not sent back to the controller
+KERNEL_ATTRIBUTES = frozenset(["IPorts", "OPorts", "ports", "parent", "oldStates", "myInput", "myOutput", "location", "relocatable", "model_id", "fullName", "timeLast", "timeNext", "elapsed", "selectHierarchy", "memo"])
+
+class Status(object):
+    """
+    Status of a received message (source and tag)
+    """
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.source = None
+        self.tag = None
+
+    def Get_source(self):
+        """
+        :returns: int -- the rank that sent the message
+        """
+        return self.source
+
+    def Get_tag(self):
+        """
+        :returns: int -- the tag of the message
+        """
+        return self.tag
+
+class Request(object):
+    """
+    Messages are buffered by the pipes, so a send is complete as soon as it returns
+    """
+    @staticmethod
+    def Wait(request):
+        """
+        Wait for the completion of a request, which is immediate
+        """
+        pass
+
+    wait = Wait
+
+class MPI(object):
+    """
+    The part of the mpi4py MPI module used by PyPDEVS
+    """
+    ANY_SOURCE = -1
+    ANY_TAG = -1
+    Status = Status
+    Request = Request
+
+class LocalComm(object):
+    """
+    The communicator of a rank of a local world, with the interface of MPI.COMM_WORLD
+    """
+    def __init__(self, world, rank):
+        """
+        Constructor
+
+        :param world: the LocalWorld
+        :param rank: the rank of the process using this communicator
+        """
+        self.world = world
+        self.rank = rank
+        # Received messages that did not match a previous recv
+        self.pending = []
+        self.lock = threading.Lock()
+
+    def Get_rank(self):
+        """
+        :returns: int -- the rank of the current process
+        """
+        return self.rank
+
+    def Get_size(self):
+        """
+        :returns: int -- the number of processes of the world
+        """
+        return self.world.size
+
+    def send(self, data, dest, tag):
+        """
+        Send data to the rank dest. The data is pickled immediately, so it can be modified after the call.
+
+        :param data: the data to send
+        :param dest: the destination rank
+        :param tag: the tag of the message
+        """
+        self.world.queues[dest].put(pickle.dumps((self.rank, tag, data), pickle.HIGHEST_PROTOCOL))
+
+    def isend(self, data, dest, tag):
+        """
+        Send data to the rank dest without waiting for its reception
+
+        :returns: None, as there is no request to wait for
+        """
+        self.send(data, dest, tag)
+
+    def recv(self, source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG, status=None):
+        """
+        Receive the first message from source with tag (both can be MPI.ANY_*)
+
+        :param source: the rank to receive from
+        :param tag: the tag of the message
+        :param status: a Status filled with the source and the tag of the message
+        :returns: the received data
+        """
+        match = lambda msg: (source == MPI.ANY_SOURCE or msg[0] == source) and (tag == MPI.ANY_TAG or msg[1] == tag)
+        with self.lock:
+            for msg in self.pending:
+                if match(msg):
+                    self.pending.remove(msg)
+                    break
+            else:
+                while 1:
+                    msg = pickle.loads(self.world.queues[self.rank].get())
+                    if match(msg):
+                        break
+                    self.pending.append(msg)
+        if status is not None:
+            status.source, status.tag = msg[0], msg[1]
+        return msg[2]
+
+    def bcast(self, data, root=0):
+        """
+        Broadcast data from the rank root to all the ranks. Collective operations use their own pipes,
+        so they don't interfere with the point-to-point messages.
+
+        :param data: the data to broadcast (only used at root)
+        :param root: the rank that broadcasts
+        :returns: the broadcasted data
+        """
+        if self.rank == root:
+            pickled_data = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+            for rank in range(self.world.size):
+                if rank != root:
+                    self.world.collectives[rank].put(pickled_data)
+            return data
+        else:
+            return pickle.loads(self.world.collectives[self.rank].get())
+
+    def barrier(self):
+        """
+        Wait until all the ranks have reached the barrier (the rank 0 coordinates it)
+        """
+        if self.rank == 0:
+            for _ in range(self.world.size - 1):
+                self.world.collectives[0].get()
+            for rank in range(1, self.world.size):
+                self.world.collectives[rank].put(None)
+        else:
+            self.world.collectives[0].put(None)
+            self.world.collectives[self.rank].get()
+
+def install(comm):
+    """
+    Use the communicator comm as the MPI.COMM_WORLD of PyPDEVS in the current process
+
+    :param comm: the LocalComm of the current process
+    """
+    middleware.COMM_WORLD = comm
+    middleware.MPI = MPI
+
+def getAttributes(model):
+    """
+    Return the picklable attributes of an atomic model, without the attributes of the simulation kernel
+
+    :param model: the atomic model
+    :returns: dict -- attribute name to value
+    """
+    attributes = {}
+    for name, value in model.__dict__.items():
+        if name in KERNEL_ATTRIBUTES:
+            continue
+        try:
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            continue
+        attributes[name] = value
+    return attributes
+
+class LocalServer(Server):
+    """
+    The server of a forked simulation kernel
+    """
+    def getModelAttributes(self):
+        """
+        Return the attributes of the models simulated at this kernel
+
+        :returns: dict -- model_id to the picklable attributes of the model
+        """
+        return dict((model.model_id, getAttributes(model)) for model in self.kernel.destinations if isinstance(model, AtomicDEVS))
+
+def serve(world, rank):
+    """
+    Main function of a forked simulation kernel: serve the requests until the termination message
+
+    :param world: the LocalWorld
+    :param rank: the rank of the kernel
+    """
+    install(LocalComm(world, rank))
+    LocalServer(rank, world.size)
+    # The listener thread of the server stops on the termination message (tag 0)
+    current = threading.current_thread()
+    for thread in threading.enumerate():
+        if thread is not current and not thread.daemon:
+            thread.join()
+
+class LocalWorld(object):
+    """
+    A world of local processes replacing MPI.COMM_WORLD during a simulation
+    """
+    # The model is pickled recursively when it is broadcasted, so deep (or cyclic) couplings need a higher limit
+    RECURSION_LIMIT = 10000
+
+    def __init__(self, size):
+        """
+        Constructor
+
+        :param size: the number of simulation kernels (the controller included)
+        """
+        if not hasattr(os, "fork"):
+            raise DEVSException("Local distributed simulation requires fork (posix platforms only)")
+        self.size = size
+        # One pipe for the point-to-point messages and one for the collective operations of each rank
+        self.queues = [multiprocessing.Queue() for _ in range(size)]
+        self.collectives = [multiprocessing.Queue() for _ in range(size)]
+        self.processes = []
+        self.backup = None
+        self.recursionlimit = None
+
+    def start(self):
+        """
+        Fork the simulation kernels and use the world in the current process (rank 0).
+
+        Must be called before the construction of the Simulator.
+        """
+        for rank in range(1, self.size):
+            process = multiprocessing.Process(target=serve, args=(self, rank))
+            process.daemon = True
+            process.start()
+            self.processes.append(process)
+        self.backup = (middleware.COMM_WORLD, middleware.__dict__.get("MPI"))
+        install(LocalComm(self, 0))
+        self.recursionlimit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(self.recursionlimit, LocalWorld.RECURSION_LIMIT))
+
+    def fetchModels(self, simulator):
+        """
+        Copy the attributes of the models simulated by the forked kernels into the models of the controller.
+
+        Must be called after the simulation, before stop.
+
+        :param simulator: the Simulator
+        """
+        for rank in range(1, self.size):
+            for model_id, attributes in simulator.server.getProxy(rank).getModelAttributes().items():
+                simulator.model_ids[model_id].__dict__.update(attributes)
+
+    def stop(self):
+        """
+        Stop the simulation kernels and restore the previous MPI.COMM_WORLD
+        """
+        if self.backup is None:
+            return
+        # Termination message to every rank, the controller included
+        middleware.cleanupMPI()
+        for process in self.processes:
+            process.join(5.0)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        middleware.COMM_WORLD, MPI = self.backup
+        if MPI is None:
+            del middleware.MPI
+        else:
+            middleware.MPI = MPI
+        sys.setrecursionlimit(self.recursionlimit)
+        self.backup = None
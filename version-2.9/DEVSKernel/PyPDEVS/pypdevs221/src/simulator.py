@@ -132,7 +132,8 @@ class Simulator(object):
 
         from middleware import COMM_WORLD
         # Simulator is always started at the controller
-        self.server = Server(0, size)
+        # The size of the world is not fixed at import, as a local world can be started (see localMPI)
+        self.server = Server(0, COMM_WORLD.Get_size())
 
         self.model = model
 
@@ -210,7 +210,8 @@ class Solver(object):
         :returns: the models that should be rescheduled
         """
         cDEVS = self.model
-        imminent = cDEVS.scheduler.getImminent(time)
+        # Some schedulers (HeapSet, Polymorphic) return a set, so take a list for the select
+        imminent = list(cDEVS.scheduler.getImminent(time))
         if not imminent:
             # For real time simulation, when a model is interrupted
             return self.transitioning
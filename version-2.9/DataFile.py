@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# DataFile.py --- Columnar binary files of (time, value) samples
+#                     --------------------------------
+# Version                                        last modified: 18/10/2026
+###############################################################################
+# NOTES:
+#
+# A column file starts with the MAGIC header and is followed by chunks. Each
+# chunk is made of the number n of samples (unsigned 32 bits integer) followed
+# by the n times and the n values (little-endian 64 bits floats). Chunks are
+# appended by the writer when its in-memory buffers are full, so the file is
+# opened once per chunk and not once per sample.
+#
+# readData reads column files as well as the text files written by To_Disk.
+#
+# A row file starts with the ROW_MAGIC header, the number n of values per row
+# and the number k of keys (unsigned 32 bits integers) followed by the k keys
+# (signed 32 bits integers). Rows of n+1 little-endian 64 bits floats (time
+# then values) follow, so the row i is at a fixed offset and can be read from
+# a memory map without parsing.
+###############################################################################
+
+from __future__ import with_statement
+
+import os
+import sys
+import mmap
+import struct
+from array import array
+
+import gettext
+_ = gettext.gettext
+
+MAGIC = 'DSPYCOL1'
+CHUNK_HEADER = struct.Struct('<I')
+
+ROW_MAGIC = 'DSPYROW1'
+ROW_HEADER = struct.Struct('<II')
+
+### default number of samples per chunk
+CHUNK_SIZE = 65536
+
+###############################################################################
+# WRITER
+###############################################################################
+
+class ColumnWriter:
+	""" Buffered writer of a column file.
+	"""
+
+	def __init__(self, fn, chunk_size = CHUNK_SIZE):
+		""" Constructor.
+
+			@param fn : Name of the column file (overwritten)
+			@param chunk_size : Number of samples buffered before writing
+		"""
+
+		self.fn = fn
+		self.chunk_size = chunk_size
+
+		self.times = array('d')
+		self.values = array('d')
+
+		with open(self.fn, 'wb') as f:
+			f.write(MAGIC)
+
+	def append(self, t, v):
+		""" Add the sample (t, v).
+		"""
+		self.times.append(t)
+		self.values.append(v)
+		if len(self.times) >= self.chunk_size:
+			self.flush()
+
+	def flush(self):
+		""" Write the buffered samples as a new chunk.
+		"""
+
+		n = len(self.times)
+		if n == 0:
+			return
+
+		if sys.byteorder != 'little':
+			self.times.byteswap()
+			self.values.byteswap()
+
+		with open(self.fn, 'ab') as f:
+			f.write(CHUNK_HEADER.pack(n))
+			self.times.tofile(f)
+			self.values.tofile(f)
+
+		self.times = array('d')
+		self.values = array('d')
+
+	def close(self):
+		""" Write the remaining samples.
+		"""
+		self.flush()
+
+class RowWriter:
+	""" Writer of a row file.
+	"""
+
+	def __init__(self, fn, nb_values, keys = []):
+		""" Constructor.
+
+			@param fn : Name of the row file (overwritten)
+			@param nb_values : Number of values per row
+			@param keys : Integer keys of the values (column numbers for instance)
+		"""
+
+		self.nb_values = nb_values
+		self.row = struct.Struct('<%dd'%(nb_values+1))
+
+		self.f = open(fn, 'wb')
+		self.f.write(ROW_MAGIC)
+		self.f.write(ROW_HEADER.pack(nb_values, len(keys)))
+		self.f.write(struct.pack('<%di'%len(keys), *keys))
+
+	def append(self, t, values):
+		""" Add the row of time t.
+		"""
+		self.f.write(self.row.pack(t, *values))
+
+	def close(self):
+		self.f.close()
+
+###############################################################################
+# READERS
+###############################################################################
+
+class RowReader:
+	""" Random access to the rows of a row file through a memory map.
+	"""
+
+	def __init__(self, fn):
+		""" Constructor.
+		"""
+
+		self.f = open(fn, 'rb')
+
+		if self.f.read(len(ROW_MAGIC)) != ROW_MAGIC:
+			self.f.close()
+			raise IOError(_("%s is not a row file")%fn)
+
+		self.nb_values, nb_keys = ROW_HEADER.unpack(self.f.read(ROW_HEADER.size))
+		self.keys = list(struct.unpack('<%di'%nb_keys, self.f.read(4*nb_keys)))
+		self.offset = len(ROW_MAGIC) + ROW_HEADER.size + 4*nb_keys
+		self.row = struct.Struct('<%dd'%(self.nb_values+1))
+
+		size = os.path.getsize(fn)
+		self.length = (size - self.offset) / self.row.size
+		self.map = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ) if self.length else None
+
+	def __len__(self):
+		return self.length
+
+	def __getitem__(self, i):
+		""" Return the row i as a tuple (time, value, ...).
+		"""
+		if not 0 <= i < self.length:
+			raise IndexError(i)
+		return self.row.unpack_from(self.map, self.offset + i*self.row.size)
+
+	def close(self):
+		if self.map is not None:
+			self.map.close()
+			self.map = None
+		self.f.close()
+
+
+def isColumnFile(fn):
+	""" Return True if fn is a column file.
+	"""
+	with open(fn, 'rb') as f:
+		return f.read(len(MAGIC)) == MAGIC
+
+def readColumns(fn):
+	""" Return the times and the values stored in the column file fn as two array('d').
+	"""
+
+	times = array('d')
+	values = array('d')
+
+	with open(fn, 'rb') as f:
+		if f.read(len(MAGIC)) != MAGIC:
+			raise IOError(_("%s is not a column file")%fn)
+
+		while True:
+			header = f.read(CHUNK_HEADER.size)
+			### end of file (or chunk truncated by an interrupted simulation)
+			if len(header) < CHUNK_HEADER.size:
+				break
+			n, = CHUNK_HEADER.unpack(header)
+			try:
+				times.fromfile(f, n)
+				values.fromfile(f, n)
+			except EOFError:
+				k = min(len(times), len(values))
+				del times[k:]
+				del values[k:]
+				break
+
+	if sys.byteorder != 'little':
+		times.byteswap()
+		values.byteswap()
+
+	return times, values
+
+def readData(fn, separator = " "):
+	""" Return the content of the column or text file fn as a list of rows.
+		Rows of column files are (time, value) float tuples, rows of text files are lists of strings.
+	"""
+
+	if isColumnFile(fn):
+		return zip(*readColumns(fn))
+
+	with open(fn, 'r') as f:
+		if separator != "":
+			return [line.rstrip('\n').split(separator) for line in f]
+		else:
+			return [(i, line.rstrip('\n')) for i, line in enumerate(f)]
@@ -200,7 +200,7 @@ class TestApp(wx.App):
 		import gettext
 
 
-		#__builtin__.__dict__['PYDEVS_SIM_STRATEGY_DICT'] = {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3'}
+		#__builtin__.__dict__['PYDEVS_SIM_STRATEGY_DICT'] = {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3', 'event-queue':'SimStrategy7', 'compiled':'SimStrategy8', 'multi-process':'SimStrategy9'}
 		#__builtin__.__dict__['PYPDEVS_SIM_STRATEGY_DICT'] = {'original':'SimStrategy4', 'distributed':'SimStrategy5', 'parallel':'SimStrategy6'}
 
 		__builtin__.__dict__['NB_HISTORY_UNDO'] = 5
@@ -12,19 +12,24 @@ GLOBAL VARIABLES AND FUNCTIONS:
 
 from DomainInterface.DomainBehavior import DomainBehavior
 
+from ResultBuffer import ResultBuffer
+
 # ===================================================================   #
 class QuickScope(DomainBehavior):
-	"""	QuickScope(fusion, eventAxis)
+	"""	QuickScope(fusion, eventAxis, compact, capacity, spill)
 		
 		Atomic model ploting the data with some fonctionality.
 	"""
 
 	###
-	def __init__(self, fusion = True, eventAxis = False):
+	def __init__(self, fusion = True, eventAxis = False, compact = False, capacity = 0, spill = True):
 		""" Constructor.
 		
 			@param fusion : Flag to plot all signals on one graphic
 			@param eventAxis : Flag to plot depending event axis
+			@param compact : Flag to store the results in float columns (numerical values only)
+			@param capacity : Number of samples per signal kept in memory in compact mode (0 for no limit)
+			@param spill : Flag to write the oldest samples on the disk instead of dropping them when the capacity is reached
 		"""
 		DomainBehavior.__init__(self)
 		
@@ -35,6 +40,10 @@ class QuickScope(DomainBehavior):
 		self.fusion = fusion
 		# replace time axis with step axis
 		self.eventAxis = eventAxis
+		# compact storage of the results
+		self.compact = compact
+		self.capacity = capacity
+		self.spill = spill
 		
 		# results tab (results attribut must be defined in order to plot the data)
 		self.results = {} #OrderedDict()
@@ -68,10 +77,9 @@ class QuickScope(DomainBehavior):
 				### adapted with PyPDEVS
 				val = msg.value[0] if hasattr(self, 'peek') else msg[0][0]
 				
-				if np in self.results:
-					self.results[np].append((self.t, val))
-				else:
-					self.results[np]=[(self.t, val)]
+				if np not in self.results:
+					self.results[np] = ResultBuffer(self.capacity, self.spill) if self.compact else []
+				self.results[np].append((self.t, val))
 					
 				del msg
 				
@@ -2,7 +2,7 @@
 
 """
 Name : To_Disk.py
-Brief descritpion : Atomic Model writing results in text file on the disk
+Brief descritpion : Atomic Model writing results in text or binary column file on the disk
 Author(s) : Laurent CAPOCCHI <capocchi@univ-corse.fr>
 Version :  2.0
 Last modified : 01/04/14
@@ -18,20 +18,23 @@ import random
 from decimal import *
 import os
 
+from DataFile import ColumnWriter
+
 #  ================================================================    #
 class To_Disk(QuickScope):
 	"""	Atomic Model writing on the disk.
 	"""
 
 	###
-	def __init__(self, fileName = os.path.join(os.getcwd(),"result%d"%random.randint(1,100)), eventAxis = False, comma = " ", ext = '.dat', col = 0):
+	def __init__(self, fileName = os.path.join(os.getcwd(),"result%d"%random.randint(1,100)), eventAxis = False, comma = " ", ext = '.dat', col = 0, binary = False):
 		""" Constructor.
 
 			@param fileName : Name of output fileName
 			@param eventAxis : Flag to plot depending events axis
 			@param comma : Comma symbol
-			@param ext : Output file extension
+			@param ext : Output file extension (.bin for the binary column files if it is the default .dat)
 			@param col : Considered column
+			@param binary : Flag to write buffered binary column files (numerical values only) instead of text files
 		"""
 		QuickScope.__init__(self)
 
@@ -39,8 +42,9 @@ class To_Disk(QuickScope):
 		self.fileName = fileName
 		print(self.fileName)
 		self.comma = comma
-		self.ext = ext
+		self.ext = '.bin' if binary and ext == '.dat' else ext
 		self.col = col
+		self.binary = binary
 
 		#decimal precision
 		getcontext().prec = 6
@@ -50,6 +54,10 @@ class To_Disk(QuickScope):
 
 		self.buffer = {}
 
+		### column writers and last (time, value) not yet written for binary mode
+		self.writer = {}
+		self.pending = {}
+
 		### buffer position with default lenght 100
 		#self.pos = [-1]*100
 
@@ -81,6 +89,11 @@ class To_Disk(QuickScope):
 			### filename
 			fn = "%s%d%s"%(self.fileName, np, self.ext)
 
+			if self.binary:
+				if msg:
+					self.bufferize(fn, msg)
+				continue
+
 			### remove all old file starting
 			if self.timeLast == 0 and self.timeNext == INFINITY:
 				self.last_time_value[fn] = 0.0
@@ -142,7 +155,37 @@ class To_Disk(QuickScope):
 		self.state["sigma"] = 0
 		return self.state
 
+	def bufferize(self, fn, msg):
+		""" Add the message to the column writer of the file fn.
+			Only the last value received at a given time is written.
+		"""
+
+		if self.ea:
+			self.ea += 1
+			t = float(self.ea)
+		### adapted with PyPDEVS
+		elif hasattr(self, 'peek'):
+			t = float(msg.time)
+		else:
+			t = float(msg[-1][0])
+
+		v = float(msg.value[self.col] if hasattr(self, 'peek') else msg[0][self.col])
+
+		if fn not in self.writer:
+			self.writer[fn] = ColumnWriter(fn)
+		elif self.pending[fn][0] != t:
+			self.writer[fn].append(*self.pending[fn])
+
+		self.pending[fn] = (t, v)
+
 	def finish(self, msg):
+		### flush the column writers
+		for fn, writer in self.writer.items():
+			writer.append(*self.pending[fn])
+			writer.close()
+		self.writer = {}
+		self.pending = {}
+
 		n = len(self.IPorts)
 		for np in xrange(n):
 			fn = "%s%d%s"%(self.fileName, np, self.ext)
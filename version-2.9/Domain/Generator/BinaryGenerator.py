@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+Name: BinaryGenerator.py
+Brief descritpion: This module replays data from a binary row file (converted from a FileGenerator CSV file) through a memory map
+Version:  1.0
+Last modified: 2026.10.18
+GENERAL NOTES AND REMARKS:
+
+Rows are read by index from the memory mapped file: there is neither text parsing nor float conversion during the simulation.
+The binary file is made once from the CSV file with the csvToBinary function (same listValues, time, outPutFrequency and comma parameters as FileGenerator):
+
+	python BinaryGenerator.py fichier.csv fichier.bin [listValues [time [outPutFrequency [comma]]]]
+
+GLOBAL VARIABLES AND FUNCTIONS:
+"""
+
+from __future__ import with_statement
+
+from Domain.Generator.Generator import *
+from Domain.Generator.FileGenerator import FileGenerator
+from DataFile import RowReader, RowWriter
+
+import os
+import gettext
+_ = gettext.gettext
+
+def csvToBinary(csvName, binName, listValues=[1], time=0, outPutFrequency=1.0, comma=" "):
+	""" Convert the CSV file csvName read by FileGenerator with the same parameters into the binary row file binName.
+		Return the number of rows.
+	"""
+
+	g = FileGenerator(csvName, listValues, time, outPutFrequency, comma)
+
+	### values are stored in the order of the column numbers
+	keys = sorted(g.V.keys())
+	writer = None
+	n = 0
+
+	try:
+		for t, values in g.rows():
+			### all the columns of the row
+			if listValues == []:
+				row = map(float, values[0])
+				if writer is None:
+					writer = RowWriter(binName, len(row), range(len(row)))
+				elif len(row) != writer.nb_values:
+					raise ValueError(_("Line %d of %s has %d columns instead of %d")%(n+1, csvName, len(row), writer.nb_values))
+			else:
+				row = [float(values[k]) for k in keys]
+				if writer is None:
+					writer = RowWriter(binName, len(row), keys)
+
+			writer.append(t, row)
+			n += 1
+	finally:
+		if writer is None:
+			writer = RowWriter(binName, len(keys), keys)
+		writer.close()
+
+	return n
+
+class BinaryGenerator(Generator):
+	""" BinaryGenerator atomic Model.
+		This model, sends message from the rows of a binary file made by csvToBinary.
+		The number of output can be one or more depending of the listValues parameter.
+		If listValues is empty, only one ouptut port is used and it sends the list of the values of the row.
+		Else, listValues are the column numbers of the CSV file (they must have been converted).
+	"""
+
+	def __init__(self, fileName=os.path.join(os.getcwd(), "fichier.bin"), listValues=[1]):
+		"""
+		@param fileName : path of the binary file
+		@param listValues : considered columns numbers (as number of output)
+		"""
+
+		Generator.__init__(self, fileName, listValues)
+
+		self.V = self.initDictionnaryValues(listValues)
+
+		sig = self.initSource() if self.file_error_flag else INFINITY
+
+		self.state = {'status':'ACTIVE','sigma':sig}
+
+	def rows(self):
+		""" Iterator on the rows of the memory mapped file.
+		"""
+		reader = RowReader(self.sourceName)
+		try:
+			if self.list_empty_flag:
+				for i in xrange(len(reader)):
+					r = reader[i]
+					yield r[0], {0:list(r[1:])}
+			else:
+				keys = self.V.keys()
+				missing = [k for k in keys if k not in reader.keys]
+				if missing:
+					raise ValueError(_("Columns %s are not in %s")%(missing, self.sourceName))
+				### position of the considered columns in the rows
+				index = [reader.keys.index(k)+1 for k in keys]
+				for i in xrange(len(reader)):
+					r = reader[i]
+					yield r[0], dict(zip(keys, [r[j] for j in index]))
+		finally:
+			reader.close()
+
+	def __str__(self): return "BinaryGenerator"
+
+if __name__ == '__main__':
+	import sys
+
+	if len(sys.argv) < 3:
+		sys.stdout.write("Usage: python BinaryGenerator.py fichier.csv fichier.bin [listValues [time [outPutFrequency [comma]]]]\n")
+		sys.exit(1)
+
+	args = sys.argv[1:3]
+	if len(sys.argv) > 3: args.append(eval(sys.argv[3]))
+	if len(sys.argv) > 4: args.append(int(sys.argv[4]))
+	if len(sys.argv) > 5: args.append(float(sys.argv[5]))
+	if len(sys.argv) > 6: args.append(sys.argv[6])
+
+	sys.stdout.write("%d rows converted\n"%csvToBinary(*args))
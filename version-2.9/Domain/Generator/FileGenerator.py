@@ -47,46 +47,47 @@ class FileGenerator(Generator):
 		self.outPutFrequency = outPutFrequency
 		self.__comma = comma
 
-		if self.file_error_flag:
-			with open(fileName, "rb") as f:
-				for i,l in enumerate(filter(lambda b: b != '' , map(lambda a: a.replace('\n', ''), f.readlines()))):
-
-					### ligne courante de valeurs et longueur
-					row = map(lambda b:b.strip(), filter(lambda a: a!='', l.split(self.__comma)))
-					lenght = len(row)
-
-					### listValues est vide, liste de temps remplit avec entiers dependant de la frÃ©quence de sortie
-					if self.list_empty_flag :
-						t = i*self.outPutFrequency
-					### listValues non vide alors la colonne de temps est spÃ©cifier par time
-					else:
-						t = row[self.time]
-
-					### empty lines
-					if t != '':
-						self.T.append(float(t))
-					else:
-						continue
-
-					### si listValues vide alors un seul port de sortie
-					if self.list_empty_flag:
-						self.V[0].append(row)
-					else:
-						### pour chaque port de sortie specifier dans listValues
-						for val in self.V.keys():
-							### si l'utilsiateur demande une colonne superieur au nombre de colonne dans le fichier -> derniere selectionnÃ©e
-							if val >= lenght:
-								self.V[val].append(row[lenght-1].strip())
-							### l'utilisateur demande une colonne inferieur a 0 ou egale a 0 (colonne de temps) -> premiere selectionnÃ©e
-							elif val < 0 or val == 0:
-								self.V[val].append(row[1].strip())
-							else:
-								self.V[val].append(row[val].strip())
-
-			sig = self.T[0] if self.T != [] else INFINITY
-		else:
-			sig = INFINITY
+		sig = self.initSource() if self.file_error_flag else INFINITY
 
 		self.state = {'status':'ACTIVE','sigma':sig}
 
+	def rows(self):
+		""" Iterator on the rows of the file (read line by line).
+		"""
+		with open(self.sourceName, "rb") as f:
+			for i,l in enumerate(line for line in (a.replace('\n', '') for a in f) if line != ''):
+
+				### ligne courante de valeurs et longueur
+				row = map(lambda b:b.strip(), filter(lambda a: a!='', l.split(self.__comma)))
+				lenght = len(row)
+
+				### listValues est vide, liste de temps remplit avec entiers dependant de la frÃ©quence de sortie
+				if self.list_empty_flag :
+					t = i*self.outPutFrequency
+				### listValues non vide alors la colonne de temps est spÃ©cifier par time
+				else:
+					t = row[self.time]
+
+				### empty lines
+				if t == '':
+					continue
+
+				### si listValues vide alors un seul port de sortie
+				if self.list_empty_flag:
+					values = {0:row}
+				else:
+					values = {}
+					### pour chaque port de sortie specifier dans listValues
+					for val in self.V.keys():
+						### si l'utilsiateur demande une colonne superieur au nombre de colonne dans le fichier -> derniere selectionnÃ©e
+						if val >= lenght:
+							values[val] = row[lenght-1].strip()
+						### l'utilisateur demande une colonne inferieur a 0 ou egale a 0 (colonne de temps) -> premiere selectionnÃ©e
+						elif val < 0 or val == 0:
+							values[val] = row[1].strip()
+						else:
+							values[val] = row[val].strip()
+
+				yield float(t), values
+
 	def __str__(self): return "FileGenerator"
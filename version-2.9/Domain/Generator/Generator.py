@@ -7,6 +7,12 @@ Author(s): L. Capocchi <capocchi@univ-corse.fr>
 Version:  1.0
 Last modified: 2011.11.16
 GENERAL NOTES AND REMARKS:
+
+Rows (time, {key: value}) are consumed from the iterator returned by the rows method through a bounded read-ahead buffer.
+By default, rows are taken from the T and V lists; generators reading files override rows in order to stream them from the disk.
+The iterator is not pickled: a copy of the model (distributed simulation) keeps the buffer and the number of rows read,
+and reopens the rows when it needs the next ones.
+
 GLOBAL VARIABLES AND FUNCTIONS:
 """
 
@@ -15,6 +21,11 @@ from DomainInterface.DomainBehavior import DomainBehavior
 from Domain.Basic.Object import Message
 
 import os.path
+from collections import deque
+from itertools import islice
+
+### number of rows read ahead
+BUFFER_SIZE = 1024
 
 #    ======================================================================    #
 class Generator(DomainBehavior):
@@ -36,6 +47,11 @@ class Generator(DomainBehavior):
 		self.T = []
 		self.V = {}
 
+		### iterator on rows, read-ahead buffer and number of rows read
+		self.source = None
+		self.buffer = deque()
+		self.read = 0
+
 		### flags
 		self.type_error_flag = True in map(lambda a: not isinstance(a, int), self.__listValues)
 		self.file_error_flag = os.path.exists(self.sourceName)
@@ -44,6 +60,17 @@ class Generator(DomainBehavior):
 		### assert
 		if self.type_error_flag: assert True, "Please use integer in listValue parameter !"
 
+	def __getstate__(self):
+		state = self.__dict__.copy()
+		state['source'] = None
+		return state
+
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+		### the rows already read are skipped when the source is reopened
+		if self.read:
+			self.source = islice(self.rows(), self.read, None)
+
 	@staticmethod
 	def initDictionnaryValues(values):
 		if values == []:
@@ -51,27 +78,60 @@ class Generator(DomainBehavior):
 		else:
 			return dict([(value,[])for value in values])
 
+	def rows(self):
+		""" Iterator on the rows (time, {key: value}) built from the T and V lists.
+		"""
+		for i, t in enumerate(self.T):
+			yield t, dict([(k, v[i]) for k, v in self.V.items()])
+
+	def initSource(self):
+		""" Start to read rows and return the time of the first one.
+		"""
+		self.source = self.rows()
+		self.buffer.clear()
+		self.read = 0
+		self.fill()
+		return self.buffer[0][0] if self.buffer else INFINITY
+
+	def fill(self):
+		""" Read ahead the next rows.
+		"""
+		n = len(self.buffer)
+		self.buffer.extend(islice(self.source, BUFFER_SIZE))
+		self.read += len(self.buffer) - n
+
+	def getRow(self):
+		""" Return the current row.
+		"""
+		if self.source is None:
+			self.initSource()
+		return self.buffer[0]
+
 	def intTransition(self):
 		try:
-			s = self.T[1]-self.T[0]
-			del self.T[0]
+			t = self.getRow()[0]
+			self.buffer.popleft()
+			if not self.buffer:
+				self.fill()
+			s = self.buffer[0][0]-t
 		except IndexError:
 			s = INFINITY
 
 		self.state['sigma'] = s
 
 	def outputFnc(self):
+		values = self.getRow()[1]
+
 		### si la listValues est vide, cela veux dire qu'on veut toutes les valeurs des lignes sur une sortie
 		if self.__listValues != []:
 			assert(len(self.OPorts) == len(self.__listValues))
-			for item in self.__listValues:
-				data = [self.V[item].pop(0), 0.0, 0.0]
+			for i, item in enumerate(self.__listValues):
+				data = [values[item], 0.0, 0.0]
 				msg = Message(data, self.timeNext)
-				i = self.__listValues.index(item)
 
 				self.poke(self.OPorts[i], msg)
 		else:
-			data = [self.V[0].pop(0), 0.0, 0.0]
+			data = [values[0], 0.0, 0.0]
 			msg = Message(data, self.timeNext)
 			self.poke(self.OPorts[0], msg)
 
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from Generator.Generator import *
-from xml.dom import minidom
+from xml.etree.cElementTree import iterparse
 import os.path
 
 class XMLGenerator(Generator):
@@ -37,21 +37,28 @@ class XMLGenerator(Generator):
 		self.outPutFrequency = outPutFrequency
 		self.V = self.initDictionnaryValues(listValues)
 
-		if os.path.exists(self.sourceName):
-			myFile = minidom.parse(self.sourceName)
-			allData = myFile.getElementsByTagName(self.line)
-
-			for data in allData:
-				self.T.append(int(data.getElementsByTagName(time)[0].firstChild.data))
-				for value in listValues:
-					d = float(data.getElementsByTagName(value)[0].firstChild.data)
-					self.V[value].append(d)
-
 		### if xml file and time data exists
-		sig = self.T[0] if self.T != [] else INFINITY
+		sig = self.initSource() if os.path.exists(self.sourceName) else INFINITY
 
 		self.state = {'status':'ACTIVE','sigma':sig}
 
+	def rows(self):
+		""" Iterator on the line tags of the file (parsed incrementally).
+		"""
+		parents = []
+		for event, data in iterparse(self.sourceName, events=('start', 'end')):
+			if event == 'start':
+				parents.append(data)
+			else:
+				parents.pop()
+				if data.tag == self.line:
+					t = int(data.find('.//%s'%self.time).text)
+					values = dict([(value, float(data.find('.//%s'%value).text)) for value in self.V])
+					### free the parsed line
+					if parents:
+						parents[-1].remove(data)
+					yield t, values
+
 	def __str__(self):
 		return "XMLGenerator"
 
@@ -1,5 +1,6 @@
 __all__ =[
 "FileGenerator",
 "XMLGenerator",
+"BinaryGenerator",
 "RandomGenerator"
 ]
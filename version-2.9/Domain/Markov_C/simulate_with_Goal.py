@@ -30,7 +30,7 @@ builtin_dict = {'SPLASH_PNG': os.path.join(ABS_HOME_PATH, 'splash', 'splash.png'
                 'LOCAL_EDITOR': True, # for the use of local editor
                 'LOG_FILE': os.devnull, # log file (null by default)
                 'DEFAULT_SIM_STRATEGY': 'bag-based', #choose the default simulation strategy for PyDEVS
-                'PYDEVS_SIM_STRATEGY_DICT' : {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3'}, # list of available simulation strategy for PyDEVS package
+                'PYDEVS_SIM_STRATEGY_DICT' : {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3', 'event-queue':'SimStrategy7', 'compiled':'SimStrategy8', 'multi-process':'SimStrategy9'}, # list of available simulation strategy for PyDEVS package
                                 'PYPDEVS_SIM_STRATEGY_DICT' : {'classic':'SimStrategy4', 'distributed':'SimStrategy5', 'parallel':'SimStrategy6'}, # list of available simulation strategy for PyPDEVS package
                 'HELP_PATH' : os.path.join('doc', 'html'), # path of help directory
                 'NTL' : False, # No Time Limit for the simulation
@@ -44,6 +44,16 @@ class Message:
 			@rtype: str
 		'''
 		return "<< value = %s, time = %s>>"%(self.value, self.time)
+
+	###
+	def copy(self):
+		'''	Copy method (used by the 'custom' message copy policy of PyDEVS).
+			@return: New message with a copy of the value list.
+			@rtype: Message
+		'''
+		msg = Message(self.value[:] if isinstance(self.value, list) else self.value, self.time)
+		msg.name = self.name
+		return msg
 	
 if __name__ == "__main__":
 	pass
@@ -83,6 +83,23 @@ class YAMLHandler:
 
         return {'success' : success, 'args' : self.getYAMLBlockModelArgs(label)}
 
+    def updateYAMLBlockModelArgs(self, label, new_args):
+        """ Updates in memory (the file is not saved) some parameters
+            of the block identified by the label
+            Returns the updated block parameters
+        """
+
+        if self.filename_is_valid != True: return False
+
+        block = self.diagram.GetShapeByLabel(label)
+
+        for arg in new_args:
+            if arg not in block.args:
+                raise KeyError("%s is not a parameter of %s"%(arg, label))
+            block.args[arg] = to_Python(new_args[arg])
+
+        return self.getYAMLBlockModelArgs(label)
+
     def getJSON(self, diagram=None):
         """ Make JSON representation of the model from YAML file
         """
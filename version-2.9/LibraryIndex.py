@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# LibraryIndex.py --- Static scan of the models of the libraries
+#                     --------------------------------
+# Version                                        last modified: 18/10/2026
+###############################################################################
+# NOTES:
+#
+# The python files (.py, or the behavioral file of .amd/.cmd archives) are
+# parsed with the ast module in order to know their classes (with their base
+# names, constructor arguments and documentation) without executing them.
+# Results are stored in an on-disk index keyed by the signature of the file
+# (path, mtime, size and CRC for archives), so a file is parsed again only if
+# it has changed. Modules are imported only when a block is dropped or
+# simulated.
+#
+# A class is a DEVS atomic model if the chain of its base names reaches
+# DomainBehavior. Base names are resolved with all the classes of the index;
+# when a base can't be resolved statically the model is considered as valid
+# (it will be checked at the import).
+###############################################################################
+
+from __future__ import with_statement
+
+import os
+import sys
+import ast
+import zipfile
+import cPickle
+
+import gettext
+_ = gettext.gettext
+
+from Utilities import GetUserConfigDir
+from ZipManager import getPythonModelFileName
+from Components import BlockFactory
+
+### version of the index format (the index is rebuilt if it changes)
+INDEX_VERSION = 1
+
+INDEX_FILE = os.path.join(GetUserConfigDir(), '.devsimpy_index')
+
+###############################################################################
+# SCAN
+###############################################################################
+
+def getBaseName(node):
+	""" Return the name of a base class node (Name or Attribute).
+	"""
+	if isinstance(node, ast.Name):
+		return node.id
+	elif isinstance(node, ast.Attribute):
+		return node.attr
+	else:
+		return None
+
+def getArgs(node):
+	""" Return the arguments of the constructor of the class node as a dict {name: default value}.
+		Default values that are not literals are None.
+	"""
+
+	for item in node.body:
+		if isinstance(item, ast.FunctionDef) and item.name == '__init__':
+			names = [a.id for a in item.args.args[1:] if isinstance(a, ast.Name)]
+			defaults = item.args.defaults
+			args = {}
+			for name, default in zip(names[len(names)-len(defaults):], defaults):
+				try:
+					args[name] = ast.literal_eval(default)
+				except (ValueError, TypeError):
+					args[name] = None
+			return args
+
+	return None
+
+def ScanSource(source, filename = '<string>'):
+	""" Return the information of the python source without executing it:
+		{'doc': module doc, 'classes': {name: {'bases': [...], 'args': {...}, 'doc': class doc}}, 'order': [class names], 'error': None or error message}
+	"""
+
+	info = {'doc': None, 'classes': {}, 'order': [], 'error': None}
+
+	try:
+		tree = ast.parse(source, filename)
+	except SyntaxError, e:
+		info['error'] = "%s: %s (line %s)"%(e.__class__.__name__, e.msg, e.lineno)
+		return info
+
+	info['doc'] = ast.get_docstring(tree)
+
+	for node in tree.body:
+		if isinstance(node, ast.ClassDef):
+			info['classes'][node.name] = {	'bases': filter(None, map(getBaseName, node.bases)),
+											'args': getArgs(node),
+											'doc': ast.get_docstring(node)}
+			info['order'].append(node.name)
+
+	return info
+
+def ScanFile(path):
+	""" Return the information of the python file path (or of the behavioral file of the .amd/.cmd archive path).
+	"""
+
+	try:
+		if zipfile.is_zipfile(path):
+			zf = zipfile.ZipFile(path, 'r')
+			try:
+				name = getPythonModelFileName(path)
+				source = zf.read(name)
+			finally:
+				zf.close()
+		else:
+			name = os.path.basename(path)
+			with open(path, 'rU') as f:
+				source = f.read()
+	except Exception, e:
+		return {'doc': None, 'classes': {}, 'order': [], 'error': str(e), 'name': None}
+
+	info = ScanSource(source.replace('\r\n', '\n'), path)
+	info['name'] = os.path.splitext(os.path.basename(name))[0]
+	return info
+
+###############################################################################
+# INDEX
+###############################################################################
+
+class LibraryIndex:
+	""" On-disk index of the scanned files {path: (signature, info)}.
+	"""
+
+	def __init__(self, fn = INDEX_FILE):
+		""" Constructor.
+		"""
+
+		self.fn = fn
+		self.entries = {}
+		self.dirty = False
+
+		try:
+			with open(self.fn, 'rb') as f:
+				version, entries = cPickle.load(f)
+			if version == INDEX_VERSION:
+				self.entries = entries
+		except Exception:
+			pass
+
+	def Get(self, path):
+		""" Return the information of the file path (scan it only if it has changed).
+		"""
+
+		signature = BlockFactory.GetSignature(path)
+
+		if path in self.entries and self.entries[path][0] == signature:
+			return self.entries[path][1]
+
+		info = ScanFile(path)
+		self.entries[path] = (signature, info)
+		self.dirty = True
+
+		return info
+
+	def Save(self):
+		""" Write the index on the disk if it has changed.
+		"""
+
+		if self.dirty:
+			### remove the entries of deleted files
+			for path in self.entries.keys():
+				if not os.path.exists(path):
+					del self.entries[path]
+			try:
+				with open(self.fn, 'wb') as f:
+					cPickle.dump((INDEX_VERSION, self.entries), f, cPickle.HIGHEST_PROTOCOL)
+			except IOError, info:
+				sys.stderr.write(_("Library index not saved: %s\n")%info)
+			else:
+				self.dirty = False
+
+	def GetBases(self, name):
+		""" Return the list of the base names of the classes called name in the index.
+		"""
+		return [info['classes'][name]['bases'] for signature, info in self.entries.values() if name in info['classes']]
+
+	def IsAtomic(self, name, visited = None):
+		""" Return True if the class name inherits from DomainBehavior, False if not and None if it can't be known statically.
+		"""
+
+		if name == 'DomainBehavior':
+			return True
+		elif name in ('object', 'Exception', 'DomainStructure'):
+			return False
+
+		visited = set() if visited is None else visited
+		if name in visited:
+			return False
+		visited.add(name)
+
+		L = self.GetBases(name)
+		if L == []:
+			return None
+
+		unknown = False
+		for bases in L:
+			for base in bases:
+				r = self.IsAtomic(base, visited)
+				if r:
+					return True
+				elif r is None:
+					unknown = True
+
+		return None if unknown else False
+
+	def GetModelClass(self, path):
+		""" Return the name of the model class of the file path (the class with the same name as the file or the first one that inherits from DomainBehavior).
+		"""
+
+		info = self.Get(path)
+
+		if info['name'] in info['classes']:
+			return info['name']
+
+		for name in info['order']:
+			if self.IsAtomic(name) is not False:
+				return name
+
+		return info['order'][0] if info['order'] else None
+
+	def GetError(self, path):
+		""" Return the static error of the file path (or None).
+		"""
+		return self.Get(path)['error']
+
+	def GetDoc(self, path):
+		""" Return the documentation of the file path.
+		"""
+		return self.Get(path)['doc']
+
+	def GetArgs(self, path):
+		""" Return the constructor arguments {name: default value} of the model class of the file path.
+		"""
+		name = self.GetModelClass(path)
+		return self.Get(path)['classes'][name]['args'] if name is not None else None
+
+	def IsAtomicModel(self, path):
+		""" Return True if the model class of the file path inherits from DomainBehavior (None if it can't be known statically).
+		"""
+		name = self.GetModelClass(path)
+		return self.IsAtomic(name) if name is not None else False
+
+### shared index
+index = None
+
+def GetIndex():
+	""" Return the shared library index.
+	"""
+
+	global index
+
+	if index is None:
+		index = LibraryIndex()
+
+	return index
@@ -38,6 +38,7 @@ from Components import BlockFactory, DEVSComponent, GetClass
 from ZipManager import Zip, getPythonModelFileName
 from ReloadModule import recompile
 from ImportLibrary import DeleteBox
+from LibraryIndex import GetIndex
 
 _ = wx.GetTranslation
 
@@ -136,6 +137,8 @@ class LibraryTree(wx.TreeCtrl):
 			### add new domain
 			self.InsertNewDomain(absdName, self.root, self.GetSubDomain(absdName, self.GetDomainList(absdName)).values()[0])
 
+		GetIndex().Save()
+
 		self.UnselectAll()
 		self.SortChildren(self.root)
 
@@ -158,7 +161,7 @@ class LibraryTree(wx.TreeCtrl):
 				tip += '\n'.join(domain_list) if domain_list != [] else ""
 
 			### is last item
-			else:
+			elif path.startswith('http'):
 				module = BlockFactory.GetModule(path)
 				info = Container.CheckClass(path)
 
@@ -169,6 +172,12 @@ class LibraryTree(wx.TreeCtrl):
 				else:
 					doc = inspect.getdoc(module)
 
+			### documentation from the library index (without importing the module)
+			else:
+				index = GetIndex()
+				doc = index.GetError(path) or index.GetDoc(path)
+
+			if not os.path.isdir(path):
 				tip = doc if doc is not None else _("No documentation for selected model.")
 
 			self.SetToolTipString(tip.decode('utf-8'))
@@ -368,9 +377,6 @@ class LibraryTree(wx.TreeCtrl):
 		""" Get the list of files from dName directory.
 		"""
 
-		### import are here because the simulator (PyDEVS or PyPDEVS) require it
-		from DomainInterface.DomainBehavior import DomainBehavior
-
 		### list of py file from __init__.py
 		if LibraryTree.EXT_LIB_PYTHON_FLAG:
 
@@ -404,18 +410,14 @@ class LibraryTree(wx.TreeCtrl):
 						### test if tmp is only composed by python file (case of the user write into the __init__.py file directory name is possible ! then we delete the directory names)
 						if os.path.isfile(python_file):
 
-							cls = GetClass(python_file)
-
-							if cls is not None and not isinstance(cls, tuple):
+							### static check from the library index (the module is imported only when the model is used)
+							index = GetIndex()
 
-								### only model that herite from DomainBehavior is shown in lib
-								if issubclass(cls, DomainBehavior):
-									py_file_list.append(s)
-								else:
-									sys.stderr.write(_("%s not imported : Class is not DomainBehavior \n"%(s)))
+							### only model that herite from DomainBehavior is shown in lib
+							if index.GetError(python_file) is None and index.IsAtomicModel(python_file) is False:
+								sys.stderr.write(_("%s not imported : Class is not DomainBehavior \n"%(s)))
 
-
-							### If cls is tuple, there is an error but we load the model to correct it.
+							### If there is an error, we load the model to correct it.
 							### If its not DEVS model, the Dnd don't allows the instantiation and when the error is corrected, it don't appear before a update.
 							else:
 
@@ -481,14 +483,14 @@ class LibraryTree(wx.TreeCtrl):
 					if not come_from_net:
 						path = os.path.join(parentPath, item)
 						zf = Zip(path)
-						module = zf.GetModule()
 						image_file = zf.GetImage()
+						### check error
+						error = GetIndex().GetError(path) is not None
 					else:
 						path = parentPath+'/'+item+'.py'
 						module = load_module_from_net(path)
-
-					### check error
-					error = isinstance(module, Exception)
+						### check error
+						error = isinstance(module, Exception)
 
 					### change icon depending on the error and the presence of image in amd
 					if error:
@@ -507,14 +509,14 @@ class LibraryTree(wx.TreeCtrl):
 					if not come_from_net:
 						path = os.path.join(parentPath, item)
 						zf = Zip(path)
-						module = zf.GetModule()
 						image_file = zf.GetImage()
+						### check error
+						error = GetIndex().GetError(path) is not None
 					else:
 						path = parentPath+'/'+item+'.py'
 						module = load_module_from_net(path)
-
-					### check error
-					error = isinstance(module, Exception)
+						### check error
+						error = isinstance(module, Exception)
 
 					### change icon depending on the error and the presence of image in amd
 					if error:
@@ -532,9 +534,10 @@ class LibraryTree(wx.TreeCtrl):
 
 					path = os.path.join(parentPath, "".join([item,'.py'])) if not parentPath.startswith('http') else parentPath+'/'+item+'.py'
 
-					info = Container.CheckClass(path)
-
-					error = isinstance(info, tuple)
+					if parentPath.startswith('http'):
+						error = isinstance(Container.CheckClass(path), tuple)
+					else:
+						error = GetIndex().GetError(path) is not None
 					img = self.not_importedidx if error else self.pythonfileidx
 					### insertion dans le tree
 					id = self.InsertItemBefore(parent, 0, item, img, img)
@@ -584,14 +587,14 @@ class LibraryTree(wx.TreeCtrl):
 							if not come_from_net:
 								path = os.path.join(item.keys()[0], elem)
 								zf = Zip(path)
-								module = zf.GetModule()
 								image_file = zf.GetImage()
+								### check error
+								error = GetIndex().GetError(path) is not None
 							else:
 								path = "".join([item.keys()[0],'/',elem,'.py'])
 								module = load_module_from_net(path)
-
-							### check error
-							error = isinstance(module, Exception)
+								### check error
+								error = isinstance(module, Exception)
 
 							### change icon depending on the error and the presence of image in amd
 							if error:
@@ -609,14 +612,14 @@ class LibraryTree(wx.TreeCtrl):
 							if not come_from_net:
 								path = os.path.join(item.keys()[0], elem)
 								zf = Zip(path)
-								module = zf.GetModule()
 								image_file = zf.GetImage()
+								### check error
+								error = GetIndex().GetError(path) is not None
 							else:
 								path = "".join([item.keys()[0],'/',elem,'.py'])
 								module = load_module_from_net(path)
-
-							### check error
-							error = isinstance(module, Exception)
+								### check error
+								error = isinstance(module, Exception)
 
 							### change icon depending on the error and the presence of image in amd
 							if error:
@@ -632,9 +635,10 @@ class LibraryTree(wx.TreeCtrl):
 						else:
 
 							path = os.path.join(item.keys()[0],"".join([elem,'.py'])) if not item.keys()[0].startswith('http') else item.keys()[0]+'/'+elem+'.py'
-							info = Container.CheckClass(path)
-
-							error = isinstance(info, tuple)
+							if item.keys()[0].startswith('http'):
+								error = isinstance(Container.CheckClass(path), tuple)
+							else:
+								error = GetIndex().GetError(path) is not None
 							img = self.not_importedidx if error else self.pythonfileidx
 
 							### insertion dans le tree
@@ -793,9 +797,12 @@ class LibraryTree(wx.TreeCtrl):
 					if name_list != []:
 						for name in filter(lambda a: not isinstance(a, dict), name_list):
 							path = d.keys()[0]
-							if not name.endswith(('.cmd','.amd')):
+							### only the models with static error are checked by importing them
+							if not name.endswith(('.cmd','.amd')) and GetIndex().GetError(os.path.join(path, name+'.py')) is not None:
 								self.CheckItem(os.path.join(path, name))
 
+			GetIndex().Save()
+
 			### restor expanded item
 			for item in map(lambda name: self.ItemDico[name], L):
 				self.Expand(item)
@@ -11,9 +11,12 @@ GENERAL NOTES AND REMARKS:
 GLOBAL VARIABLES AND FUNCTIONS:
 """
 
+from __future__ import with_statement
+
 import os
 import sys
 import cPickle
+import cStringIO
 import zipfile
 import zipimport
 import gzip
@@ -32,8 +35,6 @@ except ImportError, info:
 	__builtin__.__dict__['YAML_IMPORT'] = False
 	sys.stdout.write("yaml module was not found! Install it if you want to save model in yaml format.\n")
 
-from tempfile import gettempdir
-
 from Decorators import BuzyCursorNotification, StatusBarNotification, cond_decorator
 from Utilities import itersubclasses, getTopLevelWindow
 from XMLModule import makeDEVSXML
@@ -63,6 +64,38 @@ class PickledCollection(list):
 		for v in self.pickled_obj:
 			yield v
 
+###-----------------------------------------------------------
+### Native format of the dumped attributes (.dsp file and DEVSimPyModel.dat file of .amd/.cmd archives):
+### NATIVE_MAGIC, the version of the format (one byte) and the pickle (highest protocol) of the dict {attribute name: value}.
+### Attributes are restored by name, so attributes added to dump_attributes keep their default value when an older file is loaded.
+### Files without NATIVE_MAGIC are in the previous format (ascii pickle of the PickledCollection list) and are still loaded.
+NATIVE_MAGIC = 'DSPYDUMP'
+NATIVE_VERSION = 1
+
+### gzip compression level of .dsp files (9 is several times slower for a few percent of size)
+COMPRESS_LEVEL = 6
+
+def dumpsNative(obj):
+	""" Return the dump attributes of obj in the native format.
+	"""
+	D = dict((attr, getattr(obj, attr)) for attr in obj.dump_attributes)
+	return NATIVE_MAGIC + chr(NATIVE_VERSION) + cPickle.dumps(D, cPickle.HIGHEST_PROTOCOL)
+
+def loadsDump(data):
+	""" Return the dump attributes from the string data: a dict {name: value} for the native format, a list for the previous format.
+	"""
+
+	if data.startswith(NATIVE_MAGIC):
+		version = ord(data[len(NATIVE_MAGIC)])
+		if version > NATIVE_VERSION:
+			raise ValueError(_("format version %d is newer than the supported one (%d)")%(version, NATIVE_VERSION))
+		### cPickle reads cStringIO objects without copy nor python calls
+		f = cStringIO.StringIO(data)
+		f.seek(len(NATIVE_MAGIC)+1)
+		return cPickle.load(f)
+	else:
+		return list(cPickle.loads(data))
+
 class DumpBase(object):
 	""" DumpBase class
 	"""
@@ -145,10 +178,8 @@ class DumpZipFile(DumpBase):
 
 			fn = 'DEVSimPyModel.dat'
 
-			### dump attributes in fn file
-			cPickle.dump(	obj = PickledCollection(obj_dumped),
-							file = open(fn, "wb"),
-							protocol = 0)
+			### dump attributes
+			data = dumpsNative(obj_dumped)
 
 		except Exception, info:
 
@@ -160,14 +191,8 @@ class DumpZipFile(DumpBase):
 
 				zf = ZipManager.Zip(fileName)
 
-				### create or update fileName
-				if os.path.exists(fileName):
-
-					zf.Update(replace_files = [fn, python_path, image_path])
-				else:
-					zf.Create(add_files = [fn, python_path, image_path])
-
-				os.remove(fn)
+				### create or update fileName (only the changed files are written)
+				zf.Update(replace_files = [python_path, image_path], data = {fn: data})
 
 				## abs path of the directory that contains the file to export (str() to avoid unicode)
 				newExportPath = str(os.path.dirname(fileName))
@@ -201,9 +226,10 @@ class DumpZipFile(DumpBase):
 		# get zip file object
 		zf = zipfile.ZipFile(fileName, 'r')
 
+		### the data file is read in memory from the archive (no temporary file)
 		try:
 			data_file = 'DEVSimPyModel.dat'
-			path = zf.extract(data_file, gettempdir())
+			data = zf.read(data_file)
 		except KeyError, info:
 			sys.stderr.write(_("ERROR: Did not %s find in zip file %s --\n%s \n")%(data_file, str(fileName), info))
 			return info
@@ -221,13 +247,23 @@ class DumpZipFile(DumpBase):
 
 		# try to load file
 		try:
-			f = open(path,'rb')
-			L = cPickle.load(f)
-			f.close()
+			L = loadsDump(data)
 		except Exception, info:
 			sys.stderr.write(_("Problem loading: %s -- %s \n")%(str(fileName), info))
 			return info
 
+		### native format: attributes are restored by name
+		if isinstance(L, dict):
+			for attr in filter(L.has_key, obj_loaded.dump_attributes):
+				### update behavioral attribute for model saved with bad args (amd or cmd have been changed in librairie but not in dsp)
+				if attr == 'args':
+					for key in filter(L[attr].has_key, obj_loaded.args.keys()):
+						obj_loaded.args[key] = L[attr][key]
+				else:
+					setattr(obj_loaded, attr, L[attr])
+
+			return self.CheckPaths(obj_loaded, fileName)
+
 		### Check comparison between serialized attribut (L) and normal attribut (dump_attributes)
 		### for model build with a version of devsimpy <= 2.5
 		### font checking
@@ -264,6 +300,12 @@ class DumpZipFile(DumpBase):
 			sys.stderr.write(_("Problem loading (old model): %s -- %s \n")%(str(fileName), info))
 			return info
 
+		return self.CheckPaths(obj_loaded, fileName)
+
+	def CheckPaths(self, obj_loaded, fileName):
+		""" Update the paths of the loaded codeblock if the model was moved
+		"""
+
 		### if the model was made from another pc
 		if not os.path.exists(obj_loaded.model_path):
 			obj_loaded.model_path = fileName
@@ -337,9 +379,12 @@ class DumpGZipFile(DumpBase):
 		assert(fileName.endswith(tuple(DumpGZipFile.ext)))
 
 		try:
-			cPickle.dump(   obj = PickledCollection(obj_dumped),
-							file = gzip.GzipFile(filename = fileName, mode = 'wb', compresslevel = 9),
-							protocol = 0)
+			data = dumpsNative(obj_dumped)
+			f = gzip.GzipFile(filename = fileName, mode = 'wb', compresslevel = COMPRESS_LEVEL)
+			try:
+				f.write(data)
+			finally:
+				f.close()
 
 		except Exception, info:
 			sys.stderr.write(_("\nProblem saving: %s -- %s\n")%(str(fileName),info))
@@ -362,9 +407,9 @@ class DumpGZipFile(DumpBase):
 			return info
 
 		else:
-			### try to load serialized file
+			### try to load serialized file (decompressed in one read, cPickle.load calls the read method of GzipFile for each opcode)
 			try:
-				dsp = cPickle.load(f)
+				dsp = loadsDump(f.read())
 			except Exception, info:
 				sys.stderr.write(_("Problem loading: %s -- %s\n")%(str(fileName), info))
 				return info
@@ -372,8 +417,13 @@ class DumpGZipFile(DumpBase):
 				f.close()
 
 			### assisgn the specific attributs
-			for i,attr in enumerate(obj_loaded.dump_attributes):
-				setattr(obj_loaded, attr, dsp[i])
+			if isinstance(dsp, dict):
+				for attr in filter(dsp.has_key, obj_loaded.dump_attributes):
+					setattr(obj_loaded, attr, dsp[attr])
+			else:
+				### attributes added after the file was saved keep their default value
+				for attr, value in zip(obj_loaded.dump_attributes, dsp):
+					setattr(obj_loaded, attr, value)
 
 			obj_loaded.last_name_saved = fileName
 
@@ -420,9 +470,9 @@ class DumpYAMLFile(DumpBase):
 
 		else:
 
-			### assisgn the specific attributs
-			for i,attr in enumerate(obj_loaded.dump_attributes):
-				setattr(obj_loaded, attr, dsp[i])
+			### assisgn the specific attributs (attributes added after the file was saved keep their default value)
+			for attr, value in zip(obj_loaded.dump_attributes, dsp):
+				setattr(obj_loaded, attr, value)
 
 			obj_loaded.last_name_saved = fileName
 
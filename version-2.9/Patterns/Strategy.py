@@ -28,9 +28,12 @@ import weakref
 import heapq
 import threading
 import inspect
+import array
+import multiprocessing
 
-from pluginmanager import trigger_event
+from pluginmanager import trigger_event, bind_event
 from Utilities import getOutDir
+from SimulationSettings import getSettings, setSetting, applySettings, calibrate, CALIBRATION_BUDGET
 
 import __builtin__
 import re
@@ -78,17 +81,40 @@ def getFlatPriorityList(model, flat_priority_list = []):
 
 	return flat_priority_list
 
+def HasCustomSelect(model):
+	""" Return true if model or one of its coupled sub-models overrides the select function of CoupledDEVS
+	"""
+
+	for m in model.componentSet:
+		if isinstance(m, PyDEVS.CoupledDEVS) and HasCustomSelect(m):
+			return True
+
+	return 'select' in model.__dict__ or model.__class__.select.im_func is not PyDEVS.CoupledDEVS.select.im_func
+
 def HasActiveChild(L):
 	""" Return true if a children of master is active
 	"""
 	return L != [] and True in map(lambda a: a.timeNext != INFINITY, L)
 
+### listeners of the simulation events (None if no plug-in is enabled for the event), see bindEvents
+SIM_VERBOSE = SIM_BLINK = SIM_TEST = None
+
+def bindEvents():
+	""" Resolve the plug-ins of the simulation events (once, at the start of a simulation) for the strategies and the PyDEVS solvers.
+	"""
+	global SIM_VERBOSE, SIM_BLINK, SIM_TEST
+	SIM_VERBOSE, SIM_BLINK, SIM_TEST = map(bind_event, ("SIM_VERBOSE", "SIM_BLINK", "SIM_TEST"))
+
+	from DEVSKernel.PyDEVS import simulator
+	simulator.bindEvents()
+
 class SimStrategy:
 	""" Strategy abstract class or interface
 	"""
 
 	def __init__(self, simulator=None):
 		self._simulator = simulator
+		bindEvents()
 
 	def simulate(self, T = sys.maxint):
 		""" Simulate abstract method
@@ -135,7 +161,7 @@ class SimStrategy2(SimStrategy):
 		"""
 
 		master = self._simulator.getMaster()
-		send = self._simulator.send
+		send = self.GetSendFunction()
 		#clock = master.myTimeAdvance
 
 		# Initialize the model --- set the simulation clock to 0.
@@ -150,7 +176,8 @@ class SimStrategy2(SimStrategy):
 		old_cpu_time = 0
 
 		### stoping condition depend on the ntl (no time limit for the simulation)
-		condition = lambda clock: HasActiveChild(getFlatImmChildrenList(master, [])) if self._simulator.ntl else clock <= T
+		### the time of next event of master is the min over all atomic models, so it is finite iff one of them is active.
+		condition = lambda clock: clock != INFINITY if self._simulator.ntl else clock <= T
 
 		# Main loop repeatedly sends $(*,\,t)$ messages to the model's root DEVS.
 		while condition(clock) and self._simulator.end_flag == False:
@@ -168,7 +195,7 @@ class SimStrategy2(SimStrategy):
 
 			else:
 				# The SIM_VERBOSE event occurs
-				trigger_event("SIM_VERBOSE", clock = clock)
+				if SIM_VERBOSE: SIM_VERBOSE(clock = clock)
 
 				send(master, (1, {}, clock))
 
@@ -178,6 +205,25 @@ class SimStrategy2(SimStrategy):
 
 		self._simulator.terminate()
 
+	def GetSendFunction(self):
+		return self._simulator.send
+
+class SimStrategy7(SimStrategy2):
+	""" Strategy for DEVSimPy hierarchical simulation based on event lists.
+
+		Same algorithm than SimStrategy2, but each coupled model keeps an event list (heap with lazy invalidation)
+		updated only for the children which have received a message, instead of scanning its componentSet at each step.
+	"""
+
+	def __init__(self, simulator=None):
+		SimStrategy2.__init__(self, simulator)
+
+		from DEVSKernel.PyDEVS.simulator import EventQueueCoupledSolver
+		self._solver = EventQueueCoupledSolver()
+
+	def GetSendFunction(self):
+		return self._solver.send
+
 ###--------------------------------------------------------------------Strategy
 
 ### decorator for poke
@@ -238,7 +284,9 @@ def poke(p, v):
 
 ###
 def peek(p):
-	return copy.deepcopy(p.weak.GetValue())
+	### copy policy of the messages (see PyDEVS.setMessageCopy)
+	value = p.weak.GetValue()
+	return PyDEVS.copyMessage(value, p) if value else value
 
 def peek_all(self):
 	"""Retrives messages from all input port {\tt p}.
@@ -327,7 +375,7 @@ def FlatConnection(p1, p2):
 				for pp in p2.outLine:
 					FlatConnection(p, pp)
 
-def setAtomicModels(atomic_model_list, ts):
+def setAtomicModels(atomic_model_list, ts, scheduler):
 	""" Set atomic DEVS model flat list and initialize it.
 	"""
 
@@ -340,6 +388,8 @@ def setAtomicModels(atomic_model_list, ts):
 		m.peek_all = funcType(peek_all, m, PyDEVS.AtomicDEVS)
 		setattr(m, 'priority', i)
 		setattr(m, 'ts', ts())
+		setattr(m, 'scheduler', scheduler)
+		scheduler.Schedule(m)
 
 	for m in atomic_model_list:
 		for p1 in m.OPorts:
@@ -377,10 +427,12 @@ def execExtTransition(m):
 	if m.myTimeAdvance != INFINITY: m.myTimeAdvance += ts
 	m.elapsed = 0.0
 
+	m.scheduler.Schedule(m)
+
 	# The SIM_VERBOSE event occurs
-	trigger_event("SIM_VERBOSE", model=m, msg=1)
-	trigger_event("SIM_BLINK", model=m, msg=[{}])
-	trigger_event("SIM_TEST", model=m, msg=[{}])
+	if SIM_VERBOSE: SIM_VERBOSE(model=m, msg=1)
+	if SIM_BLINK: SIM_BLINK(model=m, msg=[{}])
+	if SIM_TEST: SIM_TEST(model=m, msg=[{}])
 
 	return m
 
@@ -403,10 +455,12 @@ def execIntTransition(m):
 	if m.myTimeAdvance != INFINITY: m.myTimeAdvance += ts
 	m.elapsed = 0.0
 
+	m.scheduler.Schedule(m)
+
 	# The SIM_VERBOSE event occurs
-	trigger_event("SIM_VERBOSE", model=m, msg=0)
-	trigger_event("SIM_BLINK", model=m, msg=[1])
-	trigger_event("SIM_TEST", model=m, msg=[1])
+	if SIM_VERBOSE: SIM_VERBOSE(model=m, msg=0)
+	if SIM_BLINK: SIM_BLINK(model=m, msg=[1])
+	if SIM_TEST: SIM_TEST(model=m, msg=[1])
 
 class Clock(object):
 	def __init__(self, time):
@@ -416,6 +470,77 @@ class Clock(object):
 	def Set(self, val):
 		self._val = val
 
+class PriorityScheduler(object):
+	""" Scheduler of atomic models keyed by (time of next event, priority).
+
+		Models are (re)inserted with Schedule after each transition. Old entries of a
+		rescheduled model are not removed from the heap but invalidated by a stamp
+		and dropped when they reach the top (the heap is rebuilt with the valid entries when
+		it holds more than COMPACT_FACTOR entries per model, as in HeapEventList).
+		The number of active models (with a finite time of next event) is also maintained.
+	"""
+
+	### the heap is rebuilt when it holds more than COMPACT_FACTOR*N entries
+	COMPACT_FACTOR = 4
+
+	def __init__(self):
+		self._heap = []
+		self._stamp = {}
+		self._entry = {}
+		self._active = set()
+
+	def Schedule(self, m):
+		""" Insert model m according to its time of next event (myTimeAdvance) and its priority.
+		"""
+		stamp = self._stamp.get(m.priority, 0)+1
+		self._stamp[m.priority] = stamp
+		if m.myTimeAdvance != INFINITY:
+			entry = (m.myTimeAdvance, m.priority, stamp, m)
+			self._entry[m.priority] = entry
+			heapq.heappush(self._heap, entry)
+			self._active.add(m.priority)
+			if len(self._heap) > self.COMPACT_FACTOR*len(self._stamp)+16:
+				self._Compact()
+		else:
+			self._entry.pop(m.priority, None)
+			self._active.discard(m.priority)
+
+	def _Compact(self):
+		""" Rebuild the heap with only the valid entries.
+		"""
+		self._heap = self._entry.values()
+		heapq.heapify(self._heap)
+
+	def GetActiveCount(self):
+		""" Return the number of models with a finite time of next event.
+		"""
+		return len(self._active)
+
+	def _Clean(self):
+		heap = self._heap
+		stamp = self._stamp
+		while heap and heap[0][2] != stamp[heap[0][1]]:
+			heapq.heappop(heap)
+
+	def GetMinTime(self):
+		""" Return the smallest time of next event (INFINITY if all models are passive).
+		"""
+		self._Clean()
+		return self._heap[0][0] if self._heap else INFINITY
+
+	def PopImminents(self, t):
+		""" Remove and return the models scheduled at time t, ordered by priority.
+		"""
+		heap = self._heap
+		stamp = self._stamp
+		L = []
+		while heap and heap[0][0] == t:
+			ta, priority, s, m = heapq.heappop(heap)
+			if s == stamp[priority]:
+				del self._entry[priority]
+				L.append(m)
+		return L
+
 ###
 class SimStrategy3(SimStrategy):
 	""" Strategy 3 for DEVSimPy thread-based direct-coupled simulation
@@ -435,12 +560,15 @@ class SimStrategy3(SimStrategy):
 		### simulation time
 		self.ts = Clock(0.0)
 
+		### scheduler of atomic models keyed by (time of next event, priority)
+		self.scheduler = PriorityScheduler()
+
 		### master model and flat list of atomic model
 		self.master = self._simulator.getMaster()
 		self.flat_priority_list = getFlatPriorityList(self.master, [])
 
 		### init all atomic model from flat list
-		setAtomicModels(self.flat_priority_list, weakref.ref(self.ts))
+		setAtomicModels(self.flat_priority_list, weakref.ref(self.ts), self.scheduler)
 
 		### udpate the componentSet list of master (that no longer contains coupled model)
 		self.master.componentSet = self.flat_priority_list
@@ -455,13 +583,12 @@ class SimStrategy3(SimStrategy):
 		### if suspend, we could store the future ref
 		old_cpu_time = 0
 
-		### stopping condition depend on the ntl (no time limit for the simulation)
-		condition = lambda clk: HasActiveChild(getFlatPriorityList(self.master, [])) if self._simulator.ntl else clk <= T
+		### simulation time
+		scheduler = self.scheduler
 
-		### simulation time and list of flat models ordered by devs priority
-		L = [m.myTimeAdvance for m in self.flat_priority_list if m.myTimeAdvance < INFINITY] or [INFINITY]
-		self.ts.Set(min(L))
-		formated_priority_list = [(1+i/10000.0, m, execIntTransition) for i,m in enumerate(self.flat_priority_list)]
+		### stopping condition depend on the ntl (no time limit for the simulation)
+		condition = lambda clk: scheduler.GetActiveCount() > 0 if self._simulator.ntl else clk <= T
+		self.ts.Set(scheduler.GetMinTime())
 
 		while condition(self.ts.Get()) and self._simulator.end_flag == False:
 
@@ -479,20 +606,15 @@ class SimStrategy3(SimStrategy):
 			else:
 
 				### The SIM_VERBOSE event occurs
-				trigger_event("SIM_VERBOSE", self.master, None, clock = self.ts.Get())
-
-				### tree-like data structure ordered by devsimpy priority
-				priority_scheduler = filter(lambda a: self.ts.Get() == a[1].myTimeAdvance, formated_priority_list)
-				heapq.heapify(priority_scheduler)
+				if SIM_VERBOSE: SIM_VERBOSE(self.master, None, clock = self.ts.Get())
 
+				### imminent models ordered by devsimpy priority (they are rescheduled by their transition)
 				### TODO: execute with process of model are parallel !
-				while(priority_scheduler):
-					### get most priority model and apply its internal transition
-					priority, model, transition_fct = heapq.heappop(priority_scheduler)
-					apply(transition_fct, (model,))
+				for model in scheduler.PopImminents(self.ts.Get()):
+					execIntTransition(model)
 
 				### update simulation time
-				self.ts.Set(min([m.myTimeAdvance for m in self.flat_priority_list]))
+				self.ts.Set(scheduler.GetMinTime())
 
 				### just for progress bar
 				self.master.timeLast = self.ts.Get() if self.ts.Get() != INFINITY else self.master.timeLast
@@ -500,6 +622,355 @@ class SimStrategy3(SimStrategy):
 
 		self._simulator.terminate()
 
+###
+class CompiledModel:
+	""" Static simulation plan of a master model.
+
+		The hierarchy is compiled once into a flat list of atomic models (ordered by devsimpy priority) with
+		integer ids and, for each output port, the closure of the couplings (IC, EIC and EOC) as the
+		array of destination model ids and the tuple of the corresponding input ports.
+	"""
+
+	def __init__(self, master):
+		""" Constructor.
+		"""
+
+		self.master = master
+		self.models = getFlatPriorityList(master, [])
+		self.ids = dict((m, i) for i, m in enumerate(self.models))
+
+		### routes[i] is the dict {output port of model i: (array of destination ids, tuple of destination ports)}
+		self.routes = []
+		for m in self.models:
+			D = {}
+			for p in m.OPorts:
+				dests = self.GetAtomicInPorts(p, [])
+				if dests:
+					dests.sort(key=lambda pp: self.ids[pp.host])
+					D[p] = (array.array('i', [self.ids[pp.host] for pp in dests]), tuple(dests))
+			self.routes.append(D)
+
+	def GetAtomicInPorts(self, port, dests):
+		""" Return the input ports of atomic models reached from port through the coupled models.
+		"""
+		for pp in port.outLine:
+			if isinstance(pp.host, PyDEVS.AtomicDEVS):
+				if pp not in dests:
+					dests.append(pp)
+			else:
+				self.GetAtomicInPorts(pp, dests)
+		return dests
+
+class SimStrategy8(SimStrategy):
+	""" Strategy for DEVSimPy classic simulation on a compiled model.
+
+		The model is flattened once (see CompiledModel) and the simulation loop executes directly against
+		the routing table: the imminent model with the highest priority does its output and internal
+		transition, and its outputs are delivered to the destination models which do their external transition.
+		No solver is involved and no message dictionary is built during the routing.
+		The ties between imminent models are resolved by the priority order only: if a coupled model
+		overrides select (see HasCustomSelect), the simulation is done by the bag-based strategy (SimStrategy2).
+	"""
+
+	def __init__(self, simulator=None):
+		SimStrategy.__init__(self, simulator)
+
+		from DEVSKernel.PyDEVS.simulator import HeapEventList
+
+		self.master = self._simulator.getMaster()
+		self.plan = CompiledModel(self.master)
+		self.eventList = HeapEventList(self.plan.models)
+
+		### strategy used when the select function of a coupled model can't be compiled
+		self.fallback = SimStrategy2(simulator) if HasCustomSelect(self.master) else None
+
+	def Init(self):
+		""" Set the origin of time of all atomic models.
+		"""
+		eventList = self.eventList
+		for m in self.plan.models:
+			m.timeLast = -m.elapsed
+			m.myTimeAdvance = m.timeAdvance()
+			m.timeNext = m.timeLast + m.myTimeAdvance
+			m.myInput = {}
+			eventList.update(m)
+
+		self.master.timeLast = 0.0
+		self.master.myTimeAdvance = eventList.getMinTime()
+
+	def simulate(self, T = sys.maxint):
+		"""
+		"""
+
+		if self.fallback is not None:
+			return self.fallback.simulate(T)
+
+		self.Init()
+
+		eventList = self.eventList
+		models = self.plan.models
+		routes = self.plan.routes
+		ids = self.plan.ids
+
+		### receivers of the outputs of the current step (reused list)
+		influencees = []
+
+		clock = self.master.myTimeAdvance
+
+		### ref to cpu time evaluation
+		t_start = time.time()
+
+		### if suspend, we could store the future ref
+		old_cpu_time = 0
+
+		### stoping condition depend on the ntl (no time limit for the simulation)
+		condition = lambda clock: clock != INFINITY if self._simulator.ntl else clock <= T
+
+		while condition(clock) and self._simulator.end_flag == False:
+
+			##Optional sleep
+			if self._simulator.thread_sleep:
+				time.sleep(self._simulator._sleeptime)
+
+			elif self._simulator.thread_suspend:
+				### Optional suspend
+				while self._simulator.thread_suspend:
+					time.sleep(1.0)
+					old_cpu_time = self._simulator.cpu_time
+					t_start = time.time()
+
+			else:
+				# The SIM_VERBOSE event occurs
+				if SIM_VERBOSE: SIM_VERBOSE(clock = clock)
+
+				### output and internal transition of the imminent model
+				d = eventList.getFirst()
+				d.myOutput.clear()
+				d.outputFnc()
+
+				d.elapsed = clock - d.timeLast
+				d.intTransition()
+
+				d.timeLast = clock
+				d.myTimeAdvance = d.timeAdvance()
+				d.timeNext = d.timeLast + d.myTimeAdvance
+				if d.myTimeAdvance != INFINITY: d.myTimeAdvance += clock
+				d.elapsed = 0
+				eventList.update(d)
+
+				if SIM_VERBOSE: SIM_VERBOSE(model=d, msg=0)
+				if SIM_BLINK: SIM_BLINK(model=d, msg=(1, {}, clock))
+				if SIM_TEST: SIM_TEST(model=d, msg=(1, {}, clock))
+
+				### routing of the outputs using the routing table
+				route = routes[ids[d]]
+				for p, v in d.myOutput.iteritems():
+					if p in route:
+						dest_ids, dest_ports = route[p]
+						for i in xrange(len(dest_ids)):
+							m = models[dest_ids[i]]
+							if not m.myInput:
+								influencees.append(m)
+							m.myInput[dest_ports[i]] = v
+
+				### external transitions of the influenced models
+				for m in influencees:
+					m.elapsed = clock - m.timeLast
+					m.extTransition()
+
+					m.timeLast = clock
+					m.myTimeAdvance = m.timeAdvance()
+					m.timeNext = m.timeLast + m.myTimeAdvance
+					if m.myTimeAdvance != INFINITY: m.myTimeAdvance += clock
+					m.elapsed = 0
+					eventList.update(m)
+
+					if SIM_VERBOSE: SIM_VERBOSE(model=m, msg=1)
+					if SIM_BLINK: SIM_BLINK(model=m, msg=(m.myInput, [], clock))
+					if SIM_TEST: SIM_TEST(model=m, msg=(m.myInput, [], clock))
+
+					m.myInput.clear()
+
+				del influencees[:]
+
+				clock = eventList.getMinTime()
+
+				### just for progress bar
+				self.master.timeLast = clock if clock != INFINITY else self.master.timeLast
+				self.master.myTimeAdvance = clock
+
+				self._simulator.cpu_time = old_cpu_time + (time.time()-t_start)
+
+		self._simulator.terminate()
+
+###
+class SimStrategy9(SimStrategy8):
+	""" Strategy for DEVSimPy multi-process simulation on a compiled model.
+
+		The flat atomic models are partitioned across a persistent pool of worker processes (see
+		DEVSKernel.PyDEVS.parallel). The results are those of the classic DEVS simulation of SimStrategy8:
+		at each step, the imminent models are taken in the priority order as long as their transitions
+		commute with the ones of the previous models (see GetBatch), their outputs and internal transitions
+		are executed concurrently by their workers, the outputs are routed in the main process, and then
+		the external transitions of the influenced models are executed concurrently too.
+		Messages must be picklable. The plug-ins receive the events of the transitions from the main
+		process, in which the models keep their initial state until the end of the simulation.
+	"""
+
+	### number of worker processes (None for the number of cpu)
+	NB_PROCESS = None
+
+	def __init__(self, simulator=None):
+		SimStrategy8.__init__(self, simulator)
+
+		### index of each input port in the IPorts list of its model
+		self.in_index = dict((p, i) for m in self.plan.models for i, p in enumerate(m.IPorts))
+
+		### ids of the models influenced by each model
+		self.dests = [frozenset(j for dest_ids, dest_ports in route.values() for j in dest_ids) for route in self.plan.routes]
+
+	def GetBatch(self, imminents):
+		""" Return the ids of the first imminent models (ordered by priority) whose transitions can be executed together.
+
+			A model is added to the batch if it is not influenced by the previous ones, if it doesn't influence
+			the same models, and if the models they influence have a lower priority (so that none of them could
+			be activated before it by a null time advance). The classic simulation would then give the same result.
+		"""
+		ids = self.plan.ids
+		dests = self.dests
+
+		batch = []
+		reached = set()
+		first = INFINITY
+		for d in imminents:
+			i = ids[d]
+			D = dests[i]
+			if batch and (i >= first or not reached.isdisjoint(D) or not D.isdisjoint(batch)):
+				break
+			batch.append(i)
+			reached.update(D)
+			if D:
+				first = min(first, min(D))
+
+		return batch
+
+	def Update(self, times, clock):
+		""" Reschedule the models from the (id, myTimeAdvance) list returned by the workers.
+		"""
+		models = self.plan.models
+		for i, ta in times:
+			m = models[i]
+			m.timeLast = clock
+			m.timeNext = m.myTimeAdvance = ta
+			self.eventList.update(m)
+
+	def simulate(self, T = sys.maxint):
+		"""
+		"""
+
+		from DEVSKernel.PyDEVS.parallel import ProcessPool
+
+		if self.fallback is not None:
+			return self.fallback.simulate(T)
+
+		self.Init()
+
+		eventList = self.eventList
+		models = self.plan.models
+		routes = self.plan.routes
+		in_index = self.in_index
+
+		### the workers are forked after the initialization of the models
+		pool = ProcessPool(models, self.NB_PROCESS)
+		owner = pool.owner
+
+		clock = self.master.myTimeAdvance
+
+		### ref to cpu time evaluation
+		t_start = time.time()
+
+		### if suspend, we could store the future ref
+		old_cpu_time = 0
+
+		### stoping condition depend on the ntl (no time limit for the simulation)
+		condition = lambda clock: clock != INFINITY if self._simulator.ntl else clock <= T
+
+		try:
+			while condition(clock) and self._simulator.end_flag == False:
+
+				##Optional sleep
+				if self._simulator.thread_sleep:
+					time.sleep(self._simulator._sleeptime)
+
+				elif self._simulator.thread_suspend:
+					### Optional suspend
+					while self._simulator.thread_suspend:
+						time.sleep(1.0)
+						old_cpu_time = self._simulator.cpu_time
+						t_start = time.time()
+
+				else:
+					# The SIM_VERBOSE event occurs
+					if SIM_VERBOSE: SIM_VERBOSE(clock = clock)
+
+					### outputs and internal transitions of the batch of imminent models
+					batch = self.GetBatch(eventList.getImminents())
+					cmds = {}
+					for i in batch:
+						cmds.setdefault(owner[i], ('int', clock, []))[2].append(i)
+
+					### routing of the batch of outputs
+					inputs = {}
+					for times, outputs in pool.map(cmds).values():
+						self.Update(times, clock)
+						for i, p, v in outputs:
+							route = routes[i]
+							port = models[i].OPorts[p]
+							if port in route:
+								dest_ids, dest_ports = route[port]
+								for j in xrange(len(dest_ids)):
+									inputs.setdefault(dest_ids[j], []).append((in_index[dest_ports[j]], v))
+
+					for i in batch:
+						if SIM_VERBOSE: SIM_VERBOSE(model=models[i], msg=0)
+						if SIM_BLINK: SIM_BLINK(model=models[i], msg=(1, {}, clock))
+						if SIM_TEST: SIM_TEST(model=models[i], msg=(1, {}, clock))
+
+					### external transitions of the influenced models
+					if inputs:
+						cmds = {}
+						for j, L in inputs.iteritems():
+							cmds.setdefault(owner[j], ('ext', clock, []))[2].append((j, L))
+
+						for times in pool.map(cmds).values():
+							self.Update(times, clock)
+
+						if SIM_VERBOSE or SIM_BLINK or SIM_TEST:
+							for j, L in inputs.iteritems():
+								m = models[j]
+								msg = (dict((m.IPorts[k], v) for k, v in L), [], clock)
+								if SIM_VERBOSE: SIM_VERBOSE(model=m, msg=1)
+								if SIM_BLINK: SIM_BLINK(model=m, msg=msg)
+								if SIM_TEST: SIM_TEST(model=m, msg=msg)
+
+					clock = eventList.getMinTime()
+
+					### just for progress bar
+					self.master.timeLast = clock if clock != INFINITY else self.master.timeLast
+					self.master.myTimeAdvance = clock
+
+					self._simulator.cpu_time = old_cpu_time + (time.time()-t_start)
+
+			### get back the state of the models from the workers (for the finish methods and the collectors)
+			if pool.processes:
+				for states in pool.map(dict((k, ('state',)) for k in range(pool.GetSize()))).values():
+					for i, D in states.items():
+						models[i].__dict__.update(D)
+		finally:
+			pool.close()
+
+		self._simulator.terminate()
+
 # A. Simulate forever.
 #    The termination_condition function never returns True.
 #
@@ -546,26 +1017,7 @@ class SimStrategy4(SimStrategy):
         ### new version of PyPDEVS (due to the number of config param which is growing)
         else:
 
-            ### see simconfig.py to have informations about setters
-
-            ### verbose manager, if None print are displayed in stdout, else in the out/verbose.txt file
-            if self._simulator.verbose:
-                 S.setVerbose(None)
-            else:
-                out_dir = os.path.join(HOME_PATH, 'out')
-                if not os.path.exists(out_dir):
-                    os.mkdir(out_dir)
-
-                verbose_file = os.path.join(getOutDir(), 'verbose.txt')
-                S.setVerbose(verbose_file)
-
-            ### TODO
-            if self._simulator.ntl:
-                S.setTerminationCondition(terminate_never)
-            else:
-                S.setTerminationTime(T)
-
-            S.setClassicDEVS(self.SetClassicDEVSOption())
+            self.Configure(S, T)
 
             ### dynamic structure for local PyPDEVS simulation
             S.setDSDEVS(self._simulator.dynamic_structure_flag)
@@ -575,9 +1027,113 @@ class SimStrategy4(SimStrategy):
 
     	self._simulator.terminate()
 
+    def Configure(self, S, T):
+        """ Configure the PyPDEVS simulator S for a simulation until T.
+        """
+
+        ### see simconfig.py to have informations about setters
+
+        ### verbose manager, if None print are displayed in stdout, else in the out/verbose.txt file
+        if self._simulator.verbose:
+             S.setVerbose(None)
+        else:
+            out_dir = os.path.join(HOME_PATH, 'out')
+            if not os.path.exists(out_dir):
+                os.mkdir(out_dir)
+
+            verbose_file = os.path.join(getOutDir(), 'verbose.txt')
+            S.setVerbose(verbose_file)
+
+        ### TODO
+        if self._simulator.ntl:
+            S.setTerminationCondition(terminate_never)
+        else:
+            S.setTerminationTime(T)
+
+        S.setClassicDEVS(self.SetClassicDEVSOption())
+
+        ### scheduler, memoization, message copy and state saving (settings of the diagram)
+        settings = getattr(self._simulator, 'settings', None) or getSettings()
+        applySettings(S, settings)
+
     def SetClassicDEVSOption(self):
         return True
 
+class SimStrategy5(SimStrategy4):
+    """ Distributed strategy for PyPDEVS simulation (Time Warp) without MPI.
+
+        The simulation kernels run as local processes communicating over pipes (see localMPI.py of PyPDEVS)
+        and the top-level submodels of the diagram are allocated round-robin across them (the heuristic of
+        autoAllocator.py), or by the greedy allocator of PyPDEVS from the activity of the first time units.
+        The models and the messages must be picklable and the models are rolled back by restoring their
+        state attribute only. At the end, the attributes of the models are copied back in the main process.
+        Processes are forked, so this is only available on posix platforms.
+    """
+
+    ### number of simulation kernels (None for the number of cpu)
+    NB_PROCESS = None
+
+    ### 'auto' (round-robin of the top-level submodels) or 'greedy'
+    ALLOCATOR = 'auto'
+
+    def __init__(self, simulator = None):
+        SimStrategy4.__init__(self, simulator)
+
+    def simulate(self, T = sys.maxint):
+        """ Simulate the model on local processes.
+        """
+
+        ### PyPDEVS package of the selected DEVS package
+        path = __builtin__.__dict__['DEVS_DIR_PATH_DICT'][__builtin__.__dict__['DEFAULT_DEVS_DIRNAME']]
+        d = re.split("DEVSKernel", path)[-1].replace(os.sep, '.')
+        Simulator = __import__("DEVSKernel%s.simulator"%d, fromlist=['Simulator']).Simulator
+        LocalWorld = __import__("DEVSKernel%s.localMPI"%d, fromlist=['LocalWorld']).LocalWorld
+
+        master = self._simulator.model
+        submodels = master.componentSet if hasattr(master, 'componentSet') else [master]
+
+        ### there is no use for more kernels than top-level submodels
+        nb_process = min(self.NB_PROCESS or multiprocessing.cpu_count(), len(submodels))
+
+        if self.ALLOCATOR == 'greedy':
+            for m in submodels:
+                m.setLocation(None, force = True)
+        else:
+            for i, m in enumerate(submodels):
+                m.setLocation(i % nb_process, force = True)
+
+        ### the kernels are forked before the construction of the simulator
+        world = LocalWorld(nb_process) if nb_process > 1 else None
+        if world:
+            world.start()
+
+        try:
+            S = Simulator(master)
+
+            self.Configure(S, T)
+
+            if self.ALLOCATOR == 'greedy':
+                S.setGreedyAllocator()
+
+            S.simulate()
+
+            ### get back the attributes of the models from the kernels (for the finish methods and the collectors)
+            if world:
+                world.fetchModels(S)
+        finally:
+            if world:
+                world.stop()
+
+            ### the model is simulated locally by the other strategies
+            for m in submodels:
+                m.setLocation(None, force = True)
+
+        self._simulator.terminate()
+
+    def SetClassicDEVSOption(self):
+        ### classic DEVS simulations can't be distributed
+        return False
+
 class SimStrategy6(SimStrategy4):
     """ Parallel strategy for PyPDEVS simulation
         setClassicDEVS is False and confTransition in enabled
@@ -588,3 +1144,37 @@ class SimStrategy6(SimStrategy4):
 
     def SetClassicDEVSOption(self):
         return False
+
+def CalibrateScheduler(diagram, T = INFINITY, budget = CALIBRATION_BUDGET, strategy = None):
+    """ Calibration mode of the PyPDEVS simulation of the diagram.
+
+        A warm-up segment of the model (until the simulated time T or during budget seconds) is simulated
+        with each scheduler of the calibration (see SimulationSettings.calibrate) and the fastest one is
+        recorded in the simulation settings of the diagram. Return the list of (steps per second, scheduler).
+    """
+
+    from Container import Diagram
+
+    ### PyPDEVS simulator of the selected DEVS package
+    path = __builtin__.__dict__['DEVS_DIR_PATH_DICT'][__builtin__.__dict__['DEFAULT_DEVS_DIRNAME']]
+    d = re.split("DEVSKernel", path)[-1].replace(os.sep, '.')
+    Simulator = __import__("DEVSKernel%s.simulator"%d, fromlist=['Simulator']).Simulator
+
+    ### classic or parallel DEVS depending on the strategy
+    cls = eval(PYPDEVS_SIM_STRATEGY_DICT[strategy or DEFAULT_SIM_STRATEGY])
+    classic = cls().SetClassicDEVSOption()
+
+    def makeSimulator():
+        master = Diagram.makeDEVSInstance(diagram)
+        if not master or isinstance(master, tuple):
+            raise Exception("DEVS instance not created: %s"%str(master))
+        S = Simulator(master)
+        S.setClassicDEVS(classic)
+        return S
+
+    results = calibrate(makeSimulator, getSettings(diagram), T, budget)
+
+    if results:
+        setSetting(diagram, 'scheduler', results[0][1])
+
+    return results
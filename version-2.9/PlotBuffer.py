@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# PlotBuffer.py --- Incremental and decimated data of the live plots
+#                     --------------------------------
+# Version                                        last modified: 18/10/2026
+###############################################################################
+# NOTES:
+#
+# A PlotSeries copies the new (t, y) points of a signal at each refresh of the
+# plot into append-only chunked arrays of floats (no reallocation of the whole
+# data) and maintains a min/max decimation pyramid: a bucket of the level k
+# holds the min and the max (with their abscissas) of FACTOR**k consecutive
+# points. Only the buckets touched by the new points are computed again, so
+# the cost of a refresh only depends on the number of new points.
+#
+# GetPoints returns a screen resolution number of points for a visible range
+# (from the lowest level with less buckets than pixels), with the extrema of
+# each bucket, so the peaks of the signal are always drawn. The points must be
+# ordered by abscissa (simulation time or event number).
+#
+# The data of a signal can be a list of (t, y) pairs or a ResultBuffer, whose
+# columns are copied without building the pairs. When the buffer drops its
+# oldest samples, count keeps the number of samples seen since the beginning.
+# With a capacity (the capacity of the ResultBuffer), the series only keeps
+# the last points: when it holds more than capacity + capacity/2 points, the
+# oldest chunks are dropped and the pyramid is built again on the remaining
+# points (an amortized constant cost per point).
+###############################################################################
+
+import array
+import bisect
+
+### number of points of a chunk of the raw data
+CHUNK_SIZE = 4096
+
+### number of buckets (or points) of a level merged in a bucket of the next level
+FACTOR = 8
+
+class ChunkedArray:
+	""" Append-only array of floats stored in chunks of CHUNK_SIZE.
+	"""
+
+	def __init__(self):
+		self.chunks = []
+		self.length = 0
+
+	def __len__(self):
+		return self.length
+
+	def __getitem__(self, i):
+		""" Return the value at the index i or an array('d') for a slice (without step).
+		"""
+		if isinstance(i, slice):
+			start, stop, step = i.indices(self.length)
+			a = array.array('d')
+			while start < stop:
+				c, j = divmod(start, CHUNK_SIZE)
+				n = min(CHUNK_SIZE - j, stop - start)
+				a.extend(self.chunks[c][j:j+n])
+				start += n
+			return a
+		if i < 0:
+			i += self.length
+		if not 0 <= i < self.length:
+			raise IndexError(i)
+		return self.chunks[i // CHUNK_SIZE][i % CHUNK_SIZE]
+
+	def extend(self, values):
+		""" Append the values (sequence of floats).
+		"""
+		i = 0
+		n = len(values)
+		while i < n:
+			if not self.chunks or len(self.chunks[-1]) == CHUNK_SIZE:
+				self.chunks.append(array.array('d'))
+			chunk = self.chunks[-1]
+			k = min(CHUNK_SIZE - len(chunk), n - i)
+			chunk.extend(values[i:i+k])
+			i += k
+		self.length += n
+
+class Level:
+	""" Level of the decimation pyramid: min and max of the buckets with their abscissas.
+	"""
+
+	def __init__(self):
+		self.xlo = array.array('d')
+		self.ylo = array.array('d')
+		self.xhi = array.array('d')
+		self.yhi = array.array('d')
+
+	def __len__(self):
+		return len(self.ylo)
+
+	def Update(self, lower, start):
+		""" Compute again the buckets of the level from the bucket containing the item start of the lower level.
+		"""
+
+		b = start // FACTOR
+		n = len(lower)
+
+		### the last (partial) buckets are replaced
+		del self.xlo[b:], self.ylo[b:], self.xhi[b:], self.yhi[b:]
+
+		### one copy of the touched items of the lower level
+		i0 = b*FACTOR
+		xlo, ylo, xhi, yhi = lower.xlo[i0:n], lower.ylo[i0:n], lower.xhi[i0:n], lower.yhi[i0:n]
+
+		for i in xrange(0, n-i0, FACTOR):
+			a = ylo[i:i+FACTOR]
+			lo = min(a)
+			self.xlo.append(xlo[i+a.index(lo)])
+			self.ylo.append(lo)
+			a = yhi[i:i+FACTOR]
+			hi = max(a)
+			self.xhi.append(xhi[i+a.index(hi)])
+			self.yhi.append(hi)
+
+		return b
+
+class RawLevel:
+	""" Raw points seen as the level 0 of the pyramid (each point is a bucket).
+	"""
+
+	def __init__(self):
+		self.xlo = self.xhi = ChunkedArray()
+		self.ylo = self.yhi = ChunkedArray()
+
+	def __len__(self):
+		return len(self.ylo)
+
+class PlotSeries:
+	""" Signal of a live plot with its decimation pyramid.
+	"""
+
+	def __init__(self, capacity = 0):
+		""" Constructor.
+
+			@param capacity : Number of points kept by the series (0 for no limit)
+		"""
+		self.capacity = capacity
+		self.Reset()
+
+	def Reset(self):
+		self.source = None
+		self.count = 0
+		self.raw = RawLevel()
+		self.levels = []
+		self.xmin = self.xmax = self.ymin = self.ymax = None
+
+	def __len__(self):
+		return len(self.raw)
+
+	def Sync(self, data):
+		""" Append the points of data [(t, y)...] that are not in the series (data only grows between two calls).
+			The series is built again if data is another sequence or if it has been shortened.
+		"""
+
+		### index of the first available point of data (points dropped by a ResultBuffer)
+		start = getattr(data, 'start', 0)
+		count = start + len(data)
+
+		if data is not self.source or count < self.count:
+			self.Reset()
+			self.source = data
+
+		i = max(self.count - start, 0)
+		self.count = count
+
+		if hasattr(data, 'GetColumns'):
+			xs, ys = data.GetColumns(i)
+			if len(xs):
+				self.Extend(xs, ys)
+		else:
+			new = data[i:]
+			if len(new):
+				self.Extend([float(p[0]) for p in new], [float(p[1]) for p in new])
+
+		if self.capacity and len(self) > self.capacity + max(self.capacity//2, CHUNK_SIZE):
+			self.Trim()
+
+	def Trim(self):
+		""" Drop the oldest chunks of points beyond the capacity and build the pyramid again.
+		"""
+
+		k = (len(self) - self.capacity)//CHUNK_SIZE*CHUNK_SIZE
+		xs, ys = self.raw.xlo[k:], self.raw.ylo[k:]
+
+		source, count = self.source, self.count
+		self.Reset()
+		self.source, self.count = source, count
+
+		if len(xs):
+			self.Extend(xs, ys)
+
+	def Extend(self, xs, ys):
+		""" Append the points of the lists of abscissas xs and ordinates ys.
+		"""
+
+		start = len(self.raw)
+
+		self.raw.xlo.extend(xs)
+		self.raw.ylo.extend(ys)
+
+		### limits of the data
+		lo, hi = min(ys), max(ys)
+		if self.xmin is None:
+			self.xmin, self.ymin, self.ymax = xs[0], lo, hi
+		else:
+			self.ymin, self.ymax = min(self.ymin, lo), max(self.ymax, hi)
+		self.xmax = xs[-1]
+
+		### the buckets touched by the new points in each level
+		lower = self.raw
+		for level in self.levels:
+			start = level.Update(lower, start)
+			lower = level
+
+		### new levels until the top level has less than FACTOR buckets
+		while len(lower) > FACTOR:
+			level = Level()
+			level.Update(lower, 0)
+			self.levels.append(level)
+			lower = level
+
+	def GetLimits(self):
+		""" Return the limits (xmin, xmax, ymin, ymax) of the series.
+		"""
+		return self.xmin, self.xmax, self.ymin, self.ymax
+
+	def GetPoints(self, x0 = None, x1 = None, width = 1000):
+		""" Return the list of points [(t, y)...] to draw the range [x0, x1] on width pixels.
+			There are less than 2*width points, with the min and the max of each bucket.
+		"""
+
+		xs = self.raw.xlo
+
+		i0 = 0 if x0 is None else bisect.bisect_left(xs, x0)
+		i1 = len(xs) if x1 is None else bisect.bisect_right(xs, x1)
+
+		if i0 >= i1:
+			return []
+
+		### lowest level with less buckets than pixels in the range
+		k = 0
+		size = 1
+		while k < len(self.levels) and (i1 - i0) / size > width:
+			k += 1
+			size *= FACTOR
+
+		if k == 0:
+			return zip(xs[i0:i1], self.raw.ylo[i0:i1])
+
+		level = self.levels[k-1]
+		b0 = i0 // size
+		b1 = (i1 - 1) // size + 1
+
+		### first and last points of the range are kept for the continuity of the line
+		L = [(xs[i0], self.raw.ylo[i0])]
+		for xlo, ylo, xhi, yhi in zip(level.xlo[b0:b1], level.ylo[b0:b1], level.xhi[b0:b1], level.yhi[b0:b1]):
+			if xlo < xhi:
+				L.append((xlo, ylo))
+				L.append((xhi, yhi))
+			elif xlo > xhi:
+				L.append((xhi, yhi))
+				L.append((xlo, ylo))
+			else:
+				L.append((xlo, ylo))
+				if ylo != yhi:
+					L.append((xhi, yhi))
+		L.append((xs[i1-1], self.raw.ylo[i1-1]))
+
+		return L
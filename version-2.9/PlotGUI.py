@@ -23,7 +23,6 @@
 import wx
 import os
 import sys
-import math
 import threading
 import bisect
 
@@ -46,8 +45,10 @@ except ImportError:
 else:
 	#This module requires the Numeric/numarray or NumPy module, which could not be imported.
 	import wx.lib.plot as plot
+	import SpectrumAnalysis
 
-from Utilities import smooth
+from PlotBuffer import PlotSeries
+from DataFile import isColumnFile, readColumns, readData
 
 LColour = ('black', 'red', 'green', 'blue', 'yellow', 'gray', 'magenta', 'maroon', 'orange', 'salmon', 'pink', 'plum')
 Markers = ('circle', 'triangle', 'square',  'cross', 'triangle_down', 'plus', 'dot')
@@ -56,6 +57,12 @@ def get_limit(d):
 	""" Function which give the limits of d
 	"""
 
+	### compact results (see ResultBuffer) and their normalized points
+	if hasattr(d, 'GetLimits'):
+		return d.GetLimits()
+	elif isinstance(d, ndarray):
+		return d[:,0].min(), d[:,0].max(), d[:,1].min(), d[:,1].max()
+
 	L1,L2 = [],[]
 	for c in d:
 		bisect.insort(L1, c[0])
@@ -67,6 +74,29 @@ def get_limit(d):
 
 	return L1[0],L1[-1],L2[0],L2[-1]
 
+def normalize(d):
+	""" Return the points of d [(t,y)...] with y divided by its maximum.
+		The compact results (see ResultBuffer) are read through their columns into a (n, 2) array.
+	"""
+
+	if hasattr(d, 'GetColumns'):
+		xs, ys = d.GetColumns()
+		if not len(xs):
+			return []
+		return column_stack((frombuffer(xs), frombuffer(ys)/max(ys)))
+
+	m = max(map(lambda a: a[1], d))
+	return map(lambda b: (b[0], b[1]/m), d)
+
+def FileToPlotData(fn, separator = " "):
+	""" Return the data [(t,y)...] stored in the column or text file fn.
+	"""
+
+	if isColumnFile(fn):
+		return zip(*readColumns(fn))
+	else:
+		return [(float(r[0]), float(r[1])) for r in readData(fn, separator) if len(r) > 1]
+
 def PlotManager(parent, label, atomicModel, xl, yl):
 	""" Manager for the plotting process which depends of the fusion option of QuickScope.
 	"""
@@ -409,10 +439,9 @@ class StaticPlot(PlotFrame):
 		data = self.data
 
 		## sans fusion
-		if isinstance(data, list):
+		if not isinstance(data, dict):
 			if self.normalize:
-				m = max(map(lambda a: a[1], data))
-				data = map(lambda b: (b[0], b[1]/m), data)
+				data = normalize(data)
 			line = plot.PolyLine(data, legend = 'Port 0 %s'%self.legend, colour = 'black', width = 1)
 			self.gc = plot.PlotGraphics([line], self.title, self.xLabel, self.yLabel)
 			xMin,xMax,yMin,yMax = get_limit(data)
@@ -429,8 +458,7 @@ class StaticPlot(PlotFrame):
 					c = LColour[0]
 
 				if self.normalize:
-					m = max(map(lambda a: a[1], d))
-					d = map(lambda b: (b[0], b[1]/m), d)
+					d = normalize(d)
 
 				L.append(plot.PolyLine(d, legend = 'Port %d %s'%(ind,self.legend), colour = c, width=1))
 
@@ -450,7 +478,7 @@ class StaticPlot(PlotFrame):
 		data = self.data
 
 		## sans fusion
-		if isinstance( data, list):
+		if not isinstance(data, dict):
 
 			### formatage des données spécifique au square
 			data = []
@@ -459,8 +487,7 @@ class StaticPlot(PlotFrame):
 				data.append(v2)
 
 			if self.normalize:
-				m = max(map(lambda a: a[1], data))
-				data = map(lambda b: (b[0], b[1]/m), data)
+				data = normalize(data)
 
 			line = plot.PolyLine(data, legend = 'Port 0 %s'%self.legend, colour = 'black', width = 1)
 			self.gc = plot.PlotGraphics([line], self.title, self.xLabel, self.yLabel)
@@ -488,8 +515,7 @@ class StaticPlot(PlotFrame):
 					c = LColour[0]
 
 				if self.normalize:
-					m = max(map(lambda a: a[1], dd))
-					dd = map(lambda b: (b[0], b[1]/m), dd)
+					dd = normalize(dd)
 
 				L.append(plot.PolyLine(dd, legend = 'Port %d %s'%(ind,self.legend), colour = c, width=1))
 
@@ -510,10 +536,9 @@ class StaticPlot(PlotFrame):
 		data = self.data
 
 		## sans fusion
-		if isinstance(data, list):
+		if not isinstance(data, dict):
 			if self.normalize:
-				m = max(map(lambda a: a[1], data))
-				data = map(lambda b: (b[0], b[1]/m), data)
+				data = normalize(data)
 			markers = plot.PolyMarker(data, colour = LColour[0], marker = Markers[0], size = 1)
 			line = plot.PolyLine(data, legend = 'Port 0 %s'%self.legend, colour = LColour[0], width = 1)
 			self.gc = plot.PlotGraphics([line, markers], self.title, self.xLabel, self.yLabel)
@@ -536,8 +561,7 @@ class StaticPlot(PlotFrame):
 					m = Markers[0]
 
 				if self.normalize:
-					m = max(map(lambda a: a[1], d))
-					d = map(lambda b: (b[0], b[1]/m), d)
+					d = normalize(d)
 
 				L.append(plot.PolyLine(d, legend = 'Port 0 %s'%self.legend, colour=c, width=1))
 				L.append(plot.PolyMarker(d, colour=c, marker=m, size=1))
@@ -558,7 +582,7 @@ class StaticPlot(PlotFrame):
 		data = self.data
 
 		## sans fusion
-		if isinstance( data, list):
+		if not isinstance(data, dict):
 
 			line = [plot.PolyLine([(c[0], 0), (c[0],c[1])], legend='', colour='gray', width=25) for c in data]
 			self.gc = plot.PlotGraphics(line, self.title, self.xLabel, self.yLabel)
@@ -662,6 +686,9 @@ class DynamicPlot(PlotFrame):
 
 		self.title = ""
 
+		### decimated series of the signals (see PlotBuffer)
+		self.series = {}
+
 		# simulation thread
 		self.sim_thread = None
 		diagram = parent.diagram
@@ -694,6 +721,30 @@ class DynamicPlot(PlotFrame):
 	def OnTimerEvent(self, event):
 		self.GetEventHandler().ProcessEvent(wx.PaintEvent( ))
 
+	def GetSeries(self, key):
+		""" Return the decimated series of the signal key, updated with the new results of the model.
+		"""
+		if key not in self.series:
+			### the live plot keeps as many points as the compact results (see ResultBuffer)
+			self.series[key] = PlotSeries(getattr(self.atomicModel.results[key], 'capacity', 0))
+		self.series[key].Sync(self.atomicModel.results[key])
+		return self.series[key]
+
+	def GetPoints(self, key):
+		""" Return the points of the signal key to draw on the width of the canvas (normalized if needed) and their limits.
+		"""
+
+		s = self.GetSeries(key)
+		data = s.GetPoints(width = max(1, self.client.GetClientSize()[0]))
+		xMin, xMax, yMin, yMax = s.GetLimits()
+
+		if self.normalize:
+			m = s.ymax or 1.0
+			data = [(a, b/m) for a, b in data]
+			yMin, yMax = sorted((yMin/m, yMax/m))
+
+		return data, (xMin, xMax, yMin, yMax)
+
 	def OnPlotLine(self, event):
 		""" Plot process depends to the timer event.
 		"""
@@ -709,44 +760,32 @@ class DynamicPlot(PlotFrame):
 		### without fusion
 		if self.iport is not None:
 
-			data = self.atomicModel.results[self.iport]
-
-			if self.normalize:
-				m = max(map(lambda a: a[1], data))
-				data = map(lambda b: (b[0], b[1]/m), data)
+			data, (xMin,xMax,yMin,yMax) = self.GetPoints(self.iport)
 
 			line = plot.PolyLine(data, legend = 'Port 0 (%s)'%self.atomicModel.getBlockModel().label, colour = 'black', width = 1)
 			self.gc = plot.PlotGraphics([line], self.title, self.xLabel, self.yLabel)
-			xMin,xMax,yMin,yMax = get_limit(data)
 
 		### with fusion (look QuickScope attribut _fusion)
 		else:
 
-			data = self.atomicModel.results
 			label = self.atomicModel.getBlockModel().label
 
 			L = []
 			xMin, xMax, yMin, yMax = 0,0,0,0
-			data_list = data.values()
-			for ind,d in enumerate(data_list):
-				#ind = data_list.index(d)
+			for ind,key in enumerate(self.atomicModel.results.keys()):
 				try:
 					c = LColour[ind]
 				except IndexError:
 					c = LColour[0]
 
-				if self.normalize:
-					m = max(map(lambda a: a[1], d))
-					d = map(lambda b: (b[0], b[1]/m), d)
+				d, (a,b,c_,d_) = self.GetPoints(key)
 
-				L.append(plot.PolyLine(d, legend = 'Port %s (%s)'%(str(data.keys()[ind]), label), colour = c, width=1))
-
-				a,b,c,d = get_limit(d)
+				L.append(plot.PolyLine(d, legend = 'Port %s (%s)'%(str(key), label), colour = c, width=1))
 
 				if a < xMin: xMin = a
 				if b > xMax: xMax = b
-				if c < yMin: yMin = c
-				if d > yMax: yMax = d
+				if c_ < yMin: yMin = c_
+				if d_ > yMax: yMax = d_
 
 			self.gc = plot.PlotGraphics(L, self.title, self.xLabel, self.yLabel)
 
@@ -770,7 +809,7 @@ class DynamicPlot(PlotFrame):
 		## sans fusion
 		if self.iport is not None:
 
-			d = self.atomicModel.results[self.iport]
+			d, (xMin,xMax,yMin,yMax) = self.GetPoints(self.iport)
 
 			### formatage des données pour le square
 			data = []
@@ -778,28 +817,21 @@ class DynamicPlot(PlotFrame):
 				data.append(v1)
 				data.append(v2)
 
-			if self.normalize:
-				m = max(map(lambda a: a[1], data))
-				data = map(lambda b: (b[0], b[1]/m), data)
-
 			line = plot.PolyLine(data, legend='Port 0 (%s)'%self.atomicModel.getBlockModel().label, colour='black', width=1)
 			self.gc = plot.PlotGraphics([line], self.title, self.xLabel, self.yLabel)
 
-			### gestion dynamique des bornes
-			xMin,xMax,yMin,yMax = get_limit(data)
-
 		##avec fusion (voir attribut 'fusion' de QuickScope)
 		else:
 
-			data = self.atomicModel.results
 			label = self.atomicModel.getBlockModel().label
 
 			L = []
 			xMin, xMax = 0,0
 			yMin, yMax = 0,0
 
-			data_list = data.values()
-			for ind,d in enumerate(data_list):
+			for ind,key in enumerate(self.atomicModel.results.keys()):
+
+				d, (a,b,c_,d_) = self.GetPoints(key)
 
 				### formatage des données pour le square
 				dd = []
@@ -813,20 +845,14 @@ class DynamicPlot(PlotFrame):
 				except IndexError:
 					c = LColour[0]
 
-				if self.normalize:
-					m = max(map(lambda a: a[1], dd))
-					dd = map(lambda b: (b[0], b[1]/m), dd)
-
 				### construction des données
-				L.append(plot.PolyLine(dd, legend='Port %s (%s)'%(str(data.keys()[ind]),label), colour=c, width=1))
+				L.append(plot.PolyLine(dd, legend='Port %s (%s)'%(str(key),label), colour=c, width=1))
 
 				###gestion dynamique des bornes
-				a,b,c,d = get_limit(dd)
-
 				if a < xMin: xMin = a
 				if b > xMax: xMax = b
-				if c < yMin: yMin = c
-				if d > yMax: yMax = d
+				if c_ < yMin: yMin = c_
+				if d_ > yMax: yMax = d_
 
 			self.gc = plot.PlotGraphics(L, self.title, self.xLabel, self.yLabel)
 
@@ -850,30 +876,22 @@ class DynamicPlot(PlotFrame):
 		## sans fusion
 		if self.iport is not None:
 
-			data = self.atomicModel.results[self.iport]
-
-			if self.normalize:
-				m = max(map(lambda a: a[1], data))
-				data = map(lambda b: (b[0], b[1]/m), data)
+			data, (xMin,xMax,yMin,yMax) = self.GetPoints(self.iport)
 
 			markers = plot.PolyMarker(data, colour=LColour[0], marker=Markers[0], size=1)
-			markers = plot.PolyLine(data, legend='Port 0 (%s)'%self.atomicModel.getBlockModel().label, colour=LColour[0], width=1)
+			line = plot.PolyLine(data, legend='Port 0 (%s)'%self.atomicModel.getBlockModel().label, colour=LColour[0], width=1)
 			self.gc = plot.PlotGraphics([line, markers], self.title, self.xLabel, self.yLabel)
-			xMin,xMax,yMin,yMax = get_limit(data)
 
 		##avec fusion (voir attribut _fusion de QuickScope)
 		else:
 
-			data = self.atomicModel.results
 			label = self.atomicModel.getBlockModel().label
 
 			L = []
 			xMin, xMax = 0,0
 			yMin, yMax = 0,0
 
-			data_list = data.values()
-			for ind,d in enumerate(data_list):
-				#ind = data.values().index(d)
+			for ind,key in enumerate(self.atomicModel.results.keys()):
 				try:
 					c = LColour[ind]
 				except IndexError:
@@ -884,19 +902,15 @@ class DynamicPlot(PlotFrame):
 				except IndexError:
 					m = Markers[0]
 
-				if self.normalize:
-					m = max(map(lambda a: a[1], d))
-					d = map(lambda b: (b[0], b[1]/m), d)
+				d, (a,b,c_,d_) = self.GetPoints(key)
 
 				L.append(plot.PolyLine(d, colour=c, width=1))
-				L.append(plot.PolyMarker(d, legend='Port %s (%s)'%(str(data.keys()[ind]), label), colour=c, marker=m, size=1))
-
-				a,b,c,d = get_limit(d)
+				L.append(plot.PolyMarker(d, legend='Port %s (%s)'%(str(key), label), colour=c, marker=m, size=1))
 
 				if a < xMin: xMin=a
 				if b > xMax: xMax=b
-				if c < yMin: yMin=c
-				if d > yMax:yMax=d
+				if c_ < yMin: yMin=c_
+				if d_ > yMax:yMax=d_
 
 			self.gc = plot.PlotGraphics(L, self.title, self.xLabel, self.yLabel)
 
@@ -1013,52 +1027,11 @@ class Spectrum(StaticPlot):
 		"""	@data : [(x,y)...]
 		"""
 
-		# total time
-		duree = data[-1][0]
-
-		signal=[c[1] for c in data]
-
-		Nb_pts=len(signal)
-
-		#interpolation B-splines
-		#dx=1
-		#newx=r_[0:Nb_pts:duree]
-		#y=array(self.signal)
-		#newy=cspline1d_eval(cspline1d(y),newx,dx=dx,x0=y[0])
-		#self.signal=newy
-
-		# nombre de points pour la fft
-		p=1
-		while(pow(2,p)<=Nb_pts):
-			p+=1
-			N=float(pow(2,p))
-		assert(pow(2,p)>= Nb_pts)
-
-		#application d'une fenetre
-		signal = smooth(array(signal),window_len=10,window="hamming")
-
-		# frequence d'echantillonnage
-		Fe = 1.0/(float(duree)/float(len(signal)))
-
-		#FFT
-		Y = fft.fft(signal,int(N))
-		Y = abs(fft.fftshift(Y))
-		F = [Fe*i/N for i in xrange(int(-N/2), int(N/2))]
-
-		# normalisation
-		Max = max(Y)
-		Y = [20*math.log(i/Max,10) for i in Y]
-
-		#frequence max et min pour le plot
-		FMin, FMax=0,200
-		F_plot, Y_plot=[],[]
-		for i in xrange(len(F)):
-			if FMin<F[i]<FMax:
-				F_plot.append(F[i])
-				Y_plot.append(Y[i])
+		# frequences et amplitudes (dB) de la bande plottee
+		F, A = SpectrumAnalysis.spectrum(data, SpectrumAnalysis.FMIN, SpectrumAnalysis.FMAX)
 
 		# formate les donnees pour Plot
-		self.data = map(lambda a,b:(a,b),F_plot,Y_plot)
+		self.data = zip(F.tolist(), A.tolist())
 
 		# invoque la frame
 		StaticPlot.__init__(self, parent, id, title, self.data, xLabel=_('Frequency [Hz]'),yLabel=_('Amplitude [dB]'))
@@ -1099,14 +1072,4 @@ class Spectrum(StaticPlot):
 
 	def Rescale(self,FMin=0,FMax=200):
 		#frequence max et min pour le plot
-		F,Y,F_plot, Y_plot=[],[],[],[]
-		for f,v in self.data:
-			F.append(f)
-			Y.append(v)
-		for i in xrange(len(F)):
-			if FMin<F[i]<FMax:
-				F_plot.append(F[i])
-				Y_plot.append(Y[i])
-
-		# formate les donnees pour Plot
-		return map(lambda a,b:(a,b),F_plot,Y_plot)
\ No newline at end of file
+		return [(f, v) for f, v in self.data if FMin < f < FMax]
\ No newline at end of file
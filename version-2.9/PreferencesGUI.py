@@ -27,6 +27,7 @@ from HtmlWindow import HtmlFrame
 
 from PluginsGUI import PluginsPanel, GeneralPluginsList
 from Utilities import playSound, GetUserConfigDir, GetWXVersionFromIni
+from SimulationSettings import getDefaultSettings, CHOICES
 
 import ReloadModule
 import Menu
@@ -230,6 +231,7 @@ class SimulationPanel(wx.Panel):
 		hbox3 = wx.BoxSizer(wx.HORIZONTAL)
 		hbox4 = wx.BoxSizer(wx.HORIZONTAL)
 		hbox5 = wx.BoxSizer(wx.HORIZONTAL)
+		hbox6 = wx.BoxSizer(wx.HORIZONTAL)
 		vbox = wx.BoxSizer(wx.VERTICAL)
 
 		self.sim_success_sound_path = __builtin__.__dict__['SIMULATION_SUCCESS_SOUND_PATH']
@@ -277,6 +279,19 @@ class SimulationPanel(wx.Panel):
 		self.sc = wx.SpinCtrl(self, wx.ID_ANY, str(self.sim_defaut_plot_dyn_freq), (55, 90), (60, -1), min=10, max=10000)
 		self.sc.SetToolTipString(_("Default frequency for dynamic plotting."))
 
+		### default PyPDEVS settings (the diagrams can override them from the simulation dialog)
+		self.pypdevs_settings = getDefaultSettings()
+		self.txt4 = wx.StaticText(self, wx.ID_ANY, _("PyPDEVS:"))
+		self.pypdevs_ctrls = []
+		for key, label in (('scheduler', _("Scheduler")), ('message_copy', _("Message copy")), ('state_saving', _("State saving")), ('memoization', _("Memoization"))):
+			if CHOICES[key] is None:
+				ctrl = wx.CheckBox(self, wx.ID_ANY, label, name=key)
+				ctrl.SetValue(self.pypdevs_settings[key])
+			else:
+				ctrl = wx.ComboBox(self, wx.ID_ANY, self.pypdevs_settings[key], choices=CHOICES[key], style=wx.CB_READONLY, name=key)
+			ctrl.SetToolTipString(_("Default %s of the PyPDEVS simulations.")%label.lower())
+			self.pypdevs_ctrls.append(ctrl)
+
 		### Adding sizer
 		hbox1.Add(self.cb1, 0, wx.ALIGN_CENTER_VERTICAL|wx.ALL, 15)
 		hbox1.Add(self.sim_success_sound_btn, 1, wx.ALIGN_CENTER_VERTICAL|wx.EXPAND|wx.ALL, 15)
@@ -295,6 +310,10 @@ class SimulationPanel(wx.Panel):
 		hbox4.Add(self.txt2, 0, wx.ALIGN_CENTER_VERTICAL|wx.ALIGN_LEFT|wx.ALL, 15)
 		hbox4.Add(self.sc, 1, wx.ALIGN_CENTER_VERTICAL|wx.ALIGN_RIGHT|wx.ALL, 15)
 
+		hbox6.Add(self.txt4, 0, wx.ALIGN_CENTER_VERTICAL|wx.ALL, 15)
+		for ctrl in self.pypdevs_ctrls:
+			hbox6.Add(ctrl, 1, wx.ALIGN_CENTER_VERTICAL|wx.ALL, 5)
+
 		#hbox4.Add(information, 1, wx.ALIGN_CENTER_VERTICAL, 15)
 		##hbox4.Add(self.strategy_info, 1, wx.ALIGN_CENTER_VERTICAL, 15)
 
@@ -303,6 +322,7 @@ class SimulationPanel(wx.Panel):
 		vbox.Add(hbox2, 0, wx.ALIGN_CENTER_HORIZONTAL|wx.EXPAND|wx.ALL, 10)
 		vbox.Add(hbox3, 0, wx.ALIGN_CENTER_VERTICAL|wx.ALL, 10)
 		vbox.Add(hbox4, 0, wx.ALIGN_CENTER_VERTICAL|wx.ALL, 10)
+		vbox.Add(hbox6, 0, wx.ALIGN_CENTER_VERTICAL|wx.EXPAND|wx.ALL, 10)
 
 		### Set sizer
 		self.SetSizer(vbox)
@@ -450,6 +470,7 @@ class SimulationPanel(wx.Panel):
 		__builtin__.__dict__['DEFAULT_SIM_STRATEGY'] = self.sim_defaut_strategy
 		__builtin__.__dict__['DEFAULT_PLOT_DYN_FREQ'] = self.sim_defaut_plot_dyn_freq
 		__builtin__.__dict__['NTL'] = self.cb2.GetValue()
+		__builtin__.__dict__['PYPDEVS_SIM_SETTINGS'] = dict((ctrl.GetName(), ctrl.GetValue()) for ctrl in self.pypdevs_ctrls)
 
 class EditorPanel(wx.Panel):
 	""" Edition Panel
@@ -713,7 +734,7 @@ class TestApp(wx.App):
 		__builtin__.__dict__['DEFAULT_PYPDEVS_SIM_STRATEGY'] = 'original'
 		__builtin__.__dict__['DEFAULT_PLOT_DYN_FREQ'] = 100
 		__builtin__.__dict__['LOCAL_EDITOR'] = False
-		__builtin__.__dict__['PYDEVS_SIM_STRATEGY_DICT'] = {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3'}
+		__builtin__.__dict__['PYDEVS_SIM_STRATEGY_DICT'] = {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3', 'event-queue':'SimStrategy7', 'compiled':'SimStrategy8', 'multi-process':'SimStrategy9'}
 		__builtin__.__dict__['PYPDEVS_SIM_STRATEGY_DICT'] = {'original':'SimStrategy4', 'distributed':'SimStrategy5', 'parallel':'SimStrategy6'}
 
 		__builtin__.__dict__['_'] = gettext.gettext
@@ -12,12 +12,18 @@ def recompile(modulename):
 	"""	recompile module from modulename
 	"""
 
+	### the modules and classes of the blocks must be imported again
+	from Components import BlockFactory
+
 	### modulename is file type
 	if os.path.isfile(modulename) and os.path.exists(modulename):
+		BlockFactory.ClearCache(modulename)
 		import ZipManager
 		zf = ZipManager.Zip(modulename)
 		return zf.Recompile()
 	else:
+		### the module is reloaded in place (same module object but new classes)
+		BlockFactory.ClearCache()
 
 		try:
 			### first, see if the module can be imported at all...
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# ResultBuffer.py --- Compact storage of the (time, value) results of a scope
+#                     --------------------------------
+# Version                                        last modified: 18/10/2026
+###############################################################################
+# NOTES:
+#
+# A ResultBuffer is a sequence of (time, value) pairs stored in two parallel
+# array('d') columns (16 bytes per sample instead of a tuple of two floats).
+# The samples are appended in chunks of chunk_size samples. When a capacity
+# is given, only the last chunks holding at least capacity samples are kept in
+# memory and the oldest chunks are either dropped or spilled to a temporary
+# column file (see DataFile) from which they are read again when needed.
+#
+# The buffer behaves like the list of pairs used before (len, indexing,
+# slices, iteration), so the plots and the spreadsheet read it without change.
+# Indexes are relative to the first available sample: when chunks are
+# dropped, start is the number of samples dropped since the beginning.
+#
+# GetColumns returns the times and the values of a range of samples as two
+# array('d') (without building the pairs) and numpy.array(buffer) returns a
+# (n, 2) array.
+###############################################################################
+
+from __future__ import with_statement
+
+import os
+import sys
+import tempfile
+from array import array
+
+import DataFile
+
+import gettext
+_ = gettext.gettext
+
+class ResultBuffer:
+	""" Sequence of (time, value) pairs stored in array('d') columns with an optional capacity.
+	"""
+
+	def __init__(self, capacity = 0, spill = True, chunk_size = DataFile.CHUNK_SIZE):
+		""" Constructor.
+
+			@param capacity : Number of samples kept in memory (rounded up to chunks, 0 for no limit)
+			@param spill : Flag to write the oldest chunks on the disk instead of dropping them
+			@param chunk_size : Number of samples per chunk
+		"""
+
+		self.capacity = capacity
+		self.spill = spill
+		self.chunk_size = chunk_size
+
+		### full chunks in memory [(times, values)...] and current chunk
+		self.chunks = []
+		self.times = array('d')
+		self.values = array('d')
+
+		### number of dropped samples
+		self.start = 0
+
+		### spill file (created with the first spilled chunk), number of spilled chunks and last chunk read
+		self.fn = None
+		self.spilled = 0
+		self.owner = True
+		self.cache = (None, None)
+
+	def __del__(self):
+		if self.owner and self.fn and os.path.exists(self.fn):
+			os.remove(self.fn)
+
+	def __getstate__(self):
+		state = self.__dict__.copy()
+		state['cache'] = (None, None)
+		return state
+
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+		### the spill file is removed by the original buffer
+		self.owner = False
+
+	def __len__(self):
+		return (self.spilled + len(self.chunks))*self.chunk_size + len(self.times)
+
+	def append(self, item):
+		""" Add the pair item (time, value).
+		"""
+		t, v = item
+		self.times.append(t)
+		self.values.append(v)
+		if len(self.times) >= self.chunk_size:
+			self.Rotate()
+
+	def extend(self, items):
+		""" Add the pairs of items.
+		"""
+		for item in items:
+			self.append(item)
+
+	def Rotate(self):
+		""" Close the current chunk and spill or drop the oldest chunks beyond the capacity.
+		"""
+
+		self.chunks.append((self.times, self.values))
+		self.times = array('d')
+		self.values = array('d')
+
+		if self.capacity:
+			while len(self.chunks) > 1 and (len(self.chunks)-1)*self.chunk_size >= self.capacity:
+				times, values = self.chunks.pop(0)
+				if self.spill:
+					self.Spill(times, values)
+				else:
+					self.start += len(times)
+
+	def Spill(self, times, values):
+		""" Append the chunk (times, values) to the spill file.
+		"""
+
+		if self.fn is None:
+			fd, self.fn = tempfile.mkstemp(prefix = 'devsimpy_', suffix = '.col')
+			with os.fdopen(fd, 'wb') as f:
+				f.write(DataFile.MAGIC)
+
+		if sys.byteorder != 'little':
+			times, values = array('d', times), array('d', values)
+			times.byteswap()
+			values.byteswap()
+
+		with open(self.fn, 'ab') as f:
+			f.write(DataFile.CHUNK_HEADER.pack(len(times)))
+			times.tofile(f)
+			values.tofile(f)
+
+		self.spilled += 1
+
+	def GetChunk(self, c):
+		""" Return the columns (times, values) of the chunk c (spilled or in memory).
+		"""
+
+		if c >= self.spilled:
+			c -= self.spilled
+			return self.chunks[c] if c < len(self.chunks) else (self.times, self.values)
+
+		if self.cache[0] == c:
+			return self.cache[1]
+
+		n = self.chunk_size
+		times = array('d')
+		values = array('d')
+		with open(self.fn, 'rb') as f:
+			f.seek(len(DataFile.MAGIC) + c*(DataFile.CHUNK_HEADER.size + 16*n) + DataFile.CHUNK_HEADER.size)
+			times.fromfile(f, n)
+			values.fromfile(f, n)
+
+		if sys.byteorder != 'little':
+			times.byteswap()
+			values.byteswap()
+
+		self.cache = (c, (times, values))
+
+		return times, values
+
+	def GetColumns(self, i = 0, j = None):
+		""" Return the times and the values of the samples [i:j] as two array('d').
+		"""
+
+		i, j, step = slice(i, j).indices(len(self))
+
+		times = array('d')
+		values = array('d')
+		while i < j:
+			c, k = divmod(i, self.chunk_size)
+			n = min(self.chunk_size - k, j - i)
+			t, v = self.GetChunk(c)
+			times.extend(t[k:k+n])
+			values.extend(v[k:k+n])
+			i += n
+
+		return times, values
+
+	def GetLimits(self):
+		""" Return the limits (xmin, xmax, ymin, ymax) of the samples.
+		"""
+
+		if not len(self):
+			raise ValueError(_("No sample in the buffer"))
+
+		ymin, ymax = [], []
+		for c in xrange(self.spilled + len(self.chunks) + 1):
+			t, v = self.GetChunk(c)
+			if len(v):
+				ymin.append(min(v))
+				ymax.append(max(v))
+
+		return self[0][0], self[-1][0], min(ymin), max(ymax)
+
+	def __getitem__(self, i):
+		""" Return the pair i or the list of pairs of a slice.
+		"""
+
+		if isinstance(i, slice):
+			start, stop, step = i.indices(len(self))
+			if step == 1:
+				return zip(*self.GetColumns(start, stop))
+			return [self[k] for k in xrange(start, stop, step)]
+
+		if i < 0:
+			i += len(self)
+		if not 0 <= i < len(self):
+			raise IndexError(i)
+
+		c, k = divmod(i, self.chunk_size)
+		t, v = self.GetChunk(c)
+		return t[k], v[k]
+
+	def __iter__(self):
+		for c in xrange(self.spilled + len(self.chunks) + 1):
+			t, v = self.GetChunk(c)
+			for item in zip(t, v):
+				yield item
+
+	def __array__(self, dtype = None):
+		""" Return the samples as a (n, 2) numpy array.
+		"""
+		import numpy
+		times, values = self.GetColumns()
+		a = numpy.column_stack((numpy.frombuffer(times), numpy.frombuffer(values))) if len(times) else numpy.zeros((0, 2))
+		return a if dtype is None else a.astype(dtype)
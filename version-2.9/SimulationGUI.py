@@ -50,6 +50,7 @@ from Utilities import IsAllDigits, playSound
 from pluginmanager import trigger_event, is_enable
 from Patterns.Strategy import *
 from Decorators import BuzyCursorNotification, hotshotit
+from SimulationSettings import getSettings, setSetting, CHOICES, CALIBRATION_BUDGET
 
 import Container
 
@@ -180,7 +181,7 @@ class CollapsiblePanel(wx.Panel):
 		cb1.SetToolTipString(_("For simulation profiling using hotshot"))
 		self.cb2.SetToolTipString(_("No time limit for the simulation. Simulation is over when childs are no active."))
 
-		grid3 = wx.GridSizer(5, 2, 1, 1)
+		grid3 = wx.GridSizer(5 if DEFAULT_DEVS_DIRNAME == 'PyDEVS' else 10, 2, 1, 1)
 		grid3.Add(text2, 0, wx.ALIGN_LEFT|wx.ALIGN_CENTER_VERTICAL, 19)
 		grid3.Add(ch1, 1, wx.ALIGN_RIGHT|wx.ALIGN_CENTER_HORIZONTAL|wx.ALIGN_CENTER_VERTICAL)
 		grid3.Add(text3, 0, wx.ALIGN_LEFT|wx.ALIGN_CENTER_VERTICAL, 19)
@@ -192,6 +193,32 @@ class CollapsiblePanel(wx.Panel):
 		grid3.Add(text6, 0, wx.ALIGN_LEFT|wx.ALIGN_CENTER_VERTICAL, 19)
 		grid3.Add(cb4, 1, wx.ALIGN_RIGHT|wx.ALIGN_CENTER_HORIZONTAL|wx.ALIGN_CENTER_VERTICAL, 19)
 
+		### PyPDEVS settings of the diagram (see SimulationSettings)
+		self.settings_ctrls = {}
+		if DEFAULT_DEVS_DIRNAME != 'PyDEVS':
+			settings = getSettings(self.simdia.GetDiagram())
+			for key, label in (('scheduler', _("Scheduler")), ('memoization', _("Memoization")), ('message_copy', _("Message copy")), ('state_saving', _("State saving"))):
+				text = wx.StaticText(pane, wx.ID_ANY, label)
+				if CHOICES[key] is None:
+					ctrl = wx.CheckBox(pane, wx.ID_ANY, name=key)
+					ctrl.SetValue(settings[key])
+					self.Bind(wx.EVT_CHECKBOX, self.OnSetting, ctrl)
+				else:
+					ctrl = wx.Choice(pane, wx.ID_ANY, choices=CHOICES[key], name=key)
+					ctrl.SetStringSelection(settings[key])
+					self.Bind(wx.EVT_CHOICE, self.OnSetting, ctrl)
+				ctrl.SetToolTipString(_("Saved with the diagram (the default value is defined in the preferences)."))
+				grid3.Add(text, 0, wx.ALIGN_LEFT|wx.ALIGN_CENTER_VERTICAL, 19)
+				grid3.Add(ctrl, 1, wx.ALIGN_RIGHT|wx.ALIGN_CENTER_HORIZONTAL|wx.ALIGN_CENTER_VERTICAL, 19)
+				self.settings_ctrls[key] = ctrl
+
+			### calibration of the scheduler
+			btn = wx.Button(pane, wx.ID_ANY, _("Calibrate"))
+			btn.SetToolTipString(_("Simulate a warm-up segment of the model with each scheduler and select the fastest one."))
+			grid3.Add(wx.StaticText(pane, wx.ID_ANY, ""), 0, wx.ALIGN_LEFT|wx.ALIGN_CENTER_VERTICAL, 19)
+			grid3.Add(btn, 1, wx.ALIGN_RIGHT|wx.ALIGN_CENTER_HORIZONTAL|wx.ALIGN_CENTER_VERTICAL, 19)
+			self.Bind(wx.EVT_BUTTON, self.OnCalibrate, btn)
+
 		pane.SetSizer(grid3)
 
 		self.Bind(wx.EVT_CHOICE, self.OnChoice, ch1)
@@ -233,6 +260,41 @@ class CollapsiblePanel(wx.Panel):
 		self.simdia.dynamic_structure_flag = cb4.GetValue()
 		__builtin__.__dict__['DYNAMIC_STRUCTURE'] = self.simdia.dynamic_structure_flag
 
+	def OnSetting(self, event):
+		""" PyPDEVS setting of the diagram has been changed
+		"""
+		obj = event.GetEventObject()
+		value = obj.GetValue() if isinstance(obj, wx.CheckBox) else obj.GetStringSelection()
+
+		diagram = self.simdia.GetDiagram()
+		if diagram is not None:
+			setSetting(diagram, obj.GetName(), value)
+			diagram.modify = True
+
+	@BuzyCursorNotification
+	def OnCalibrate(self, event):
+		""" Calibration of the PyPDEVS scheduler of the diagram (see CalibrateScheduler)
+		"""
+		diagram = self.simdia.GetDiagram()
+		if diagram is None:
+			return
+
+		### the warm-up segment is bounded by the final time
+		T = INFINITY if self.simdia.ntl else float(self.simdia._value.GetValue())
+
+		results = CalibrateScheduler(diagram, T, CALIBRATION_BUDGET, self.simdia.selected_strategy)
+
+		### the DEVS instances have been simulated by the calibration
+		self.simdia.master = Container.Diagram.makeDEVSInstance(diagram)
+
+		if results:
+			diagram.modify = True
+			self.settings_ctrls['scheduler'].SetStringSelection(results[0][1])
+			msg = '\n'.join(["%s: %.0f steps/s"%(s, r) for r, s in results])
+			wx.MessageBox(_("Selected scheduler: %s\n\n%s")%(results[0][1], msg), _("Scheduler calibration"), wx.OK|wx.ICON_INFORMATION)
+		else:
+			wx.MessageBox(_("Calibration failed (see the log)."), _("Scheduler calibration"), wx.OK|wx.ICON_ERROR)
+
 #-----------------------------------------------------------------
 class SimulationDialog(wx.Frame, wx.Panel):
 	""" SimulationDialog(parent, id, title, master)
@@ -310,6 +372,14 @@ class SimulationDialog(wx.Frame, wx.Panel):
 	def CreateBar(self):
 		self.statusbar = self.CreateStatusBar(2)
 
+	def GetDiagram(self):
+		""" Return the diagram of the simulated master model (None if unknown).
+		"""
+		try:
+			return self.master.getBlockModel()
+		except AttributeError:
+			return None
+
 	def __set_properties(self):
 		icon = wx.EmptyIcon()
 		icon.CopyFromBitmap(wx.Bitmap(os.path.join(ICON_PATH_16_16, "simulation.png"), wx.BITMAP_TYPE_ANY))
@@ -474,7 +544,7 @@ class SimulationDialog(wx.Frame, wx.Panel):
 				for fn in filter(lambda f: f.endswith('.devsimpy.log'), os.listdir(gettempdir())):
 					os.remove(os.path.join(gettempdir(),fn))
 
-				self.thread = simulator_factory(self.current_master, self.selected_strategy, self.prof, self.ntl, self.verbose, self.dynamic_structure_flag)
+				self.thread = simulator_factory(self.current_master, self.selected_strategy, self.prof, self.ntl, self.verbose, self.dynamic_structure_flag, settings=getSettings(self.GetDiagram()))
 				self.thread.setName(self.title)
 
 				### si le modele n'a pas de couplage, ou si pas de generateur: alors pas besoin de simuler
@@ -736,9 +806,13 @@ class SimulationDialog(wx.Frame, wx.Panel):
 		else:
 			raise msg
 
-def simulator_factory(model, strategy, prof, ntl, verbose, dynamic_structure_flag):
+def simulator_factory(model, strategy, prof, ntl, verbose, dynamic_structure_flag, progress_queue=None, progress_interval=1.0, settings=None):
 	""" Preventing direct creation for Simulator
         disallow direct access to the classes
+
+		If progress_queue is given, the simulation thread puts the simulated time of the model in it
+		at most every progress_interval seconds, and None when the simulation is over.
+		settings are the PyPDEVS simulation settings (see SimulationSettings, default settings if None).
 	"""
 
 	### find the correct simulator module depending on the
@@ -779,7 +853,7 @@ def simulator_factory(model, strategy, prof, ntl, verbose, dynamic_structure_fla
 			Thread for DEVS simulation task
 		"""
 
-		def __init__(self, model = None, strategy = '', prof = False, ntl = False, verbose=False, dynamic_structure_flag=False):
+		def __init__(self, model = None, strategy = '', prof = False, ntl = False, verbose=False, dynamic_structure_flag=False, progress_queue=None, progress_interval=1.0, settings=None):
 			""" Constructor.
 			"""
 			threading.Thread.__init__(self)
@@ -791,6 +865,12 @@ def simulator_factory(model, strategy, prof, ntl, verbose, dynamic_structure_fla
 			self.ntl = ntl
 			self.verbose = verbose
 			self.dynamic_structure_flag = dynamic_structure_flag
+			self.settings = settings if settings is not None else getSettings()
+
+			### progress channel
+			self.progress_queue = progress_queue
+			self.progress_interval = progress_interval
+			self._progress_time = 0.0
 
 			self.end_flag = False
 			self.thread_suspend = False
@@ -810,6 +890,9 @@ def simulator_factory(model, strategy, prof, ntl, verbose, dynamic_structure_fla
 			### TODO: isinstance(self, PyDEVSSimulator)
 			if DEFAULT_DEVS_DIRNAME == "PyDEVS":
 				cls_str = eval(PYDEVS_SIM_STRATEGY_DICT[self.strategy])
+				### copy policy of the messages of this simulation
+				from DEVSKernel.PyDEVS.DEVS import setMessageCopy
+				setMessageCopy(__builtin__.__dict__.get('PYDEVS_MESSAGE_COPY', 'deepcopy'), __builtin__.__dict__.get('PYDEVS_MESSAGE_CHECK', False))
 			else:
 				cls_str = eval(PYPDEVS_SIM_STRATEGY_DICT[self.strategy])
 
@@ -822,12 +905,33 @@ def simulator_factory(model, strategy, prof, ntl, verbose, dynamic_structure_fla
 				except Exception, info:
 					self.terminate(error=True, msg=sys.exc_info())
 
+		def _get_cpu_time(self):
+			return self._cpu_time
+
+		def _set_cpu_time(self, cpu_time):
+			""" The strategies update the cpu time at each simulation step, then the progress is published here.
+			"""
+			self._cpu_time = cpu_time
+			if self.progress_queue is not None and cpu_time - self._progress_time >= self.progress_interval:
+				self._progress_time = cpu_time
+				self.progress_queue.put(self.model.timeLast)
+
+		cpu_time = property(_get_cpu_time, _set_cpu_time)
+
 		def terminate(self, error = False, msg = None):
 			""" Thread termination routine
 				param error: False if thread is terminate without error
 				param msg: message to submit
 			"""
 
+			### last check of the messages delivered without copy
+			if not self.end_flag and not error and DEFAULT_DEVS_DIRNAME == "PyDEVS":
+				from DEVSKernel.PyDEVS.DEVS import checkMessages
+				try:
+					checkMessages()
+				except Exception:
+					error, msg = True, sys.exc_info()
+
 			if not self.end_flag:
 				if error:
 
@@ -857,6 +961,10 @@ def simulator_factory(model, strategy, prof, ntl, verbose, dynamic_structure_fla
 					### only for displayed application (-nogui)
 					if wx.GetApp() : wx.CallAfter(playSound, SIMULATION_SUCCESS_SOUND_PATH)
 
+				### end of the progress channel
+				if self.progress_queue is not None:
+					self.progress_queue.put(None)
+
 			self.end_flag = True
 
 		def set_sleep(self, sleeptime):
@@ -874,7 +982,7 @@ def simulator_factory(model, strategy, prof, ntl, verbose, dynamic_structure_fla
 		def resume_thread(self):
 			self.thread_suspend = False
 
-	return SimulationThread(model, strategy, prof, ntl, verbose, dynamic_structure_flag)
+	return SimulationThread(model, strategy, prof, ntl, verbose, dynamic_structure_flag, progress_queue, progress_interval, settings)
 
 ### ------------------------------------------------------------
 class TestApp(wx.App):
@@ -883,8 +991,8 @@ class TestApp(wx.App):
 
 	def OnInit(self):
 
-		__builtin__.__dict__['PYDEVS_SIM_STRATEGY_DICT'] = {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3'}
-		__builtin__.__dict__['PYPDEVS_SIM_STRATEGY_DICT'] = {'classic':'SimStrategy4', 'distribued':'SimStrategy5', 'parallel':'SimStrategy6'}
+		__builtin__.__dict__['PYDEVS_SIM_STRATEGY_DICT'] = {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3', 'event-queue':'SimStrategy7', 'compiled':'SimStrategy8', 'multi-process':'SimStrategy9'}
+		__builtin__.__dict__['PYPDEVS_SIM_STRATEGY_DICT'] = {'classic':'SimStrategy4', 'distributed':'SimStrategy5', 'parallel':'SimStrategy6'}
 		__builtin__.__dict__['DEFAULT_DEVS_DIRNAME'] = 'PyPDEVS'
 		__builtin__.__dict__['DEVS_DIR_PATH_DICT'] = {'PyDEVS':os.path.join(os.pardir,'DEVSKernel','PyDEVS'),'PyPDEVS':os.path.join(os.pardir,'DEVSKernel','PyPDEVS')}
 
@@ -907,4 +1015,4 @@ class TestApp(wx.App):
 if __name__ == '__main__':
 
 	app = TestApp(0)
-	app.MainLoop()
\ No newline at end of file
+	app.MainLoop()
\ No newline at end of file
@@ -15,6 +15,9 @@ GLOBAL VARIABLES AND FUNCTIONS:
 import os
 import sys
 import time
+import random
+import itertools
+import multiprocessing
 
 import __builtin__
 from cStringIO import StringIO
@@ -71,8 +74,11 @@ class PrintPusher():
     def push(self, event, data):
         print(json.dumps(data))
     
-def makeSimulation(master, T, simu_name="simu", is_remote=False, json_trace=True):
-    """
+def makeSimulation(master, T, simu_name="simu", is_remote=False, json_trace=True, progress_interval=1.0):
+    """ Simulate the master model until T.
+
+        The progress of the simulation is published by the simulation thread every progress_interval
+        seconds (cpu time) and the main thread blocks on it.
     """
     from InteractionSocket import InteractionManager
 
@@ -93,6 +99,9 @@ def makeSimulation(master, T, simu_name="simu", is_remote=False, json_trace=True
     
     else:
         json_report['summary'] += "...DEVS instance created"
+        ### duration of the phases of the instantiation (see Diagram.makeDEVSInstance)
+        from Container import Diagram
+        json_report['instantiation'] = Diagram.instantiation_timing
         
     # Start Simulation               
     json_report['summary'] += "...Performing DEVS simulation"
@@ -130,7 +139,10 @@ def makeSimulation(master, T, simu_name="simu", is_remote=False, json_trace=True
                 print('INTERACTION QUEUE SET')
                 m.setInteraction(interactionQueue)
 
-        sim = runSimulation(master, T)
+        ### progress channel from the simulation thread
+        progress_queue = Queue.Queue()
+
+        sim = runSimulation(master, T, progress_queue, progress_interval)
         thread = sim.Run()
 
         if interactionManager!=None :
@@ -140,16 +152,33 @@ def makeSimulation(master, T, simu_name="simu", is_remote=False, json_trace=True
         first_real_time = time.time()
         progress = 0
         
-        while(thread.isAlive()):
-            new_real_time = time.time()
-            CPUduration = new_real_time - first_real_time
-            new_progress = 100.0*(thread.model.timeLast / T)
-            if new_progress - progress > 5:
-                progress = new_progress
-                simuPusher.push('progress', {'progress':progress}) 
+        ### block until the simulation thread publishes its progress (None at the end of the simulation)
+        while True:
+            try:
+                clock = progress_queue.get(True, max(progress_interval, 1.0)*10)
+            except Queue.Empty:
+                ### the simulation thread died without closing the channel
+                if thread.isAlive():
+                    continue
+                else:
+                    break
+
+            CPUduration = time.time() - first_real_time
+
+            if clock is None:
+                break
+
+            if T:
+                new_progress = 100.0*(clock / T)
+                if new_progress - progress > 5:
+                    progress = new_progress
+                    simuPusher.push('progress', {'progress':progress}) 
             if not json_trace:
                 Printer(CPUduration)
 
+        thread.join()
+        CPUduration = time.time() - first_real_time
+
         if interactionManager != None:
             interactionManager.stop()
             interactionManager.join()
@@ -172,9 +201,9 @@ def makeSimulation(master, T, simu_name="simu", is_remote=False, json_trace=True
     
     ### inform that data file has been generated
     json_report['output'] = []
-    for m in filter(lambda a: hasattr(a, 'fileName'), master.componentSet):
+    for m in filter(lambda a: hasattr(a, 'fileName'), masterAtomicModels):
         for i in range(len(m.IPorts)):
-            fn ='%s%s.dat'%(m.fileName,str(i))
+            fn ='%s%s%s'%(m.fileName,str(i),getattr(m, 'ext', '.dat'))
             if os.path.exists(fn):
                 json_report['output'].append({'label':m.name+'_port_' + str(i),
                                               #'filename':fn})
@@ -191,7 +220,7 @@ class runSimulation:
     """
     """
 
-    def __init__(self, master, time):
+    def __init__(self, master, time, progress_queue=None, progress_interval=1.0):
         """ Constructor.
         """
 
@@ -199,6 +228,10 @@ class runSimulation:
         self.master = master
         self.time = time
 
+        ### channel where the simulation thread publishes its progress
+        self.progress_queue = progress_queue
+        self.progress_interval = progress_interval
+
         ### No time limit simulation (defined in the builtin dico from .devsimpy file)
         self.ntl = __builtin__.__dict__['NTL']
 
@@ -243,6 +276,125 @@ class runSimulation:
             from SimulationGUI import simulator_factory
             if not self.ntl:
                 self.master.FINAL_TIME = float(self.time)
-            self.thread = simulator_factory(self.master, self.selected_strategy, self.prof, self.ntl, self.verbose, self.dynamic_structure_flag)
+            from SimulationSettings import getSettings
+            self.thread = simulator_factory(self.master, self.selected_strategy, self.prof, self.ntl, self.verbose, self.dynamic_structure_flag, self.progress_queue, self.progress_interval, getSettings(diagram))
 
             return self.thread
+
+### YAMLHandler shared with the worker processes of a sweep (inherited with fork on posix)
+_sweep_handler = None
+
+def getSweepConfigs(spec):
+    """ Return the list of configurations {block label: {arg: value}} of a sweep.
+        spec is either a list of configurations, or a grid {block label: {arg: [values]}}
+        whose cartesian product is returned.
+    """
+    if isinstance(spec, list):
+        return spec
+
+    keys = [(label, arg) for label in sorted(spec) for arg in sorted(spec[label])]
+    configs = []
+    for values in itertools.product(*[spec[label][arg] for label, arg in keys]):
+        config = {}
+        for (label, arg), v in zip(keys, values):
+            config.setdefault(label, {})[arg] = v
+        configs.append(config)
+    return configs
+
+def getAtomicModels(model, L):
+    """ Return the list L extended with the atomic models of the hierarchy of model
+        (getFlatComponentSet is keyed by name, so the models with the same name are not all there).
+    """
+    for m in model.componentSet:
+        if hasattr(m, 'componentSet'):
+            getAtomicModels(m, L)
+        else:
+            L.append(m)
+    return L
+
+def runSweepItem(item):
+    """ Simulate one configuration of a sweep (executed in a worker process).
+    """
+    global _sweep_handler
+
+    index, filename, config, seed, T, simu_name = item
+
+    if _sweep_handler is None:
+        from InteractionYAML import YAMLHandler
+        _sweep_handler = YAMLHandler(filename)
+
+    run = {'run':index, 'config':config, 'seed':seed}
+    name = "%s_%d"%(simu_name, index)
+
+    ### the traces printed during the run are collected and written by the parent process (the workers would interleave them)
+    stdout, sys.stdout = sys.stdout, StringIO()
+
+    try:
+        for label, args in config.items():
+            _sweep_handler.updateYAMLBlockModelArgs(label, args)
+
+        if seed is not None:
+            random.seed(seed)
+            try:
+                import numpy
+                numpy.random.seed(seed)
+            except ImportError:
+                pass
+
+        master = _sweep_handler.getDevsInstance()
+
+        ### each run writes its own data files (collectors of the coupled sub-models included)
+        if master and not isinstance(master, tuple):
+            for m in filter(lambda a: hasattr(a, 'fileName'), getAtomicModels(master, [])):
+                m.fileName = "%s_%d"%(m.fileName, index)
+
+        makeSimulation(master, T, name, False, True)
+
+        with open(name+'.report', 'r') as f:
+            run['report'] = json.loads(f.read())
+    except:
+        run['report'] = {'success':False, 'info':traceback.format_exc()}
+    finally:
+        run['trace'] = sys.stdout.getvalue()
+        sys.stdout = stdout
+
+    return run
+
+def makeSweep(yamlHandler, T, spec, seeds=None, simu_name="simu", nb_process=None):
+    """ Simulate the model loaded by yamlHandler for each configuration of spec (see getSweepConfigs) and
+        each seed in a pool of worker processes (one per core by default), and write the reports of all the
+        runs in the simu_name.sweep file.
+    """
+    global _sweep_handler
+
+    filename = yamlHandler.filename
+    configs = getSweepConfigs(spec)
+    seeds = seeds or [None]
+    items = [(i, filename, config, seed, T, simu_name) for i, (config, seed) in enumerate(itertools.product(configs, seeds))]
+
+    ### the model is loaded once and inherited by the workers
+    _sweep_handler = yamlHandler
+
+    ### one fresh worker process per run: the runs can't interfere through the global state of the models
+    pool = multiprocessing.Pool(processes=nb_process or multiprocessing.cpu_count(), maxtasksperchild=1)
+    try:
+        runs = pool.map(runSweepItem, items)
+    finally:
+        pool.close()
+        pool.join()
+
+    ### traces of the runs, in the order of the runs
+    for r in runs:
+        sys.stdout.write(r.pop('trace'))
+    sys.stdout.flush()
+
+    json_report = {'date':time.strftime("%c"),
+                    'model':os.path.basename(filename),
+                    'time':T,
+                    'success':all(r['report'].get('success', False) for r in runs),
+                    'runs':runs}
+
+    with open(simu_name+'.sweep', 'w') as f:
+        f.write(json.dumps(json_report))
+
+    return json_report
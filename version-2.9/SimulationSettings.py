@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# SimulationSettings.py --- Simulation settings of the diagrams for PyPDEVS
+#                     --------------------------------
+# Version                                        last modified: 18/10/2026
+###############################################################################
+# NOTES:
+#
+# The PyPDEVS (2.2.1) simulator is configured with the setters of simconfig.py.
+# The settings exposed by DEVSimPy are:
+#
+#	- scheduler: the scheduler of the models (see PYPDEVS_SCHEDULER_DICT);
+#	- memoization: memoization of the transitions (distributed simulation);
+#	- message_copy: copy of the messages ('pickle', 'custom' or 'none');
+#	- state_saving: saving of the states ('deepcopy', 'pickleH', ...).
+#
+# The default settings are in the PYPDEVS_SIM_SETTINGS builtin (Preferences)
+# and a diagram overrides them with its simulation_settings attribute, which
+# is saved with the diagram. The settings of a diagram only store the values
+# that differ from the defaults chosen by the user.
+#
+# The calibration (see calibrate) simulates a warm-up segment of the model
+# with each scheduler of CALIBRATION_SCHEDULERS during the same cpu time and
+# returns the schedulers ordered by simulation steps per second (one step is
+# the output and the transitions of the imminent model(s) at a time).
+###############################################################################
+
+import sys
+import time
+import __builtin__
+
+import gettext
+_ = gettext.gettext
+
+### scheduler name: (module, class) of the PyPDEVS scheduler
+PYPDEVS_SCHEDULER_DICT = {	'activity-heap': ('schedulerAH', 'SchedulerAH'),
+							'dirty-heap': ('schedulerDH', 'SchedulerDH'),
+							'heap-set': ('schedulerHS', 'SchedulerHS'),
+							'minimal-list': ('schedulerML', 'SchedulerML'),
+							'sorted-list': ('schedulerSL', 'SchedulerSL'),
+							'no-age': ('schedulerNA', 'SchedulerNA'),
+							'discrete-time': ('schedulerDT', 'SchedulerDT'),
+							'polymorphic': ('schedulerAuto', 'SchedulerAuto')}
+
+PYPDEVS_MESSAGE_COPY_LIST = ['pickle', 'custom', 'none']
+
+PYPDEVS_STATE_SAVING_LIST = ['deepcopy', 'pickleH', 'pickle0', 'copy', 'assign', 'custom', 'marshal']
+
+### default values of the PyPDEVS simulator
+DEFAULT_SETTINGS = {'scheduler': 'activity-heap',
+					'memoization': False,
+					'message_copy': 'pickle',
+					'state_saving': 'pickleH'}
+
+### possible values of the settings (None for booleans)
+CHOICES = {	'scheduler': sorted(PYPDEVS_SCHEDULER_DICT),
+			'memoization': None,
+			'message_copy': PYPDEVS_MESSAGE_COPY_LIST,
+			'state_saving': PYPDEVS_STATE_SAVING_LIST}
+
+def checkSetting(key, value):
+	""" Return the value of the setting key (ValueError if it is not valid).
+	"""
+	if key not in DEFAULT_SETTINGS:
+		raise ValueError(_("Unknown simulation setting '%s'")%key)
+
+	if CHOICES[key] is None:
+		return bool(value)
+	elif value in CHOICES[key]:
+		return value
+	else:
+		raise ValueError(_("Bad value '%s' for the simulation setting '%s' (%s)")%(value, key, ', '.join(CHOICES[key])))
+
+def getDefaultSettings():
+	""" Return the default settings (the PYPDEVS_SIM_SETTINGS builtin over the defaults of PyPDEVS).
+	"""
+	settings = DEFAULT_SETTINGS.copy()
+	for key, value in __builtin__.__dict__.get('PYPDEVS_SIM_SETTINGS', {}).items():
+		if key in settings:
+			settings[key] = value
+	return settings
+
+def getSettings(diagram = None):
+	""" Return the settings of the simulation of the diagram (the default settings if None).
+	"""
+	settings = getDefaultSettings()
+	for key, value in getattr(diagram, 'simulation_settings', {}).items():
+		if key in settings:
+			settings[key] = value
+	return settings
+
+def setSetting(diagram, key, value):
+	""" Set the setting key of the diagram (the setting is removed from the diagram if it is the default value).
+	"""
+
+	value = checkSetting(key, value)
+
+	D = getattr(diagram, 'simulation_settings', {})
+	if value == getDefaultSettings()[key]:
+		D.pop(key, None)
+	else:
+		D[key] = value
+
+	diagram.simulation_settings = D
+
+def applySettings(S, settings):
+	""" Configure the PyPDEVS simulator S with the settings.
+	"""
+
+	filename, classname = PYPDEVS_SCHEDULER_DICT[settings['scheduler']]
+	S.setSchedulerCustom(filename, classname)
+	S.setMemoization(settings['memoization'])
+	S.setMessageCopy(settings['message_copy'])
+	S.setStateSaving(settings['state_saving'])
+
+### schedulers compared by the calibration (no-age and discrete-time are only valid for some models and polymorphic is unstable)
+CALIBRATION_SCHEDULERS = ['activity-heap', 'dirty-heap', 'heap-set', 'minimal-list', 'sorted-list']
+
+### cpu time (s) of the warm-up segment of each scheduler
+CALIBRATION_BUDGET = 2.0
+
+class WarmUp:
+	""" Termination condition of a warm-up segment: count the simulation steps and stop at the simulated time T
+		or when the cpu budget is spent.
+	"""
+
+	def __init__(self, T, budget):
+		self.T = T
+		self.budget = budget
+		self.steps = 0
+		self.start = time.time()
+
+	def __call__(self, clock, model):
+		self.steps += 1
+		### the clock is read every 64 steps
+		return clock[0] >= self.T or (self.steps & 63 == 0 and time.time()-self.start >= self.budget)
+
+def calibrate(makeSimulator, settings, T = float('inf'), budget = CALIBRATION_BUDGET, schedulers = CALIBRATION_SCHEDULERS):
+	""" Simulate a warm-up segment of the model with each scheduler and return the list of (steps per second, scheduler)
+		ordered from the fastest one. makeSimulator returns a new PyPDEVS simulator of a new instance of the model,
+		configured for the simulation (the other settings are applied from settings).
+	"""
+
+	results = []
+
+	for scheduler in schedulers:
+		D = settings.copy()
+		D['scheduler'] = scheduler
+
+		S = makeSimulator()
+		applySettings(S, D)
+		warmup = WarmUp(T, budget)
+		S.setTerminationCondition(warmup)
+
+		warmup.start = time.time()
+		try:
+			S.simulate()
+		except Exception, info:
+			sys.stderr.write(_("Calibration of the scheduler %s failed: %s\n")%(scheduler, info))
+			continue
+		elapsed = time.time()-warmup.start
+
+		results.append((warmup.steps/elapsed if elapsed else 0.0, scheduler))
+
+	results.sort(reverse = True)
+
+	return results
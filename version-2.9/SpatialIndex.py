@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# SpatialIndex.py --- Uniform grid index of the shapes of a canvas
+#                     --------------------------------
+# Version                                        last modified: 18/10/2026
+###############################################################################
+# NOTES:
+#
+# The plane (in logical coordinates of the canvas) is divided in square cells
+# of CELL_SIZE. Each shape is registered in all the cells overlapped by its
+# bounding box, so the shapes near a point or a rectangle are found without
+# iterating over all the shapes of the diagram. Queries return the shapes in
+# the order of the list used to build the index (the drawing order).
+#
+# The index does not observe the shapes: the canvas updates the moved shapes
+# and rebuilds the index when the diagram is refreshed.
+###############################################################################
+
+### side of a cell (logical units)
+CELL_SIZE = 128
+
+### margin added to the bounding box of the shapes (lines are hit at 3 units and port circles are drawn outside of the blocks)
+MARGIN = 10
+
+### margin added to the repainted regions (labels of the blocks and of the ports are drawn outside of the shapes)
+REPAINT_MARGIN = 40
+
+def getBox(s):
+	""" Return the bounding box (x0, y0, x1, y1) of the shape s (with MARGIN).
+	"""
+	return (min(s.x)-MARGIN, min(s.y)-MARGIN, max(s.x)+MARGIN, max(s.y)+MARGIN)
+
+def growBox(box, margin):
+	""" Return the box enlarged by margin.
+	"""
+	return (box[0]-margin, box[1]-margin, box[2]+margin, box[3]+margin)
+
+def unionBox(boxes):
+	""" Return the bounding box of the boxes (None if empty).
+	"""
+	boxes = filter(None, boxes)
+	if not boxes:
+		return None
+	return (min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+class GridIndex:
+	""" Uniform grid index of shapes.
+	"""
+
+	def __init__(self, shapes = [], cell_size = CELL_SIZE):
+		""" Constructor.
+
+			@param shapes : list of shapes (with x and y coordinates lists)
+			@param cell_size : side of the cells
+		"""
+
+		self.cell_size = float(cell_size)
+
+		### {(i,j): set of shape ids}
+		self.cells = {}
+		### {shape id: (shape, box, cells)}
+		self.entries = {}
+		### {shape id: rank in shapes}
+		self.rank = {}
+
+		self.shapes = shapes
+		self.length = len(shapes)
+
+		for i, s in enumerate(shapes):
+			self.rank[id(s)] = i
+			self.Insert(s)
+
+	def IsValid(self, shapes):
+		""" Return False if the shape list has been replaced or resized since the building of the index.
+		"""
+		return shapes is self.shapes and len(shapes) == self.length
+
+	def GetCells(self, box):
+		c = self.cell_size
+		x0, y0, x1, y1 = box
+		return [(i, j) for i in xrange(int(x0 // c), int(x1 // c)+1) for j in xrange(int(y0 // c), int(y1 // c)+1)]
+
+	def Insert(self, s):
+		""" Register the shape s with its current bounding box.
+		"""
+		try:
+			box = getBox(s)
+		### shape without coordinates
+		except (AttributeError, TypeError, ValueError):
+			return
+
+		cells = self.GetCells(box)
+		for cell in cells:
+			self.cells.setdefault(cell, set()).add(id(s))
+		self.entries[id(s)] = (s, box, cells)
+
+	def Remove(self, s):
+		""" Unregister the shape s.
+		"""
+		entry = self.entries.pop(id(s), None)
+		if entry is not None:
+			for cell in entry[2]:
+				self.cells[cell].discard(id(s))
+
+	def Update(self, s):
+		""" Update the bounding box of the shape s.
+		"""
+		self.Remove(s)
+		self.Insert(s)
+
+	def Contains(self, s):
+		return id(s) in self.entries
+
+	def GetBox(self, s):
+		""" Return the registered bounding box of the shape s (None if not registered).
+		"""
+		entry = self.entries.get(id(s))
+		return entry[1] if entry else None
+
+	def Query(self, box):
+		""" Return the shapes whose bounding box intersects box (x0, y0, x1, y1), in the order of the shapes.
+		"""
+
+		x0, y0, x1, y1 = box
+
+		ids = set()
+		for cell in self.GetCells(box):
+			if cell in self.cells:
+				ids.update(self.cells[cell])
+
+		L = []
+		for i in ids:
+			s, b, cells = self.entries[i]
+			if b[0] <= x1 and x0 <= b[2] and b[1] <= y1 and y0 <= b[3]:
+				L.append(s)
+
+		L.sort(key = lambda s: self.rank.get(id(s), -1))
+		return L
+
+	def QueryPoint(self, x, y):
+		""" Return the shapes whose bounding box contains the point (x, y), in the order of the shapes.
+		"""
+		return self.Query((x, y, x, y))
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# SpectrumAnalysis.py --- Amplitude spectrum of the signals of the scopes
+#                     --------------------------------
+# Version                                        last modified: 18/10/2026
+###############################################################################
+# NOTES:
+#
+# The outputs of DEVS models are events at irregular times: the signal is
+# first resampled on a uniform grid (with as many samples as events) holding
+# the value of the last event (zero-order hold). The samples are multiplied
+# by a window and the FFT is computed on a power of 2 number of points (zero
+# padding). Signals longer than SEGMENT_SIZE samples are cut in segments
+# overlapping by half whose power spectra are averaged (Welch method), so the
+# size of the FFT and the memory do not depend on the length of the signal.
+#
+# The amplitudes are in dB relative to the maximum of the spectrum and only
+# the frequencies of the band ]fmin, fmax[ are returned. All the computations
+# are NumPy operations on whole arrays.
+#
+# The module does not depend on wx: it is used by PlotGUI.Spectrum and it can
+# be run on a result file of To_Disk (text or binary column file):
+#
+#	python SpectrumAnalysis.py result0.dat [-fmin 0] [-fmax 200]
+###############################################################################
+
+import sys
+
+import numpy
+
+import gettext
+_ = gettext.gettext
+
+### windows of the samples
+WINDOWS = ('flat', 'hanning', 'hamming', 'bartlett', 'blackman')
+
+### maximal size of the FFT (longer signals are averaged on segments)
+SEGMENT_SIZE = 65536
+
+### default band of the plotted frequencies
+FMIN = 0.0
+FMAX = 200.0
+
+def getColumns(data):
+	""" Return the times and the values of data (list of pairs [(t, y)...], ResultBuffer or (n, 2) array) as two float arrays.
+	"""
+
+	if hasattr(data, 'GetColumns'):
+		t, y = data.GetColumns()
+		if not len(t):
+			return numpy.zeros(0), numpy.zeros(0)
+		return numpy.frombuffer(t), numpy.frombuffer(y)
+
+	a = numpy.asarray(data, dtype = float)
+	if a.ndim != 2 or a.shape[1] < 2:
+		raise ValueError(_("The data must be a sequence of (time, value) pairs"))
+
+	return a[:,0], a[:,1]
+
+def resample(t, y, n = None):
+	""" Return the values of the event-based signal (t, y) held on n uniform samples (n = len(t) by default)
+		and the sampling frequency.
+	"""
+
+	n = n or len(t)
+	duration = t[-1] - t[0] if len(t) else 0.0
+
+	if n < 2 or duration <= 0:
+		raise ValueError(_("The signal must have at least two samples at different times"))
+
+	dt = duration/float(n-1)
+
+	### events already sampled uniformly (a time step per sample)
+	if len(t) == n and numpy.allclose(numpy.diff(t), dt, rtol = 1e-6, atol = 0.0):
+		return y, 1.0/dt
+
+	### value of the last event at or before each sample time
+	grid = t[0] + dt*numpy.arange(n)
+	i = numpy.searchsorted(t, grid, side = 'right') - 1
+
+	return y[numpy.maximum(i, 0)], 1.0/dt
+
+def getWindow(name, n):
+	""" Return the window name of n points.
+	"""
+
+	if name not in WINDOWS:
+		raise ValueError(_("Window is one of %s")%', '.join(WINDOWS))
+
+	return numpy.ones(n) if name == 'flat' else getattr(numpy, name)(n)
+
+def nextPow2(n):
+	""" Return the smallest power of 2 greater than or equal to n.
+	"""
+	return 1 << int(numpy.ceil(numpy.log2(max(n, 1))))
+
+def powerSpectrum(y, window = 'hamming', segment = SEGMENT_SIZE):
+	""" Return the (non normalized) power spectrum of the uniform samples y for the frequencies k/nfft (k = 0..nfft/2)
+		and nfft.
+	"""
+
+	n = len(y)
+	nfft = nextPow2(segment)
+
+	### one windowed FFT on the whole signal padded with zeros
+	if n <= nfft:
+		nfft = nextPow2(n)
+		return numpy.abs(numpy.fft.rfft(y*getWindow(window, n), nfft))**2, nfft
+
+	### Welch averaging of the segments overlapping by half
+	w = getWindow(window, nfft)
+	step = nfft//2
+	starts = numpy.arange(0, n-nfft+1, step)
+
+	P = numpy.zeros(nfft//2+1)
+	for i in starts:
+		P += numpy.abs(numpy.fft.rfft(y[i:i+nfft]*w))**2
+
+	return P/len(starts), nfft
+
+def spectrum(data, fmin = FMIN, fmax = FMAX, window = 'hamming', segment = SEGMENT_SIZE):
+	""" Return the frequencies ]fmin, fmax[ and the amplitudes (dB) of the spectrum of data [(t, y)...] as two arrays.
+	"""
+
+	t, y = getColumns(data)
+	y, fs = resample(t, y)
+
+	P, nfft = powerSpectrum(y, window, segment)
+
+	F = fs*numpy.arange(len(P))/float(nfft)
+
+	### amplitude relative to the maximum (a null amplitude is bounded to the smallest float)
+	Max = P.max() or 1.0
+	A = 10.0*numpy.log10(numpy.maximum(P/Max, numpy.finfo(float).tiny))
+
+	band = (F > fmin) & (F < fmax)
+
+	return F[band], A[band]
+
+if __name__ == '__main__':
+
+	import argparse
+
+	from DataFile import isColumnFile, readColumns, readData
+
+	parser = argparse.ArgumentParser(description = "amplitude spectrum of a result file (written on the standard output)")
+	parser.add_argument("filename", help = "text or binary column file of (time, value) samples")
+	parser.add_argument("-separator", help = "separator of the text file", type = str, default = " ")
+	parser.add_argument("-fmin", help = "minimal frequency", type = float, default = FMIN)
+	parser.add_argument("-fmax", help = "maximal frequency", type = float, default = FMAX)
+	parser.add_argument("-window", help = "window of the samples", choices = WINDOWS, default = 'hamming')
+	args = parser.parse_args()
+
+	if isColumnFile(args.filename):
+		data = numpy.column_stack(map(numpy.array, readColumns(args.filename)))
+	else:
+		data = [(float(r[0]), float(r[1])) for r in readData(args.filename, args.separator) if len(r) > 1]
+
+	F, A = spectrum(data, args.fmin, args.fmax, args.window)
+
+	for f, a in zip(F, A):
+		sys.stdout.write("%g %g\n"%(f, a))
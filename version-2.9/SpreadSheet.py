@@ -34,6 +34,7 @@ else:
 
 #from Container import *
 from PlotGUI import *
+from DataFile import readData
 
 ###
 class MySheet(sheet.CSheet):
@@ -176,15 +177,19 @@ class Newt(wx.Frame):
 	###
 	def LoadingDataInPage(self):
 
-		### read and load the data in sheet
+		### read and load the data in sheet (from the files or from the results of the model when there is no file)
+		ext = getattr(self.model, 'ext', '.dat')
+		results = getattr(self.model, 'results', {})
 		for i in xrange(len(self.model.IPorts)):
-			fn = "%s%d.dat"%(self.model.fileName, i)
-			if os.path.exists(fn):
+			fn = "%s%d%s"%(getattr(self.model, 'fileName', ''), i, ext)
+			if os.path.exists(fn) or results.get(i):
 				oPort = self.model.IPorts[i].inLine[0]
 				host = oPort.host if hasattr(oPort, 'host') else oPort.hostDEVS
 				label = _('%s (Port %s)')%(host.getBlockModel().label if hasattr(host, 'getBlockModel') else host.name, str(oPort.myID) if hasattr(oPort,'myID') else oPort.name)
-				data = self.FileToData(fn, self.sep)
-				self.AddPage(data, label)
+				if os.path.exists(fn):
+					self.AddPage(self.FileToData(fn, self.sep), label, fn)
+				else:
+					self.AddPage(results[i], label)
 
 	###
 	def OnUpdate(self, event):
@@ -198,17 +203,9 @@ class Newt(wx.Frame):
 
 	###
 	def FileToData(self, fn, separator):
-		""" Create data from file.
+		""" Create data from file (text or binary column file).
 		"""
-		with open(fn, 'r') as f:
-			if separator != "":
-				data = map(lambda a: a.replace('\n','').split(separator), f.readlines())
-			else:
-				L = f.readlines()
-				index = iter(range(len(L)))
-				data = map(lambda a:  (index.next(), a.replace('\n','')), L)
-
-		return data
+		return readData(fn, separator)
 
 	###
 	def EnableGraphIcon(self, msg):
@@ -243,10 +240,11 @@ class Newt(wx.Frame):
 		self.statusbar.SetStatusText(_("Loading data... (%d %%)")%int(pourcent), 0)
 
 	###
-	def AddPage(self, data = [[]], label = ""):
-		""" Add new page to notebook knowing data and label
+	def AddPage(self, data = [[]], label = "", fn = None):
+		""" Add new page to notebook knowing data, label and the file from which data are loaded
 		"""
 		sheet = MySheet(self.notebook, data)
+		sheet.fn = fn
 		sheet.SetFocus()
 		self.notebook.AddPage(sheet, label)
 
@@ -266,7 +264,7 @@ class Newt(wx.Frame):
 	def OnOpen(self, event):
 		""" Open button has been pressed.
 		"""
-		wcd = _("DataSheet file (*.dat)|*.dat|All files (*)|*")
+		wcd = _("DataSheet file (*.dat)|*.dat|Binary column file (*.bin)|*.bin|All files (*)|*")
 		home = os.getenv('USERPROFILE') or os.getenv('HOME') or HOME_PATH
 		open_dlg = wx.FileDialog(self, message = _('Choose a file'), defaultDir = home, defaultFile = "", wildcard = wcd, style = wx.OPEN|wx.MULTIPLE|wx.CHANGE_DIR)
 		# get the new path from open file dialogue
@@ -285,7 +283,7 @@ class Newt(wx.Frame):
 
 					data = self.FileToData(fn, separator)
 					label = _('New %d'%self.notebook.GetPageCount())
-					self.AddPage(data, label)
+					self.AddPage(data, label, fn)
 
 	###
 	def OnSaveAs(self, event):
@@ -364,6 +362,25 @@ class Newt(wx.Frame):
 		if a !=[] and b != []:
 			selected_rows = range(a[0][0], b[0][0])
 
+		### nothing selected: the data are read from the file rather than from the cells
+		if selected_rows == [] and getattr(sheet, 'fn', None) and os.path.exists(sheet.fn):
+			try:
+				data = FileToPlotData(sheet.fn, self.sep)
+			except Exception, info:
+				wx.MessageBox(_('Type of data should be float or int : %s'%info), _('Info'))
+			else:
+				frame = StaticPlot(self, wx.ID_ANY, title, data)
+				frame.Center()
+				frame.Show()
+			return
+
+		### nothing selected: the results of the model are plotted as they are
+		if selected_rows == [] and getattr(sheet, 'fn', None) is None and not isinstance(sheet.data, list):
+			frame = StaticPlot(self, wx.ID_ANY, title, sheet.data)
+			frame.Center()
+			frame.Show()
+			return
+
 		nbc = xrange(sheet.GetNumberCols())
 		nbr = xrange(sheet.GetNumberRows()) if selected_rows == [] else selected_rows
 
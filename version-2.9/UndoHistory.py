@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# UndoHistory.py --- Delta based undo/redo history of the diagrams
+#                     --------------------------------
+# Version                                        last modified: 18/10/2026
+###############################################################################
+# NOTES:
+#
+# Each diagram has a recorder holding a copy of the last recorded state
+# (__dict__) of the diagram and of its shapes. Record compares the current
+# state with it and returns a Delta with only the changed attributes as
+# (old value, new value) pairs. Shapes are kept by reference: a deleted shape
+# is restored by reverting the 'shapes' attribute of the diagram. The cost of a
+# record does not depend on the depth of the history and the memory of the
+# history only depends on the size of the changes.
+#
+# Mutable values (lists, dicts, sets and arrays) are copied on one level.
+# Changes of the ignored attributes (selection, parent...) are not recorded.
+###############################################################################
+
+import sys
+import copy
+import array
+import weakref
+
+from Utilities import FixedList
+
+### attributes which are not restored by undo/redo
+IGNORED_ATTRIBUTES = ('parent', 'devsModel', 'selected', 'modify')
+
+### max memory of the deltas of an undo (or redo) history (bytes)
+MEMORY_BUDGET = 16*1024*1024
+
+### marker of a missing attribute
+MISSING = object()
+
+def copyValue(v):
+	""" Return a copy of the mutable value v (on one level) or v.
+	"""
+	return copy.copy(v) if isinstance(v, (list, dict, set, array.array)) else v
+
+def isSame(a, b):
+	""" Return True if the values a and b are equal.
+	"""
+	if a is b:
+		return True
+	try:
+		return bool(a == b)
+	### numpy arrays for instance
+	except Exception:
+		return False
+
+def setValue(obj, attr, v):
+	""" Assign (a copy of) the value v to the attribute attr of obj.
+	"""
+	if v is MISSING:
+		obj.__dict__.pop(attr, None)
+	else:
+		setattr(obj, attr, copyValue(v))
+
+###############################################################################
+# DELTA
+###############################################################################
+
+class Delta:
+	""" Changes of a diagram between two records.
+	"""
+
+	def __init__(self, diagram, changes):
+		""" Constructor.
+
+			@param diagram : the recorded diagram
+			@param changes : list of (object, {attribute: (old value, new value)})
+		"""
+
+		self.diagram = diagram
+		self.changes = changes
+		self.size = sum(sys.getsizeof(old) + sys.getsizeof(new) for obj, diff in changes for old, new in diff.values())
+
+	def GetSize(self):
+		""" Return the estimated memory of the delta.
+		"""
+		return self.size
+
+	def Undo(self):
+		""" Restore the old values.
+		"""
+		for obj, diff in reversed(self.changes):
+			for attr, (old, new) in diff.items():
+				setValue(obj, attr, old)
+		self.Reset()
+
+	def Redo(self):
+		""" Restore the new values.
+		"""
+		for obj, diff in self.changes:
+			for attr, (old, new) in diff.items():
+				setValue(obj, attr, new)
+		self.Reset()
+
+	def Reset(self):
+		""" The restored state is the last record of the diagram (and of the changed containers).
+		"""
+		for obj in [self.diagram] + [obj for obj, diff in self.changes]:
+			if obj in recorders:
+				recorders[obj].Reset()
+
+class DeltaList(FixedList):
+	""" List of deltas with fixed size and memory budget (for undo/redo).
+	"""
+
+	def __init__(self, size = 5, budget = MEMORY_BUDGET):
+		FixedList.__init__(self, size)
+		self.budget = budget
+
+	def GetMemory(self):
+		return sum(d.GetSize() for d in self if isinstance(d, Delta))
+
+	def append(self, v):
+		FixedList.append(self, v)
+		### the oldest deltas are forgotten first (the last one is always kept)
+		while len(self) > 1 and self.GetMemory() > self.budget:
+			del self[0]
+
+###############################################################################
+# RECORDER
+###############################################################################
+
+class Recorder:
+	""" Last recorded state of a diagram and its shapes.
+	"""
+
+	def __init__(self, diagram):
+		""" Constructor.
+		"""
+		### the recorder does not keep the diagram alive
+		self.diagram = weakref.ref(diagram)
+		self.Reset()
+
+	def GetObjects(self):
+		diagram = self.diagram()
+		return [diagram] + list(diagram.shapes)
+
+	def GetState(self, obj):
+		return dict((k, copyValue(v)) for k, v in obj.__dict__.items())
+
+	def Reset(self):
+		""" Record the current state without delta.
+		"""
+		self.states = dict((id(obj), (obj, self.GetState(obj))) for obj in self.GetObjects())
+
+	def Record(self):
+		""" Record the current state and return the Delta since the last record (None if nothing has changed).
+		"""
+
+		changes = []
+		states = {}
+
+		for obj in self.GetObjects():
+			state = self.states.get(id(obj))
+
+			### new shape: its insertion is recorded by the change of the shapes of the diagram
+			if state is None or state[0] is not obj:
+				states[id(obj)] = (obj, self.GetState(obj))
+				continue
+
+			old = state[1]
+			new = obj.__dict__
+
+			### fast path (the values are compared in C)
+			if isSame(old, new):
+				states[id(obj)] = state
+				continue
+
+			diff = {}
+			for attr in set(old).union(new):
+				if attr not in IGNORED_ATTRIBUTES:
+					a = old.get(attr, MISSING)
+					b = new.get(attr, MISSING)
+					if not isSame(a, b):
+						diff[attr] = (a, copyValue(b))
+
+			if diff:
+				changes.append((obj, diff))
+
+			states[id(obj)] = (obj, self.GetState(obj))
+
+		self.states = states
+
+		return Delta(self.diagram(), changes) if changes else None
+
+### recorders of the diagrams
+recorders = weakref.WeakKeyDictionary()
+
+def GetRecorder(diagram):
+	""" Return the recorder of the diagram (the current state is the first record).
+	"""
+	if diagram not in recorders:
+		recorders[diagram] = Recorder(diagram)
+	return recorders[diagram]
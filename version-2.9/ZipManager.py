@@ -11,6 +11,8 @@ GENERAL NOTES AND REMARKS:
 GLOBAL VARIABLES AND FUNCTIONS:
 """
 
+from __future__ import with_statement
+
 import os
 import sys
 import zipfile
@@ -18,6 +20,8 @@ import zipimport
 import StringIO
 import re
 import inspect
+import zlib
+import warnings
 
 import gettext
 _ = gettext.gettext
@@ -41,7 +45,8 @@ def getPythonModelFileName(fn):
 
 	###	TODO: finally impose : py_file_list = filter(lambda f: f.endswith('.py'))
 	### find if python file has same name of model file
-	py_file_list = filter(lambda f: f.endswith('.py') and os.path.dirname(f) == '' and f not in ('plugins.py', 'steps.py', 'environment.py', 'strategies.py'), zf.namelist())
+	### (a member updated by Zip.Update is in the name list until the archive is compacted)
+	py_file_list = sorted(set(filter(lambda f: f.endswith('.py') and os.path.dirname(f) == '' and f not in ('plugins.py', 'steps.py', 'environment.py', 'strategies.py'), zf.namelist())))
 	zf.close()
 
 	#Cmtp+=1
@@ -74,6 +79,18 @@ def getPythonModelFileName(fn):
 		return py_file_list[0]
 
 class Zip:
+	""" Archive of .amd and .cmd models.
+
+		Update appends the changed members at the end of the archive instead of rewriting it:
+		the replaced members stay in the archive (readers use the last member of a name) until
+		their size exceeds COMPACT_RATIO of the archive (or their number exceeds COMPACT_COUNT)
+		and the archive is rewritten by Compact.
+	"""
+
+	### ratio of the size of the replaced members over the size of the archive that triggers a compaction
+	COMPACT_RATIO = 0.5
+	### number of replaced members that triggers a compaction (they slow down the reading of the directory)
+	COMPACT_COUNT = 64
 
 	def __init__(self, fn, files = []):
 		""" Constructor
@@ -110,58 +127,89 @@ class Zip:
 
 		zout.close()
 
-	def Update(self, replace_files=[]):
-		""" Update zip archive with the new replace file names
+	@staticmethod
+	def GetMembers(replace_files=[]):
+		""" Return the {member name: data} of the replace file names
 		"""
 
-		### delete empty fileName
-		replace_files = filter(lambda f: f!='', replace_files)
+		members = {}
 
-		# call this function because : http://www.digi.com/wiki/developer/index.php/Error_messages
-		self.ClearCache()
-
-		zin = zipfile.ZipFile(self.fn, 'r')
-		zout = zipfile.ZipFile("new_arch.zip", 'w')
-
-		exclude_file = []
-
-		### write all replace file in the new archive
-		for fn in replace_files:
+		### delete empty fileName
+		for fn in filter(lambda f: f!='', replace_files):
 			dir_name, base_name = os.path.split(fn)
 
+			### file from another archive
 			if zipfile.is_zipfile(dir_name):
-				#print '1'
 				z = zipfile.ZipFile(dir_name, 'r')
-				data = z.read(base_name)
-				### this line is in comment because is zip file contain image file we can not encode it.
-				zout.writestr(base_name, data.encode('utf-8'))
-				#zout.writestr(base_name, data)
+				members[base_name] = z.read(base_name)
 				z.close()
-				#print '11'
-				#sys.stdout.write("update %s from compressed %s\n"%(base_name, fn))
+			### file on the disk
 			elif os.path.exists(fn):
-				#print '2'
-				zout.write(fn, base_name)
-				#print '22'
-				#sys.stdout.write("update %s from %s\n"%(base_name, fn))
+				with open(fn, 'rb') as f:
+					members[base_name] = f.read()
+			### file of a directory of the archive written in the current directory
 			elif os.path.exists(base_name) and dir_name != "":
-				#print '3'
-				zout.write(base_name, fn)
-				#print '33'
-				#sys.stdout.write("update %s from %s\n"%(fn, base_name))
-			else:
-				exclude_file.append(replace_files.index(fn))
+				with open(base_name, 'rb') as f:
+					members[fn] = f.read()
+			#else:
 				#sys.stdout.write("%s unknown\n"%(fn))
 
+		return members
 
-		### try to rewrite not replaced files from original zip
-		info_list = zin.infolist()
-		for item in info_list:
-			s = os.path.basename(item.filename)
-			if s not in map(os.path.basename, replace_files) and info_list.index(item) not in exclude_file:
-				buffer = zin.read(item.filename)
-				zout.writestr(item, buffer)
-				sys.stdout.write("%s rewrite\n"%(item.filename))
+	def Update(self, replace_files=[], data={}):
+		""" Update zip archive with the new replace file names and the {member name: data} data.
+			Only the members which have changed are written.
+		"""
+
+		members = Zip.GetMembers(replace_files)
+		members.update(data)
+
+		self.Write(members)
+
+	def Write(self, members):
+		""" Append the members {member name: data} which are not already in the archive
+		"""
+
+		# call this function because : http://www.digi.com/wiki/developer/index.php/Error_messages
+		self.ClearCache()
+
+		zf = zipfile.ZipFile(self.fn, 'a')
+		try:
+			for name, data in sorted(members.items()):
+				if name in zf.NameToInfo:
+					info = zf.NameToInfo[name]
+					if info.file_size == len(data) and info.CRC == zlib.crc32(data) & 0xffffffff:
+						continue
+				### the replaced member stays in the archive until the compaction
+				with warnings.catch_warnings():
+					warnings.simplefilter('ignore')
+					zf.writestr(name, data)
+
+			replaced = [info for info in zf.infolist() if zf.NameToInfo[info.filename] is not info]
+		finally:
+			zf.close()
+
+		if len(replaced) > Zip.COMPACT_COUNT or Zip.GetWaste(replaced) > Zip.COMPACT_RATIO * os.path.getsize(self.fn):
+			self.Compact()
+
+	@staticmethod
+	def GetWaste(infos):
+		""" Return the size in the archive of the members infos (ZipInfo list)
+		"""
+		return sum(30 + len(info.filename) + len(info.extra) + info.compress_size for info in infos)
+
+	def Compact(self):
+		""" Rewrite the archive without the replaced members
+		"""
+
+		self.ClearCache()
+
+		zin = zipfile.ZipFile(self.fn, 'r')
+		zout = zipfile.ZipFile("new_arch.zip", 'w')
+
+		for item in zin.infolist():
+			if zin.NameToInfo[item.filename] is item:
+				zout.writestr(item, zin.read(item))
 
 		### close all files
 		zout.close()
@@ -272,7 +320,7 @@ class Zip:
 
 		###
 		tests_files = filter(lambda a: a!= [], map(lambda s:re.findall("^(BDD/[\w*/]*\.py|BDD/[\w*/]*\.feature)$", s), nl))
-		tests_files = [a[0] for a in tests_files]
+		tests_files = sorted(set(a[0] for a in tests_files))
 
 		return tests_files
 
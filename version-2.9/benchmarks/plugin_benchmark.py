@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+Name: plugin_benchmark.py
+Brief description: Benchmark of the dispatch of the simulation events (SIM_VERBOSE, SIM_BLINK and SIM_TEST) to the plug-ins
+Version:  1.0
+GENERAL NOTES AND REMARKS:
+
+Compare the events/sec of the call of trigger_event with the events bound at the start of the simulation (bind_event),
+then simulate the generator/collector model of strategy_benchmark.py with the compiled strategy (SimStrategy8) without
+plug-in and with a counting plug-in registered for the simulation events.
+Usage: python benchmarks/plugin_benchmark.py [number of atomic models] [simulation time]
+
+GLOBAL VARIABLES AND FUNCTIONS:
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+### builtins, model and simulator of the strategy benchmark
+from strategy_benchmark import makeModel, BenchSimulator, Col
+
+import pluginmanager
+from Patterns.Strategy import SimStrategy8
+
+EVENTS = ("SIM_VERBOSE", "SIM_BLINK", "SIM_TEST")
+
+### number of events received by the counting plug-in
+counter = [0]
+
+def count(*args, **kwargs):
+	counter[0] += 1
+
+def benchDispatch(n):
+	""" Return the events/sec of trigger_event and of the bound event (without plug-in).
+	"""
+
+	t = time.time()
+	for i in xrange(n):
+		pluginmanager.trigger_event("SIM_BLINK", model=None, msg=0)
+	t_trigger = time.time()-t
+
+	SIM_BLINK = pluginmanager.bind_event("SIM_BLINK")
+	t = time.time()
+	for i in xrange(n):
+		if SIM_BLINK: SIM_BLINK(model=None, msg=0)
+	t_bound = time.time()-t
+
+	return n/t_trigger, n/t_bound
+
+def benchSimulation(n, T, repeat = 3):
+	""" Return the best cpu time, the number of messages and the number of plug-in calls of a simulation.
+	"""
+	best = None
+	for i in range(repeat):
+		master = makeModel(n)
+		sim = BenchSimulator(master, SimStrategy8)
+		counter[0] = 0
+		t = time.time()
+		sim.algorithm.simulate(T)
+		cpu = time.time()-t
+		best = cpu if best is None else min(best, cpu)
+	nb = sum(m.n for m in master.componentSet if isinstance(m, Col))
+	return best, nb, counter[0]
+
+if __name__ == '__main__':
+
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+	T = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+
+	trigger, bound = benchDispatch(1000000)
+	sys.stdout.write("dispatch without plug-in: trigger_event %12.0f events/s, bound event %12.0f events/s\n"%(trigger, bound))
+
+	sys.stdout.write("%d atomic models, T = %s\n"%(n, T))
+	for label in ('without plug-in', 'with plug-in'):
+		if label == 'with plug-in':
+			for event in EVENTS:
+				pluginmanager.plugins[event].append(count)
+		cpu, nb, calls = benchSimulation(n, T)
+		sys.stdout.write("%-20s %8.3f s  %8d messages  %10.0f msg/s  %8d plug-in calls\n"%(label, cpu, nb, nb/cpu if cpu else 0, calls))
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+Name: strategy_benchmark.py
+Brief description: Benchmark of the PyDEVS direct-coupling strategy (SimStrategy3) on a generator/collector fan-out
+Version:  1.0
+GENERAL NOTES AND REMARKS:
+
+Compare the indexed scheduler of SimStrategy3 with the previous linear scan of the flat priority list.
+Usage: python benchmarks/strategy_benchmark.py [number of atomic models] [simulation time]
+
+GLOBAL VARIABLES AND FUNCTIONS:
+"""
+
+import os
+import sys
+import time
+import heapq
+import __builtin__
+
+ABS_HOME_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+__builtin__.__dict__.update({'HOME_PATH': ABS_HOME_PATH,
+							'GUI_FLAG': False,
+							'NTL': False,
+							'INFINITY': float('inf'),
+							'DEFAULT_DEVS_DIRNAME': 'PyDEVS',
+							'DEVS_DIR_PATH_DICT': {'PyDEVS': os.path.join(ABS_HOME_PATH, 'DEVSKernel', 'PyDEVS')},
+							'_': lambda s: s})
+
+if ABS_HOME_PATH not in sys.path:
+	sys.path.insert(0, ABS_HOME_PATH)
+
+from DomainInterface.DomainBehavior import DomainBehavior
+from DomainInterface.MasterModel import Master
+from DEVSKernel.PyDEVS.simulator import Simulator
+from Patterns.Strategy import SimStrategy3, execIntTransition, HasActiveChild, getFlatPriorityList
+
+class Gen(DomainBehavior):
+	""" Periodic generator.
+	"""
+	def __init__(self, period=1.0):
+		DomainBehavior.__init__(self)
+		self.addOutPort()
+		self.n = 0
+		self.initPhase('ACTIVE', period)
+
+	def outputFnc(self):
+		self.poke(self.OPorts[0], self.n)
+
+	def intTransition(self):
+		self.n += 1
+
+	def timeAdvance(self):
+		return self.state['sigma']
+
+class Col(DomainBehavior):
+	""" Counter of received messages.
+	"""
+	def __init__(self):
+		DomainBehavior.__init__(self)
+		self.addInPort()
+		self.n = 0
+		self.initPhase('IDLE', INFINITY)
+
+	def extTransition(self):
+		self.n += len(self.peek_all())
+
+	def timeAdvance(self):
+		return self.state['sigma']
+
+class LinearScanSimStrategy3(SimStrategy3):
+	""" SimStrategy3 with the previous main loop (scan of the whole flat priority list at each step).
+	"""
+
+	def simulate(self, T = sys.maxint):
+		condition = lambda clk: HasActiveChild(getFlatPriorityList(self.master, [])) if self._simulator.ntl else clk <= T
+
+		L = [m.myTimeAdvance for m in self.flat_priority_list if m.myTimeAdvance < INFINITY] or [INFINITY]
+		self.ts.Set(min(L))
+		formated_priority_list = [(1+i/10000.0, m, execIntTransition) for i,m in enumerate(self.flat_priority_list)]
+
+		while condition(self.ts.Get()) and self._simulator.end_flag == False:
+			priority_scheduler = filter(lambda a: self.ts.Get() == a[1].myTimeAdvance, formated_priority_list)
+			heapq.heapify(priority_scheduler)
+
+			while(priority_scheduler):
+				priority, model, transition_fct = heapq.heappop(priority_scheduler)
+				apply(transition_fct, (model,))
+
+			self.ts.Set(min([m.myTimeAdvance for m in self.flat_priority_list]))
+
+		self._simulator.terminate()
+
+class BenchSimulator(Simulator):
+	""" Minimal simulator (without thread) for the strategies.
+	"""
+
+	def __init__(self, model, strategy_cls):
+		Simulator.__init__(self, model)
+		self.ntl = False
+		self.end_flag = False
+		self.thread_sleep = False
+		self.thread_suspend = False
+		self.cpu_time = 0
+		self.algorithm = strategy_cls(self)
+
+	def getMaster(self):
+		return self.model
+
+	def terminate(self, error = False, msg = None):
+		self.end_flag = True
+
+def makeModel(n):
+	""" Master model with n/2 generators, each of them connected to its own collector.
+		Periods are all different in order to have few imminent models at each step.
+	"""
+	master = Master()
+	for i in range(n/2):
+		g = master.addSubModel(Gen(period=1.0+i/float(n)))
+		c = master.addSubModel(Col())
+		master.connectPorts(g.OPorts[0], c.IPorts[0])
+	return master
+
+def bench(strategy_cls, n, T):
+	master = makeModel(n)
+	sim = BenchSimulator(master, strategy_cls)
+	t = time.time()
+	sim.algorithm.simulate(T)
+	cpu = time.time()-t
+	nb = sum(m.n for m in master.componentSet if isinstance(m, Col))
+	return cpu, nb
+
+if __name__ == '__main__':
+
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+	T = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+
+	sys.stdout.write("%d atomic models, T = %s\n"%(n, T))
+	for cls in (LinearScanSimStrategy3, SimStrategy3):
+		cpu, nb = bench(cls, n, T)
+		sys.stdout.write("%-25s %8.3f s  %8d messages  %10.0f msg/s\n"%(cls.__name__, cpu, nb, nb/cpu if cpu else 0))
@@ -51,7 +51,10 @@ builtin_dict = {'SPLASH_PNG': os.path.join(ABS_HOME_PATH, 'splash', 'splash.png'
 				'LOCAL_EDITOR': True, # for the use of local editor
 				'LOG_FILE': os.devnull, # log file (null by default)
 				'DEFAULT_SIM_STRATEGY': 'bag-based', #choose the default simulation strategy for PyDEVS
-				'PYDEVS_SIM_STRATEGY_DICT' : {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3'}, # list of available simulation strategy for PyDEVS package
+				'PYDEVS_SIM_STRATEGY_DICT' : {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3', 'event-queue':'SimStrategy7', 'compiled':'SimStrategy8', 'multi-process':'SimStrategy9'}, # list of available simulation strategy for PyDEVS package
+				'PYDEVS_MESSAGE_COPY': 'deepcopy', # copy policy of the messages for PyDEVS (deepcopy, copy, custom or none)
+				'PYDEVS_MESSAGE_CHECK': False, # check that the messages are not modified with the 'none' copy policy (debug)
+				'PYPDEVS_SIM_SETTINGS': {}, # default scheduler, memoization, message copy and state saving for PyPDEVS (see SimulationSettings)
                 'PYPDEVS_SIM_STRATEGY_DICT' : {'classic':'SimStrategy4', 'distributed':'SimStrategy5', 'parallel':'SimStrategy6'}, # list of available simulation strategy for PyPDEVS package
 				'HELP_PATH' : os.path.join('doc', 'html'), # path of help directory
 				'NTL' : False, # No Time Limit for the simulation
@@ -69,8 +72,9 @@ builtin_dict = {'SPLASH_PNG': os.path.join(ABS_HOME_PATH, 'splash', 'splash.png'
 builtin_dict['GUI_FLAG'] = False
 
 from InteractionYAML import YAMLHandler
+from SimulationSettings import CHOICES, setSetting, CALIBRATION_BUDGET
 
-def simulate(devs, duration, simu_name, is_remote):
+def simulate(devs, duration, simu_name, is_remote, progress_interval=1.0):
 
 	from SimulationNoGUI import makeSimulation
 
@@ -79,7 +83,24 @@ def simulate(devs, duration, simu_name, is_remote):
 		duration = 0.0
 
 	### launch simulation
-	makeSimulation(devs, duration, simu_name, is_remote, True)
+	makeSimulation(devs, duration, simu_name, is_remote, True, progress_interval)
+
+def sweep(yamlHandler, duration, spec, seeds, simu_name, nb_process):
+
+	from SimulationNoGUI import makeSweep
+
+	if str(duration) in ('inf', 'ntl'):
+		__builtin__.__dict__['NTL'] = True
+		duration = 0.0
+
+	### spec is a JSON string or the name of a JSON file
+	if os.path.exists(spec):
+		with open(spec, 'r') as f:
+			spec = f.read()
+
+	### launch the simulations
+	json_report = makeSweep(yamlHandler, duration, json.loads(spec), seeds, simu_name, nb_process)
+	sys.stdout.write(json.dumps(json_report))
 
 # Sets the homepath variable to the directory where your application is located (sys.argv[0]).
 __builtin__.__dict__.update(builtin_dict)
@@ -100,15 +121,33 @@ if __name__ == '__main__':
 	# optional simulation_name for remote execution
 	parser.add_argument("-remote", help="remote execution", action="store_true")
 	parser.add_argument("-name", help="simulation name", type=str, default="simu")
+	# optional interval (cpu time in s) between two progress reports
+	parser.add_argument("-progress", help="progress report interval in seconds", type=float, default=1.0)
 	# optional kernel for simulation kernel
 	parser.add_argument("-kernel", help="simulation kernel [pyDEVS|PyPDEVS]", type=str, default="pyDEVS")
+	# optional number of threads used to make the DEVS instances
+	parser.add_argument("-workers", help="number of threads used to make the DEVS instances (for constructors waiting for I/O)", type=int, default=0)
+	# optional copy policy of the messages for PyDEVS
+	parser.add_argument("-copy", help="copy policy of the messages read by the PyDEVS models", choices=['deepcopy', 'copy', 'custom', 'none'], default=None)
+	parser.add_argument("-copycheck", help="check that the messages are not modified with the 'none' copy policy (debug)", action="store_true")
+	# optional PyPDEVS settings (override the settings of the diagram)
+	parser.add_argument("-scheduler", help="scheduler of the PyPDEVS simulation", choices=CHOICES['scheduler'], default=None)
+	parser.add_argument("-memoization", help="memoization of the PyPDEVS simulation", choices=['on', 'off'], default=None)
+	parser.add_argument("-messagecopy", help="copy of the messages of the PyPDEVS simulation", choices=CHOICES['message_copy'], default=None)
+	parser.add_argument("-statesaving", help="state saving of the PyPDEVS simulation", choices=CHOICES['state_saving'], default=None)
 	# non-simulation options
 	group = parser.add_mutually_exclusive_group()
 	group.add_argument("-js", "--javascript",help="generate JS file", action="store_true")
 	group.add_argument("-json", help="turn the YAML/DSP file to JSON", action="store_true")
 	group.add_argument("-blockslist", help="get the list of models in a master model", action="store_true")
 	group.add_argument("-blockargs", help="parameters of an atomic model", type=str)
+	group.add_argument("-calibrate", help="simulate a warm-up segment with each PyPDEVS scheduler during CALIBRATE seconds (%s by default) and save the fastest one in the diagram"%CALIBRATION_BUDGET, type=float, nargs='?', const=CALIBRATION_BUDGET)
+	group.add_argument("-sweep", help="simulate for each configuration of a JSON grid {label:{arg:[values]}} or list [{label:{arg:value}}] (string or file)", type=str)
 	parser.add_argument("-updateblockargs", help="new parameters", type=str, default="")
+	# optional sweep parameters
+	parser.add_argument("-seeds", help="comma separated list of random seeds of the sweep replications", type=str, default="")
+	parser.add_argument("-replications", help="number of replications of the sweep (seeds 0 to n-1)", type=int, default=0)
+	parser.add_argument("-processes", help="number of worker processes of the sweep (number of cores by default)", type=int, default=None)
 	args = parser.parse_args()
 
 	if args.kernel:
@@ -124,6 +163,20 @@ if __name__ == '__main__':
 	else:
 		yamlHandler = YAMLHandler(filename)
 
+	if args.workers:
+		from Container import Diagram
+		Diagram.INSTANTIATION_WORKERS = args.workers
+
+	if args.copy:
+		__builtin__.__dict__['PYDEVS_MESSAGE_COPY'] = args.copy
+	if args.copycheck:
+		__builtin__.__dict__['PYDEVS_MESSAGE_CHECK'] = True
+
+	### PyPDEVS settings of the diagram for this run (the file is only modified by -calibrate)
+	for key, value in (('scheduler', args.scheduler), ('memoization', args.memoization), ('message_copy', args.messagecopy), ('state_saving', args.statesaving)):
+		if value is not None and yamlHandler.filename_is_valid == True:
+			setSetting(yamlHandler.diagram, key, value == 'on' if key == 'memoization' else value)
+
 	if args.javascript:
 		# Javascript generation
 		yamlHandler.getJS()
@@ -146,6 +199,38 @@ if __name__ == '__main__':
 			args = yamlHandler.getYAMLBlockModelArgs(label)
 			sys.stdout.write(json.dumps(args))
 
+	elif args.calibrate is not None:
+		# calibration of the PyPDEVS scheduler (the simulation time bounds the warm-up segment)
+		if not 'PyPDEVS' in __builtin__.__dict__['DEFAULT_DEVS_DIRNAME']:
+			sys.stderr.write(_('ERROR: the calibration needs the PyPDEVS kernel (-kernel PyPDEVS)!\n'))
+			sys.exit()
+
+		duration = args.simulation_time
+		duration = INFINITY if str(duration) in ('inf', 'ntl') else float(duration)
+
+		from Patterns.Strategy import CalibrateScheduler
+		results = CalibrateScheduler(yamlHandler.diagram, duration, args.calibrate)
+
+		### the fastest scheduler is used by the next simulations of the diagram
+		if results:
+			yamlHandler.diagram.SaveFile(filename)
+
+		sys.stdout.write(json.dumps({'scheduler': results[0][1] if results else None,
+									'results': [{'scheduler': s, 'steps_per_second': r} for r, s in results]}))
+
+	elif args.sweep:
+		# parameter sweep / replications
+		duration = args.simulation_time
+		if isinstance(duration, str):
+			duration = float(duration)
+
+		if args.seeds:
+			seeds = map(int, args.seeds.split(','))
+		else:
+			seeds = range(args.replications)
+
+		sweep(yamlHandler, duration, args.sweep, seeds, args.name, args.processes)
+
 	else:
 		# simulation
 		duration = args.simulation_time
@@ -154,7 +239,7 @@ if __name__ == '__main__':
 
 		devs = yamlHandler.getDevsInstance()
 		if devs:
-			simulate(devs, duration, args.name, args.remote)
+			simulate(devs, duration, args.name, args.remote, args.progress)
 
 	#~ yamlHandler = YAMLHandler(filename)
 
@@ -301,7 +301,10 @@ builtin_dict = {'SPLASH_PNG': os.path.join(ABS_HOME_PATH, 'splash', 'splash.png'
 				'LOCAL_EDITOR': True, # for the use of local editor
 				'LOG_FILE': os.devnull, # log file (null by default)
 				'DEFAULT_SIM_STRATEGY': 'bag-based', #choose the default simulation strategy for PyDEVS
-				'PYDEVS_SIM_STRATEGY_DICT' : {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3'}, # list of available simulation strategy for PyDEVS package
+				'PYDEVS_SIM_STRATEGY_DICT' : {'original':'SimStrategy1', 'bag-based':'SimStrategy2', 'direct-coupling':'SimStrategy3', 'event-queue':'SimStrategy7', 'compiled':'SimStrategy8', 'multi-process':'SimStrategy9'}, # list of available simulation strategy for PyDEVS package
+				'PYDEVS_MESSAGE_COPY': 'deepcopy', # copy policy of the messages for PyDEVS (deepcopy, copy, custom or none)
+				'PYDEVS_MESSAGE_CHECK': False, # check that the messages are not modified with the 'none' copy policy (debug)
+				'PYPDEVS_SIM_SETTINGS': {}, # default scheduler, memoization, message copy and state saving for PyPDEVS (see SimulationSettings)
                 'PYPDEVS_SIM_STRATEGY_DICT' : {'classic':'SimStrategy4', 'distributed':'SimStrategy5', 'parallel':'SimStrategy6'}, # list of available simulation strategy for PyPDEVS package
 				'HELP_PATH' : os.path.join('doc', 'html'), # path of help directory
 				'NTL' : False, # No Time Limit for the simulation
@@ -1148,26 +1151,11 @@ class MainApplication(wx.Frame):
 		toolbar = event.GetEventObject()
 		currentPage = toolbar.GetToolClientData(event.GetId()) if isinstance(toolbar.GetParent(), DetachedFrame) else self.nb2.GetCurrentPage()
 
-		### append the stockredo and active it
-		currentPage.stockRedo.append(cPickle.dumps(obj=currentPage.GetDiagram(),protocol=0))
-		toolbar.EnableTool(wx.ID_REDO, True)
+		### revert the last change (the shapes are updated in place, so the original canvas of a containerBlock is also updated)
+		currentPage.DoUndo()
 
-		### change the current diagram with the last undo
-		new_diagram = cPickle.loads(currentPage.stockUndo.pop())
-		new_diagram.parent = currentPage
-		currentPage.DiagramReplace(new_diagram)
-		original_diagram = currentPage.GetDiagram()
-
-		## if model is containerBlock, the grand parent is DetachedFrame and we could update the diagram withou update the original canvas
-		if isinstance(original_diagram.GetGrandParent(), DetachedFrame):
-			## update of all shapes in the original diagram
-			original_diagram.shapes = new_diagram.shapes
-		else:
-			## refresh original canvas with new diagram
-			original_canvas = original_diagram.parent
-			original_canvas.DiagramReplace(new_diagram)
-
-		### desable undo btn if the stockUndo list is empty
+		### active the redo btn and desable undo btn if the stockUndo list is empty
+		toolbar.EnableTool(wx.ID_REDO, not currentPage.stockRedo == [])
 		toolbar.EnableTool(wx.ID_UNDO, not currentPage.stockUndo == [])
 
 	def OnRedo(self, event):
@@ -1177,26 +1165,11 @@ class MainApplication(wx.Frame):
 		toolbar = event.GetEventObject()
 		currentPage = toolbar.GetToolClientData(event.GetId()) if isinstance(toolbar.GetParent(), DetachedFrame) else self.nb2.GetCurrentPage()
 
-		### append the stockundo and active it
-		currentPage.stockUndo.append(cPickle.dumps(obj=currentPage.GetDiagram(), protocol=0))
-		toolbar.EnableTool(wx.ID_UNDO, True)
+		### apply again the last reverted change
+		currentPage.DoRedo()
 
-		### change the current canvas with the last undo
-		new_diagram = cPickle.loads(currentPage.stockRedo.pop())
-		new_diagram.parent = currentPage
-		currentPage.DiagramReplace(new_diagram)
-		original_diagram = currentPage.GetDiagram()
-
-		## if model is containerBlock, the grand parent is DetachedFrame and we could update the diagram withou update the original canvas
-		if isinstance(original_diagram.GetGrandParent(), DetachedFrame):
-			## update of all shapes in the original diagram
-			original_diagram.shapes = new_diagram.shapes
-		else:
-			## refresh original canvas with new diagram
-			original_canvas = original_diagram.parent
-			original_canvas.DiagramReplace(new_diagram)
-
-		### desable undo btn if the stockRedo list is empty
+		### active the undo btn and desable redo btn if the stockRedo list is empty
+		toolbar.EnableTool(wx.ID_UNDO, not currentPage.stockUndo == [])
 		toolbar.EnableTool(wx.ID_REDO, not currentPage.stockRedo == [])
 
 	###
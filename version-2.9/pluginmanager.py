@@ -75,6 +75,32 @@ def trigger_event(event, *args, **kwargs):
 		if event not in disabled_event:
 			plugin(*args, **kwargs)
 
+def bind_event(event):
+	""" Return the function to call in order to trigger the event, or None if the event has
+		no enabled plug-in. It is resolved once (at the start of a simulation for instance) so that
+		the caller only tests the result for None instead of calling trigger_event:
+
+			SIM_VERBOSE = bind_event("SIM_VERBOSE")
+			...
+			if SIM_VERBOSE: SIM_VERBOSE(model=m, msg=0)
+
+		Plug-ins enabled or disabled after the call are not taken into account.
+	"""
+	if event in disabled_event:
+		return None
+
+	L = list(plugins.get(event, []))
+
+	if L == []:
+		return None
+	elif len(L) == 1:
+		return L[0]
+	else:
+		def dispatch(*args, **kwargs):
+			for plugin in L:
+				plugin(*args, **kwargs)
+		return dispatch
+
 def load_plugins(module_name):
 	""" This reads a plug-ins list to load. It is so plug-in
 		imports are more dynamic and you don't need to continue appending